@@ -1,4 +1,6 @@
 import re
+from array import array
+from bisect import bisect_right
 
 # 1. Definición de Tipos de Token
 # Se usa un diccionario donde la clave es el tipo de token y el valor
@@ -10,6 +12,7 @@ TOKEN_TYPES = {
     
     # 'IDENTIFICADOR' va después de 'PALABRA_RESERVADA'
     'STRING':            r'"[^"]*"',
+    'BOOLEANO':          r'(true|false)\b',
     'IDENTIFICADOR':     r'[a-zA-Z_][a-zA-Z0-9_]*',
     
     'NUMERO_ENTERO':     r'\d+',
@@ -37,64 +40,258 @@ TOKEN_TYPES = {
     'ERROR':             r'.'      
 }
 
+# 2. Compilación de la Expresión Regular Maestra
+# Unimos todas las expresiones regulares con el operador OR (|)
+# '(?P<NOMBRE>...)' crea un "grupo nombrado" en la regex.
+# Esto nos permite saber qué TIPO de token encontró la coincidencia.
+# Se compila UNA sola vez al cargar el módulo, no en cada llamada.
+TOKEN_REGEX = re.compile('|'.join(f'(?P<{tipo}>{patron})'
+                                  for tipo, patron in TOKEN_TYPES.items()))
+
+# La misma expresión compilada para bytes: permite escanear directamente
+# un archivo mapeado en memoria (mmap) sin decodificarlo completo.
+# En bytes, 'ERROR' consume una secuencia UTF-8 completa y no byte a byte.
+TOKEN_REGEX_BYTES = re.compile(b'|'.join(
+    b'(?P<%s>%s)' % (tipo.encode('ascii'),
+                     rb'[\xc0-\xff][\x80-\xbf]*|.' if tipo == 'ERROR' else patron.encode('ascii'))
+    for tipo, patron in TOKEN_TYPES.items()))
+
+# Tipos que el escáner reconoce pero que nunca llegan al parser
+TOKENS_IGNORADOS = frozenset(('ESPACIO_BLANCO', 'COMENTARIO'))
+
+# Token especial que marca el fin del análisis
+TOKEN_EOF = ('EOF', 'End-Of-File')
+
+# Códigos numéricos de cada tipo de token (caben en un byte)
+TOKEN_NAMES = tuple(TOKEN_TYPES) + ('EOF',)
+TOKEN_CODES = {nombre: codigo for codigo, nombre in enumerate(TOKEN_NAMES)}
+CODIGO_EOF = TOKEN_CODES['EOF']
+
+
+class TokenBuffer:
+    """
+    Almacenamiento compacto (por columnas) de los tokens de un archivo.
+    En vez de una tupla por token se guardan tres arreglos paralelos:
+      - tipos:   código del tipo de token (array 'B')
+      - inicios: offset de inicio del lexema en el código fuente (array 'I')
+      - fines:   offset de fin del lexema (array 'I')
+    El lexema se recorta del código fuente solo cuando se pide, y la
+    línea/columna se calcula bajo demanda con un índice de inicios de línea.
+    """
+
+    __slots__ = ('source', 'tipos', 'inicios', 'fines', 'errores', 'inicios_errores',
+                 '_lineas', '_binario')
+
+    def __init__(self, source):
+        # source puede ser str o un objeto tipo bytes (bytes, mmap)
+        self.source = source
+        self.tipos = array('B')
+        self.inicios = array('I')
+        self.fines = array('I')
+        self.errores = []  # Mensajes de los errores léxicos encontrados
+        self.inicios_errores = array('I')  # Offset de cada error (paralelo a errores)
+        self._lineas = None
+        self._binario = not isinstance(source, str)
+
+    def append(self, codigo, inicio, fin):
+        self.tipos.append(codigo)
+        self.inicios.append(inicio)
+        self.fines.append(fin)
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def tipo(self, i):
+        """Nombre del tipo del token i (ej. 'IDENTIFICADOR')"""
+        return TOKEN_NAMES[self.tipos[i]]
+
+    def lexema(self, i):
+        """Texto del token i, recortado del código fuente"""
+        if self.tipos[i] == CODIGO_EOF:
+            return TOKEN_EOF[1]
+        lexema = self.source[self.inicios[i]:self.fines[i]]
+        if self._binario:
+            return decodificar(lexema)
+        return lexema
+
+    def __getitem__(self, i):
+        """Compatibilidad con la representación (tipo, lexema)"""
+        return (self.tipo(i), self.lexema(i))
+
+    def __iter__(self):
+        for i in range(len(self.tipos)):
+            yield self[i]
+
+    def posicion_offset(self, offset):
+        """Devuelve (línea, columna), ambas desde 1, para un offset del fuente"""
+        if self._lineas is None:
+            self._lineas = indice_lineas(self.source)
+        linea = bisect_right(self._lineas, offset)
+        inicio_linea = self._lineas[linea - 1]
+        if self._binario:
+            # La columna se cuenta en caracteres, no en bytes
+            return linea, len(decodificar(self.source[inicio_linea:offset])) + 1
+        return linea, offset - inicio_linea + 1
+
+    def posicion(self, i):
+        """Devuelve (línea, columna) del token i"""
+        return self.posicion_offset(self.inicios[i])
+
+
+def indice_lineas(source):
+    """Offsets donde empieza cada línea del código fuente"""
+    salto_linea = '\n' if isinstance(source, str) else b'\n'
+    lineas = array('I', [0])
+    salto = source.find(salto_linea)
+    while salto != -1:
+        lineas.append(salto + 1)
+        salto = source.find(salto_linea, salto + 1)
+    return lineas
+
+
+def mensaje_error_lexico(caracter, linea, columna):
+    """Texto del error léxico de un carácter inesperado"""
+    return f"Error Léxico: Carácter inesperado '{caracter}' (línea {linea}, columna {columna})"
+
+
+def decodificar(datos):
+    """
+    Convierte un lexema en bytes a str.
+    Casi todo el lenguaje es ASCII; solo los literales de cadena (o los
+    errores) con caracteres no ASCII necesitan la decodificación UTF-8.
+    """
+    try:
+        return datos.decode('ascii')
+    except UnicodeDecodeError:
+        return datos.decode('utf-8', errors='replace')
+
+
+class Lexer:
+    """
+    Analizador léxico reutilizable.
+    Usa la expresión regular maestra ya compilada y produce los tokens
+    de forma perezosa, uno a uno, sin materializar la lista completa.
+    """
+
+    def __init__(self, regex=TOKEN_REGEX):
+        self.regex = regex
+
+    def iter_tokens(self, codigo_fuente):
+        """
+        Generador de tokens (tipo_token, lexema).
+        Siempre termina con el token EOF.
+        """
+        # 3. Bucle Principal de Escaneo
+        # finditer() escanea la cadena de izquierda a derecha y devuelve
+        # un iterador de todos los objetos 'match' (coincidencias) que encuentra.
+        # Esto implementa la regla de "emparejamiento más largo" (longest match)
+        # y maneja el avance del puntero automáticamente.
+        for match in self.regex.finditer(codigo_fuente):
+
+            # 'match.lastgroup' nos da el NOMBRE del grupo que coincidió
+            # (ej. 'IDENTIFICADOR', 'NUMERO_ENTERO', etc.)
+            tipo_token = match.lastgroup
+
+            # 4. Filtrado (Ignorar espacios y comentarios)
+            # Si el token es de un tipo que queremos ignorar,
+            # simplemente continuamos al siguiente 'match' sin guardarlo.
+            if tipo_token in TOKENS_IGNORADOS:
+                continue
+
+            # 'match.group()' nos da el texto exacto que coincidió (el lexema)
+            lexema = match.group()
+
+            # 5. Manejo de Errores
+            # Si el token es de tipo 'ERROR', significa que un carácter
+            # no coincidió con ninguna regla válida.
+            if tipo_token == 'ERROR':
+                print(f"Error Léxico: Carácter inesperado '{lexema}'")
+                continue
+
+            # 6. Generación de Token
+            yield (tipo_token, lexema)
+
+        # 7. Fin del Archivo
+        yield TOKEN_EOF
+
+    def tokenizar(self, codigo_fuente, inicio=0, parada=None, log=print):
+        """
+        Analiza el código fuente y devuelve un TokenBuffer compacto.
+        Los errores léxicos se reportan con línea y columna: quedan en
+        buffer.errores y además se pasan a 'log' (None = no mostrarlos).
+
+        Para re-analizar solo una ventana (ver incremental.py) se puede
+        empezar en 'inicio' y pasar 'parada(offset)', que se consulta con
+        el inicio de cada coincidencia: si devuelve True el escaneo se
+        detiene ahí y el EOF se coloca en ese offset.
+        """
+        buffer = TokenBuffer(codigo_fuente)
+        codigos = TOKEN_CODES
+        codigo_error = codigos['ERROR']
+        append = buffer.append
+        fin_archivo = len(codigo_fuente)
+
+        for match in self.regex.finditer(codigo_fuente, inicio):
+            if parada is not None and parada(match.start()):
+                fin_archivo = match.start()
+                break
+
+            tipo_token = match.lastgroup
+            if tipo_token in TOKENS_IGNORADOS:
+                continue
+
+            codigo = codigos[tipo_token]
+            inicio, fin = match.span()
+
+            if codigo == codigo_error:
+                linea, columna = buffer.posicion_offset(inicio)
+                caracter = match.group()
+                if buffer._binario:
+                    caracter = decodificar(caracter)
+                mensaje = mensaje_error_lexico(caracter, linea, columna)
+                buffer.errores.append(mensaje)
+                buffer.inicios_errores.append(inicio)
+                if log is not None:
+                    log(mensaje)
+                continue
+
+            append(codigo, inicio, fin)
+
+        append(CODIGO_EOF, fin_archivo, fin_archivo)
+        return buffer
+
+
+# Instancias compartidas por todo el compilador
+lexer = Lexer()
+lexer_bytes = Lexer(TOKEN_REGEX_BYTES)
+iter_tokens = lexer.iter_tokens
+
+
+def tokenizar(codigo_fuente, log=print):
+    """
+    Devuelve el TokenBuffer del código fuente.
+    Acepta str o datos binarios (bytes / mmap); estos últimos se escanean
+    con la expresión maestra compilada para bytes, sin copiarlos.
+    'log' recibe los mensajes de error léxico (None = silencioso).
+    """
+    if isinstance(codigo_fuente, str):
+        return lexer.tokenizar(codigo_fuente, log=log)
+    return lexer_bytes.tokenizar(codigo_fuente, log=log)
+
+
 def analizar(codigo_fuente):
     """
     Implementación del analizador léxico.
     Recibe un string de código fuente y devuelve una lista de tuplas (tipo_token, lexema).
+    Se mantiene por compatibilidad; para archivos grandes usar iter_tokens().
     """
-    
-    # 2. Compilación de la Expresión Regular Maestra
-    # Unimos todas las expresiones regulares con el operador OR (|)
-    # '(?P<NOMBRE>...)' crea un "grupo nombrado" en la regex.
-    # Esto nos permite saber qué TIPO de token encontró la coincidencia.
-    token_regex = '|'.join(f'(?P<{tipo}>{patron})' 
-                           for tipo, patron in TOKEN_TYPES.items())
-    
-    tokens_generados = []
-    
-    # 3. Bucle Principal de Escaneo
-    # re.finditer() escanea la cadena de izquierda a derecha y devuelve
-    # un iterador de todos los objetos 'match' (coincidencias) que encuentra.
-    # Esto implementa la regla de "emparejamiento más largo" (longest match)
-    # y maneja el avance del puntero automáticamente.
-    for match in re.finditer(token_regex, codigo_fuente):
-        
-        # 'match.lastgroup' nos da el NOMBRE del grupo que coincidió
-        # (ej. 'IDENTIFICADOR', 'NUMERO_ENTERO', etc.)
-        tipo_token = match.lastgroup
-        
-        # 'match.group()' nos da el texto exacto que coincidió (el lexema)
-        lexema = match.group()
-        
-        # 4. Filtrado (Ignorar espacios y comentarios)
-        # Si el token es de un tipo que queremos ignorar,
-        # simplemente continuamos al siguiente 'match' sin guardarlo.
-        if tipo_token == 'ESPACIO_BLANCO' or tipo_token == 'COMENTARIO':
-            continue
-            
-        # 5. Manejo de Errores
-        # Si el token es de tipo 'ERROR', significa que un carácter
-        # no coincidió con ninguna regla válida.
-        if tipo_token == 'ERROR':
-            # En una implementación real, aquí se reportaría el
-            # número de línea y columna.
-            print(f"Error Léxico: Carácter inesperado '{lexema}'")
-            continue
-
-        # 6. Generación de Token
-        # Si es un token válido y no debe ignorarse, lo agregamos a la lista.
-        tokens_generados.append((tipo_token, lexema))
-    
-    # 7. Fin del Archivo
-    # Agregamos un token especial para marcar el fin del análisis.
-    tokens_generados.append(('EOF', 'End-Of-File'))
-    
-    return tokens_generados
+    return list(iter_tokens(codigo_fuente))
 
 # --- Ejemplo de Uso ---
 
-# Código fuente de prueba
-codigo_ejemplo = """
+if __name__ == "__main__":
+    # Código fuente de prueba
+    codigo_ejemplo = """
 var x = 10;
 var y = 20;
 
@@ -109,10 +306,10 @@ if (x > y) {
 $ hola
 """
 
-# Ejecutar el analizador
-tokens = analizar(codigo_ejemplo)
+    # Ejecutar el analizador
+    tokens = analizar(codigo_ejemplo)
 
-# Imprimir los resultados
-print("--- Resultados del Análisis Léxico ---")
-for token in tokens:
-    print(token)
\ No newline at end of file
+    # Imprimir los resultados
+    print("--- Resultados del Análisis Léxico ---")
+    for token in tokens:
+        print(token)
\ No newline at end of file
@@ -1,36 +1,53 @@
 class Node:
-    """Clase base para todos los nodos del AST"""
-    pass
+    """
+    Clase base para todos los nodos del AST.
+    Los nodos usan __slots__: sin __dict__ por instancia ocupan menos memoria
+    y el acceso a atributos es más rápido. Para programas muy grandes existe
+    además la representación compacta de ast_arena.py.
+    """
+    __slots__ = ()
 
 class Block(Node):
     """Representa un bloque de declaraciones o sentencias."""
+    __slots__ = ('children',)
     def __init__(self, children):
         self.children = children
 
 class Print(Node):
     """Representa una sentencia print(expresion)"""
+    __slots__ = ('expression',)
     def __init__(self, expression):
         self.expression = expression
         
 class IfStatement(Node):
     """Representa la estructura IF (condicion) { then_block } [else { else_block }]"""
+    __slots__ = ('condition', 'then_block', 'else_block')
     def __init__(self, condition, then_block, else_block=None):
         self.condition = condition
         self.then_block = then_block
         self.else_block = else_block # Puede ser None
+class WhileStatement(Node):
+    """Representa el ciclo WHILE (condicion) { body }"""
+    __slots__ = ('condition', 'body')
+    def __init__(self, condition, body):
+        self.condition = condition
+        self.body = body
 class VarDecl(Node):
     """Declaración de variable (ej. 'int x')"""
+    __slots__ = ('var_type', 'var_name')
     def __init__(self, var_type, var_name):
         self.var_type = var_type
         self.var_name = var_name
 class Assign(Node):
     """Asignación (ej. 'x = 10')"""
+    __slots__ = ('target', 'value')
     def __init__(self, target, value):
         self.target = target 
         self.value = value   
 
 class BinOp(Node):
     """Operación binaria (ej. 'a + b')"""
+    __slots__ = ('left', 'op', 'right')
     def __init__(self, left, op, right):
         self.left = left
         self.op = op
@@ -38,16 +55,25 @@ class BinOp(Node):
 
 class Identifier(Node):
     """Un identificador (ej. el nombre de una variable)"""
+    __slots__ = ('name',)
     def __init__(self, name):
         self.name = name
 
 class Num(Node):
     """Un número literal (ej. 5)"""
+    __slots__ = ('value',)
     def __init__(self, value):
         self.value = value
 
 class String(Node):
     """Una cadena literal (ej. "hola")"""
+    __slots__ = ('value',)
+    def __init__(self, value):
+        self.value = value
+
+class Bool(Node):
+    """Un literal booleano (true / false)"""
+    __slots__ = ('value',)
     def __init__(self, value):
         self.value = value
 
@@ -91,25 +117,54 @@ class SymbolTable:
                 return scope[name]
         return None 
 
+def es_binop(node):
+    """True para BinOp y para su vista en ast_arena (misma clase por nombre)"""
+    return type(node).__name__ == 'BinOp'
+
 class NodeVisitor:
+    # Caché de despacho: clase de nodo -> función visit_*.
+    # Cada subclase recibe su propio diccionario (ver __init_subclass__),
+    # así el 'visit_' + nombre y el getattr se hacen una sola vez por par
+    # (clase de visitor, clase de nodo) y no en cada visita.
+    _dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
     def visit(self, node):
         """Función de despacho principal"""
-        method_name = 'visit_' + type(node).__name__
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        try:
+            visitor = self._dispatch[type(node)]
+        except KeyError:
+            visitor = self._resolver(type(node))
+        return visitor(self, node)
+
+    @classmethod
+    def _resolver(cls, node_class):
+        """Busca el visit_TipoDeNodo de la clase y lo guarda en la caché"""
+        method_name = 'visit_' + node_class.__name__
+        visitor = getattr(cls, method_name, cls.generic_visit)
+        cls._dispatch[node_class] = visitor
+        return visitor
 
     def generic_visit(self, node):
         """
         Visitador genérico: se llama si no hay un 'visit_TipoDeNodo' específico.
         Simplemente visita a todos los hijos.
         """
-        if isinstance(node, Block):
-            for child in node.children:
+        # Sirve tanto para Block como para su vista en ast_arena
+        children = getattr(node, 'children', None)
+        if children is not None:
+            for child in children:
                 self.visit(child)
 
 class SemanticAnalyzer(NodeVisitor):
-    def __init__(self):
+    def __init__(self, log=print):
         self.symbol_table = SymbolTable()
+        # Destino de las trazas "Analizando ..." (None = silencioso, sin
+        # siquiera formatear los mensajes)
+        self.log = log
 
     def visit_Block(self, node):
         """
@@ -132,7 +187,8 @@ class SemanticAnalyzer(NodeVisitor):
         Regla Semántica: Declaración de variable.
         1. ¿Ya existe en el ámbito actual?
         """
-        print(f"Analizando declaración: {node.var_type} {node.var_name}")
+        if self.log:
+            self.log(f"Analizando declaración: {node.var_type} {node.var_name}")
         symbol = Symbol(name=node.var_name, var_type=node.var_type)
         
         if not self.symbol_table.declare(symbol):
@@ -144,7 +200,8 @@ class SemanticAnalyzer(NodeVisitor):
         1. ¿Existe la variable destino?
         2. ¿Coinciden los tipos (el de la variable y el del valor)?
         """
-        print(f"Analizando asignación para: {node.target.name}")
+        if self.log:
+            self.log(f"Analizando asignación para: {node.target.name}")
         
         var_symbol = self.symbol_table.lookup(node.target.name)
         if not var_symbol:
@@ -163,18 +220,53 @@ class SemanticAnalyzer(NodeVisitor):
         1. ¿Qué tipo tienen los operandos?
         2. ¿Son compatibles para la operación?
         DEVUELVE: El tipo del resultado de la operación.
+
+        El árbol de operaciones se recorre con una pila explícita (mismo
+        orden que la versión recursiva), así expresiones muy profundas no
+        provocan RecursionError.
         """
-        print(f"Analizando BinOp: {node.op}")
-        left_type = self.visit(node.left)
-        right_type = self.visit(node.right)
+        tipos = []
+        pila = [(node, False)]
+        while pila:
+            actual, listo = pila.pop()
+            if listo:
+                right_type = tipos.pop()
+                left_type = tipos.pop()
+                tipos.append(self.tipo_binop(actual.op, left_type, right_type))
+            elif es_binop(actual):
+                if self.log:
+                    self.log(f"Analizando BinOp: {actual.op}")
+                pila.append((actual, True))
+                pila.append((actual.right, False))
+                pila.append((actual.left, False))
+            else:
+                tipos.append(self.visit(actual))
+        return tipos[0]
+
+    # Reglas de tipos de los operadores binarios
+    ARITMETICOS = ('+', '-', '*', '/')    # int, int -> int
+    RELACIONALES = ('<', '>', '<=', '>=')  # int, int -> bool
+    IGUALDAD = ('==', '!=')               # mismo tipo -> bool
+    LOGICOS = ('&&',)                     # bool, bool -> bool
 
-        if node.op == '+':
+    def tipo_binop(self, op, left_type, right_type):
+        """Tipo resultante de 'left_type op right_type' (o error)"""
+        if op in self.ARITMETICOS:
             if left_type == 'int' and right_type == 'int':
                 return 'int' 
-            else:
-                raise Exception(f"Error Semántico: Operación '+' no válida para tipos '{left_type}' y '{right_type}'.")
-        
-        raise Exception(f"Error Semántico: Operador binario '{node.op}' no reconocido.")
+        elif op in self.RELACIONALES:
+            if left_type == 'int' and right_type == 'int':
+                return 'bool'
+        elif op in self.IGUALDAD:
+            if left_type == right_type:
+                return 'bool'
+        elif op in self.LOGICOS:
+            if left_type == 'bool' and right_type == 'bool':
+                return 'bool'
+        else:
+            raise Exception(f"Error Semántico: Operador binario '{op}' no reconocido.")
+
+        raise Exception(f"Error Semántico: Operación '{op}' no válida para tipos '{left_type}' y '{right_type}'.")
 
     def visit_Identifier(self, node):
         """
@@ -182,19 +274,28 @@ class SemanticAnalyzer(NodeVisitor):
         1. ¿Existe?
         DEVUELVE: El tipo de la variable.
         """
-        print(f"Analizando identificador: {node.name}")
+        if self.log:
+            self.log(f"Analizando identificador: {node.name}")
         symbol = self.symbol_table.lookup(node.name)
         if not symbol:
             raise Exception(f"Error Semántico: Variable '{node.name}' no ha sido declarada.")
         return symbol.type
     def visit_IfStatement(self, node):
         """Validación de que la condición sea tipo booleano."""
-        # Esto solo asegura que el programa no falle en la fase semántica
-        self.visit(node.condition)
+        condition_type = self.visit(node.condition)
+        if condition_type != 'bool':
+            raise Exception(f"Error Semántico: La condición del 'if' debe ser 'bool', no '{condition_type}'.")
         self.visit(node.then_block)
         if node.else_block:
             self.visit(node.else_block)
 
+    def visit_WhileStatement(self, node):
+        """Validación de que la condición del ciclo sea tipo booleano."""
+        condition_type = self.visit(node.condition)
+        if condition_type != 'bool':
+            raise Exception(f"Error Semántico: La condición del 'while' debe ser 'bool', no '{condition_type}'.")
+        self.visit(node.body)
+
     def visit_Num(self, node):
         """Tipo de un literal numérico"""
         return 'int'
@@ -203,6 +304,10 @@ class SemanticAnalyzer(NodeVisitor):
         """Tipo de un literal de cadena"""
         return 'string'
 
+    def visit_Bool(self, node):
+        """Tipo de un literal booleano"""
+        return 'bool'
+
 # Pruebas del analizador semántico
 if __name__ == '__main__':
     # Test básico
@@ -0,0 +1,323 @@
+from array import array
+
+import analizador_semantico as nodos_ast
+
+# ===============================================================
+# AST EN ARENA (REPRESENTACIÓN COMPACTA)
+# ===============================================================
+#
+# En vez de un objeto Python por nodo, todos los nodos viven en columnas
+# paralelas indexadas por id de nodo:
+#
+#   tipos   array('B')  tipo de nodo (índice en TIPOS)
+#   a, b, c array('i')  campos del nodo: ids de hijos o índices del pool
+#   hijos   array('I')  ids de los hijos de cada Block (rango contiguo)
+#   pool    list        nombres, operadores y literales (sin repetir)
+#
+# Campos por tipo de nodo:
+#   Block        a = inicio en 'hijos', b = cantidad
+#   VarDecl      a = pool(var_type), b = pool(var_name)
+#   Assign       a = target, b = value
+#   BinOp        a = left, b = pool(op), c = right
+#   Identifier   a = pool(name)
+#   Num, String  a = pool(value)
+#   Bool         a = pool(value)
+#   IfStatement  a = condition, b = then_block, c = else_block (-1 si no hay)
+#   Print        a = expression
+#   WhileStatement a = condition, b = body
+#
+# La arena implementa los mismos constructores que analizador_semantico
+# (Block(...), BinOp(...), ...), así que el parser puede construirla
+# directamente: Parser(tokens, nodos=ASTArena()). Los visitors la recorren
+# mediante vistas (arena.view(id)) cuyas clases se llaman igual que las del
+# AST normal, por lo que el despacho 'visit_' + nombre funciona sin cambios.
+
+TIPOS = ('Block', 'VarDecl', 'Assign', 'BinOp', 'Identifier', 'Num', 'String',
+         'IfStatement', 'Print', 'Bool', 'WhileStatement')
+(BLOCK, VARDECL, ASSIGN, BINOP, IDENTIFIER, NUM, STRING,
+ IFSTATEMENT, PRINT, BOOL, WHILESTATEMENT) = range(len(TIPOS))
+
+SIN_NODO = -1
+
+
+class ASTArena:
+    """AST completo almacenado en arreglos tipados"""
+
+    def __init__(self):
+        self.tipos = array('B')
+        self.a = array('i')
+        self.b = array('i')
+        self.c = array('i')
+        self.hijos = array('I')
+        self.pool = []
+        self._indices_pool = {}
+        self.id_raiz = SIN_NODO
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def _nuevo(self, tipo, a=0, b=0, c=0):
+        self.tipos.append(tipo)
+        self.a.append(a)
+        self.b.append(b)
+        self.c.append(c)
+        return len(self.tipos) - 1
+
+    def constante(self, valor):
+        """Índice de 'valor' en el pool (se guarda una sola vez)"""
+        clave = (type(valor), valor)
+        indice = self._indices_pool.get(clave)
+        if indice is None:
+            indice = len(self.pool)
+            self.pool.append(valor)
+            self._indices_pool[clave] = indice
+        return indice
+
+    # -----------------------------------------------------------
+    # CONSTRUCTORES (misma interfaz que las clases del AST)
+    # -----------------------------------------------------------
+
+    def Block(self, children):
+        inicio = len(self.hijos)
+        self.hijos.extend(children)
+        return self._nuevo(BLOCK, inicio, len(children))
+
+    def VarDecl(self, var_type, var_name):
+        return self._nuevo(VARDECL, self.constante(var_type), self.constante(var_name))
+
+    def Assign(self, target, value):
+        return self._nuevo(ASSIGN, target, value)
+
+    def BinOp(self, left, op, right):
+        return self._nuevo(BINOP, left, self.constante(op), right)
+
+    def Identifier(self, name):
+        return self._nuevo(IDENTIFIER, self.constante(name))
+
+    def Num(self, value):
+        return self._nuevo(NUM, self.constante(value))
+
+    def String(self, value):
+        return self._nuevo(STRING, self.constante(value))
+
+    def Bool(self, value):
+        return self._nuevo(BOOL, self.constante(value))
+
+    def IfStatement(self, condition, then_block, else_block=None):
+        return self._nuevo(IFSTATEMENT, condition, then_block,
+                           SIN_NODO if else_block is None else else_block)
+
+    def Print(self, expression):
+        return self._nuevo(PRINT, expression)
+
+    def WhileStatement(self, condition, body):
+        return self._nuevo(WHILESTATEMENT, condition, body)
+
+    # -----------------------------------------------------------
+    # ACCESO
+    # -----------------------------------------------------------
+
+    def view(self, node_id):
+        """Vista liviana del nodo, recorrible por cualquier NodeVisitor"""
+        return VISTAS[self.tipos[node_id]](self, node_id)
+
+    def raiz(self):
+        return self.view(self.id_raiz)
+
+    def nbytes(self):
+        """Memoria aproximada de las columnas (sin contar el pool)"""
+        return sum(col.itemsize * len(col)
+                   for col in (self.tipos, self.a, self.b, self.c, self.hijos))
+
+    @classmethod
+    def from_ast(cls, node):
+        """Convierte un AST de objetos en arena (recorrido iterativo)"""
+        arena = cls()
+        ids = {}
+        pila = [(node, False)]
+        while pila:
+            actual, listo = pila.pop()
+            if not listo:
+                pila.append((actual, True))
+                for hijo in reversed(_hijos_de(actual)):
+                    pila.append((hijo, False))
+                continue
+            ids[id(actual)] = _copiar(arena, actual, ids)
+        arena.id_raiz = ids[id(node)]
+        return arena
+
+    def to_ast(self, node_id=None):
+        """Reconstruye el AST de objetos a partir de la arena"""
+        if node_id is None:
+            node_id = self.id_raiz
+        nodos = {}
+        pila = [(node_id, False)]
+        while pila:
+            actual, listo = pila.pop()
+            if not listo:
+                pila.append((actual, True))
+                for hijo in self._ids_hijos(actual):
+                    pila.append((hijo, False))
+                continue
+            nodos[actual] = self._materializar(actual, nodos)
+        return nodos[node_id]
+
+    def _ids_hijos(self, i):
+        tipo = self.tipos[i]
+        if tipo == BLOCK:
+            return self.hijos[self.a[i]:self.a[i] + self.b[i]].tolist()
+        if tipo == ASSIGN or tipo == WHILESTATEMENT:
+            return [self.a[i], self.b[i]]
+        if tipo == BINOP:
+            return [self.a[i], self.c[i]]
+        if tipo == IFSTATEMENT:
+            return [n for n in (self.a[i], self.b[i], self.c[i]) if n != SIN_NODO]
+        if tipo == PRINT:
+            return [self.a[i]]
+        return []
+
+    def _materializar(self, i, nodos):
+        tipo, a, b, c, pool = self.tipos[i], self.a[i], self.b[i], self.c[i], self.pool
+        if tipo == BLOCK:
+            return nodos_ast.Block([nodos[h] for h in self.hijos[a:a + b]])
+        if tipo == VARDECL:
+            return nodos_ast.VarDecl(pool[a], pool[b])
+        if tipo == ASSIGN:
+            return nodos_ast.Assign(nodos[a], nodos[b])
+        if tipo == BINOP:
+            return nodos_ast.BinOp(nodos[a], pool[b], nodos[c])
+        if tipo == IDENTIFIER:
+            return nodos_ast.Identifier(pool[a])
+        if tipo == NUM:
+            return nodos_ast.Num(pool[a])
+        if tipo == STRING:
+            return nodos_ast.String(pool[a])
+        if tipo == BOOL:
+            return nodos_ast.Bool(pool[a])
+        if tipo == WHILESTATEMENT:
+            return nodos_ast.WhileStatement(nodos[a], nodos[b])
+        if tipo == IFSTATEMENT:
+            return nodos_ast.IfStatement(nodos[a], nodos[b], None if c == SIN_NODO else nodos[c])
+        return nodos_ast.Print(nodos[a])
+
+
+def _hijos_de(node):
+    """Hijos (nodos) de un nodo del AST de objetos, en orden"""
+    nombre = type(node).__name__
+    if nombre == 'Block':
+        return list(node.children)
+    if nombre == 'Assign':
+        return [node.target, node.value]
+    if nombre == 'BinOp':
+        return [node.left, node.right]
+    if nombre == 'IfStatement':
+        return [n for n in (node.condition, node.then_block, node.else_block) if n is not None]
+    if nombre == 'Print':
+        return [node.expression]
+    if nombre == 'WhileStatement':
+        return [node.condition, node.body]
+    return []
+
+
+def _copiar(arena, node, ids):
+    """Crea en la arena el nodo equivalente (sus hijos ya tienen id)"""
+    nombre = type(node).__name__
+    if nombre == 'Block':
+        return arena.Block([ids[id(h)] for h in node.children])
+    if nombre == 'VarDecl':
+        return arena.VarDecl(node.var_type, node.var_name)
+    if nombre == 'Assign':
+        return arena.Assign(ids[id(node.target)], ids[id(node.value)])
+    if nombre == 'BinOp':
+        return arena.BinOp(ids[id(node.left)], node.op, ids[id(node.right)])
+    if nombre == 'Identifier':
+        return arena.Identifier(node.name)
+    if nombre == 'Num':
+        return arena.Num(node.value)
+    if nombre == 'String':
+        return arena.String(node.value)
+    if nombre == 'Bool':
+        return arena.Bool(node.value)
+    if nombre == 'IfStatement':
+        else_block = None if node.else_block is None else ids[id(node.else_block)]
+        return arena.IfStatement(ids[id(node.condition)], ids[id(node.then_block)], else_block)
+    if nombre == 'Print':
+        return arena.Print(ids[id(node.expression)])
+    if nombre == 'WhileStatement':
+        return arena.WhileStatement(ids[id(node.condition)], ids[id(node.body)])
+    raise TypeError(f"Nodo no soportado por la arena: {nombre}")
+
+
+# ===============================================================
+# VISTAS
+# ===============================================================
+
+class NodeView:
+    """Vista de un nodo de la arena: solo guarda (arena, id)"""
+
+    __slots__ = ('arena', 'id')
+
+    def __init__(self, arena, node_id):
+        self.arena = arena
+        self.id = node_id
+
+    def __eq__(self, other):
+        return (type(other) is type(self) and other.arena is self.arena
+                and other.id == self.id)
+
+    def __hash__(self):
+        return hash((id(self.arena), self.id))
+
+
+def _nodo(columna):
+    def leer(self):
+        return self.arena.view(getattr(self.arena, columna)[self.id])
+    return property(leer)
+
+
+def _nodo_opcional(columna):
+    def leer(self):
+        node_id = getattr(self.arena, columna)[self.id]
+        return None if node_id == SIN_NODO else self.arena.view(node_id)
+    return property(leer)
+
+
+def _constante(columna):
+    def leer(self):
+        return self.arena.pool[getattr(self.arena, columna)[self.id]]
+    return property(leer)
+
+
+def _children(self):
+    arena = self.arena
+    inicio = arena.a[self.id]
+    return [arena.view(h) for h in arena.hijos[inicio:inicio + arena.b[self.id]]]
+
+
+_CAMPOS = {
+    'Block':       {'children': property(_children)},
+    'VarDecl':     {'var_type': _constante('a'), 'var_name': _constante('b')},
+    'Assign':      {'target': _nodo('a'), 'value': _nodo('b')},
+    'BinOp':       {'left': _nodo('a'), 'op': _constante('b'), 'right': _nodo('c')},
+    'Identifier':  {'name': _constante('a')},
+    'Num':         {'value': _constante('a')},
+    'String':      {'value': _constante('a')},
+    'Bool':        {'value': _constante('a')},
+    'IfStatement': {'condition': _nodo('a'), 'then_block': _nodo('b'),
+                    'else_block': _nodo_opcional('c')},
+    'Print':       {'expression': _nodo('a')},
+    'WhileStatement': {'condition': _nodo('a'), 'body': _nodo('b')},
+}
+
+# Una clase de vista por tipo, con el MISMO nombre que la clase del AST
+VISTAS = tuple(type(nombre, (NodeView,), dict(_CAMPOS[nombre], __slots__=()))
+               for nombre in TIPOS)
+
+
+def parse_source_arena(source_code):
+    """Parsea directamente a una ASTArena (sin crear objetos nodo)"""
+    from parser import Parser, tokenizar
+
+    arena = ASTArena()
+    arena.id_raiz = Parser(tokenizar(source_code), nodos=arena).parse()
+    return arena
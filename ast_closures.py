@@ -0,0 +1,343 @@
+import sys
+
+from analizador_semantico import NodeVisitor, es_binop
+from tac_assembler import OPERADORES, operador_desconocido, imprimir_salida, LimiteExcedido
+
+# ===============================================================
+# BACKEND DE CLAUSURAS (AST -> FUNCIONES PYTHON)
+# ===============================================================
+#
+# Alternativa al camino TAC (generar texto, ensamblar, interpretar) para
+# cuando no hace falta ver el TAC: el AST ya verificado se convierte en un
+# árbol de clausuras Python con todo resuelto de antemano.
+#
+#   - Cada variable tiene un slot fijo en una lista 'r' (registros),
+#     asignado al compilar; las clausuras solo indexan la lista.
+#   - Los literales se convierten una vez (sin comillas, como en el TAC).
+#   - Cada BinOp toma la función de su operador de OPERADORES (los mismos
+#     que usa el intérprete) y se especializa según sus operandos sean
+#     slots, constantes u otras expresiones.
+#
+# El volcado de memoria lista las variables en el orden de su primera
+# asignación en el código, igual que el intérprete TAC.
+#
+# La función que recibe la salida de 'print' también vive en un slot del
+# banco de registros: la carga el ejecutor antes de correr, así el mismo
+# ProgramaClausuras (guardado en la caché) sirve con cualquier salida.
+#
+# Compilado con limitar=True, cada vuelta de un while descuenta de otro
+# slot (el presupuesto) su costo estático: los nodos de la condición y del
+# cuerpo, una cota de las instrucciones TAC que ejecuta la vuelta. Sin
+# ciclos un programa no puede correr más que su tamaño.
+#
+# Las expresiones muy profundas no se anidan como clausuras (su ejecución
+# sería recursiva): se compilan a una secuencia de pasos sobre slots
+# auxiliares que recorre un bucle.
+
+PROFUNDIDAD_MAXIMA = 100
+
+HOJA_SLOT, HOJA_CONSTANTE, HOJA_FUNCION = range(3)
+
+# Nombres de los slots de la función de salida y del presupuesto de
+# instrucciones (no son nombres de variable válidos)
+SALIDA = ('salida',)
+PRESUPUESTO = ('presupuesto',)
+
+
+class ProgramaClausuras:
+    """
+    Programa compilado a clausuras.
+      ejecutar:   función que recibe la lista de registros y corre el programa
+      variables:  nombre -> slot de las variables asignadas, en orden de aparición
+      slots:      tamaño del banco de registros (variables y auxiliares)
+      slot_salida: slot de la función de salida (None si no hay 'print')
+      slot_presupuesto: slot del presupuesto de instrucciones (None si no
+                   se compiló con límite o no hay ciclos)
+    """
+
+    def __init__(self, ejecutar, variables, slots, slot_salida=None, slot_presupuesto=None):
+        self.ejecutar = ejecutar
+        self.variables = variables
+        self.slots = slots
+        self.slot_salida = slot_salida
+        self.slot_presupuesto = slot_presupuesto
+
+    def memoria(self, registros):
+        return {nombre: registros[slot] for nombre, slot in self.variables.items()}
+
+
+class ClosureCompiler(NodeVisitor):
+    def __init__(self, limitar=False):
+        self.slots = {}      # nombre -> slot (variables y auxiliares)
+        self.variables = {}  # nombre -> slot, solo las asignadas (volcado)
+        self.limitar = limitar
+
+    def compilar(self, ast):
+        ejecutar = self.visit(ast)
+        return ProgramaClausuras(ejecutar, self.variables, len(self.slots),
+                                 self.slots.get(SALIDA), self.slots.get(PRESUPUESTO))
+
+    def slot(self, nombre):
+        slot = self.slots.get(nombre)
+        if slot is None:
+            slot = self.slots[nombre] = len(self.slots)
+        return slot
+
+    def auxiliar(self):
+        """Slot extra sin nombre de variable (no aparece en la memoria)"""
+        return self.slot(('auxiliar', len(self.slots)))
+
+    # -----------------------------------------------------------
+    # EXPRESIONES: devuelven (tipo de hoja, valor)
+    # -----------------------------------------------------------
+
+    def hoja(self, node):
+        nombre = type(node).__name__
+        if nombre == 'Identifier':
+            return (HOJA_SLOT, self.slot(node.name))
+        if nombre == 'Num' or nombre == 'Bool':
+            return (HOJA_CONSTANTE, node.value)
+        if nombre == 'String':
+            valor = node.value
+            if len(valor) >= 2 and valor.startswith('"') and valor.endswith('"'):
+                valor = valor[1:-1]
+            return (HOJA_CONSTANTE, valor)
+        raise Exception(f"Error de compilación: expresión no soportada '{nombre}'")
+
+    def expresion(self, node):
+        if not es_binop(node):
+            return self.hoja(node)
+        if profundidad(node) > PROFUNDIDAD_MAXIMA:
+            return (HOJA_FUNCION, self.secuencia(node))
+
+        # Post-orden con pila explícita
+        resultados = []
+        pila = [(node, False)]
+        while pila:
+            actual, listo = pila.pop()
+            if listo:
+                der = resultados.pop()
+                izq = resultados.pop()
+                operador = OPERADORES.get(actual.op, operador_desconocido)
+                resultados.append((HOJA_FUNCION, binaria(operador, izq, der)))
+            elif es_binop(actual):
+                pila.append((actual, True))
+                pila.append((actual.right, False))
+                pila.append((actual.left, False))
+            else:
+                resultados.append(self.hoja(actual))
+        return resultados[0]
+
+    def secuencia(self, node):
+        """Expresión profunda: pasos (operador, destino, a, b) sobre slots, en un bucle"""
+        pasos = []
+        constantes = []  # (slot, valor) que se cargan antes de evaluar
+        resultados = []
+        pila = [(node, False)]
+        while pila:
+            actual, listo = pila.pop()
+            if listo:
+                der = resultados.pop()
+                izq = resultados.pop()
+                destino = self.auxiliar()
+                pasos.append((OPERADORES.get(actual.op, operador_desconocido), destino, izq, der))
+                resultados.append(destino)
+            elif es_binop(actual):
+                pila.append((actual, True))
+                pila.append((actual.right, False))
+                pila.append((actual.left, False))
+            else:
+                tipo, valor = self.hoja(actual)
+                if tipo == HOJA_CONSTANTE:
+                    slot = self.auxiliar()
+                    constantes.append((slot, valor))
+                    valor = slot
+                resultados.append(valor)
+        resultado = resultados[0]
+
+        def evaluar(r):
+            for slot, valor in constantes:
+                r[slot] = valor
+            for operador, destino, a, b in pasos:
+                r[destino] = operador(r[a], r[b])
+            return r[resultado]
+        return evaluar
+
+    # -----------------------------------------------------------
+    # SENTENCIAS: devuelven una función f(r)
+    # -----------------------------------------------------------
+
+    def generic_visit(self, node):
+        return nada
+
+    def visit_Block(self, node):
+        sentencias = [self.visit(child) for child in node.children]
+        sentencias = tuple(s for s in sentencias if s is not nada)
+        if len(sentencias) == 1:
+            return sentencias[0]
+
+        def bloque(r):
+            for sentencia in sentencias:
+                sentencia(r)
+        return bloque
+
+    def visit_VarDecl(self, node):
+        return nada
+
+    def visit_Assign(self, node):
+        tipo, valor = self.expresion(node.value)
+        destino = self.slot(node.target.name)
+        self.variables.setdefault(node.target.name, destino)
+
+        if tipo == HOJA_CONSTANTE:
+            def asignar(r):
+                r[destino] = valor
+        elif tipo == HOJA_SLOT:
+            def asignar(r):
+                r[destino] = r[valor]
+        else:
+            def asignar(r):
+                r[destino] = valor(r)
+        return asignar
+
+    def visit_Print(self, node):
+        evaluar = funcion(self.expresion(node.expression))
+        salida = self.slot(SALIDA)
+
+        def imprimir(r):
+            r[salida](evaluar(r))
+        return imprimir
+
+    def visit_IfStatement(self, node):
+        condicion = funcion(self.expresion(node.condition))
+        entonces = self.visit(node.then_block)
+        sino = self.visit(node.else_block) if node.else_block else nada
+
+        def si(r):
+            if condicion(r):
+                entonces(r)
+            else:
+                sino(r)
+        return si
+
+    def visit_WhileStatement(self, node):
+        condicion = funcion(self.expresion(node.condition))
+        cuerpo = self.visit(node.body)
+
+        if self.limitar:
+            presupuesto = self.slot(PRESUPUESTO)
+            costo = costo_estatico(node)
+
+            def mientras_limitado(r):
+                while condicion(r):
+                    r[presupuesto] -= costo
+                    if r[presupuesto] < 0:
+                        raise LimiteExcedido("Error de Ejecución: se superó el límite de instrucciones.")
+                    cuerpo(r)
+            return mientras_limitado
+
+        def mientras(r):
+            while condicion(r):
+                cuerpo(r)
+        return mientras
+
+
+def nada(r):
+    pass
+
+
+def profundidad(node):
+    maxima = 0
+    pila = [(node, 1)]
+    while pila:
+        actual, nivel = pila.pop()
+        if es_binop(actual):
+            maxima = max(maxima, nivel)
+            pila.append((actual.left, nivel + 1))
+            pila.append((actual.right, nivel + 1))
+    return maxima
+
+
+def costo_estatico(node):
+    """Nodos de un subárbol: cota de las instrucciones de una vuelta de ciclo"""
+    costo = 0
+    pila = [node]
+    while pila:
+        actual = pila.pop()
+        costo += 1
+        for campo in ('children', 'condition', 'then_block', 'else_block', 'body',
+                      'value', 'expression', 'left', 'right'):
+            hijo = getattr(actual, campo, None)
+            if hijo is None:
+                continue
+            if isinstance(hijo, (list, tuple)):
+                pila.extend(hijo)
+            elif not isinstance(hijo, (str, int)):
+                pila.append(hijo)
+    return costo
+
+
+def funcion(hoja):
+    """Convierte cualquier hoja en una función f(r)"""
+    tipo, valor = hoja
+    if tipo == HOJA_FUNCION:
+        return valor
+    if tipo == HOJA_SLOT:
+        return lambda r: r[valor]
+    return lambda r: valor
+
+
+def binaria(operador, izq, der):
+    """Clausura para 'izq operador der', especializada según los operandos"""
+    ti, vi = izq
+    td, vd = der
+    if ti == HOJA_SLOT and td == HOJA_SLOT:
+        return lambda r: operador(r[vi], r[vd])
+    if ti == HOJA_SLOT and td == HOJA_CONSTANTE:
+        return lambda r: operador(r[vi], vd)
+    if ti == HOJA_CONSTANTE and td == HOJA_SLOT:
+        return lambda r: operador(vi, r[vd])
+    fi, fd = funcion(izq), funcion(der)
+    return lambda r: operador(fi(r), fd(r))
+
+
+def compilar_ast(ast, limitar=False):
+    """Compila un AST ya verificado a un ProgramaClausuras"""
+    return ClosureCompiler(limitar).compilar(ast)
+
+
+class ASTClosureExecutor:
+    """Misma interfaz que TACInterpreter, pero ejecuta el AST compilado a clausuras"""
+
+    def __init__(self, salida=imprimir_salida, limite_instrucciones=None):
+        self.salida = salida
+        self.limite_instrucciones = limite_instrucciones
+        self.memory = {}
+        self.temps = {}
+        self.registros = []
+        # Costo de los ciclos cobrado al presupuesto (None si el programa no
+        # se compiló con límite o no tiene ciclos)
+        self.pasos = None
+
+    def execute(self, ast):
+        if isinstance(ast, ProgramaClausuras):
+            programa = ast
+        else:
+            programa = compilar_ast(ast, limitar=self.limite_instrucciones is not None)
+        r = [0] * programa.slots
+        if programa.slot_salida is not None:
+            r[programa.slot_salida] = self.salida
+        inicial = None
+        if programa.slot_presupuesto is not None:
+            limite = self.limite_instrucciones
+            inicial = r[programa.slot_presupuesto] = sys.maxsize if limite is None else limite
+        try:
+            programa.ejecutar(r)
+        except LimiteExcedido:
+            raise LimiteExcedido(f"Error de Ejecución: se superó el límite de "
+                                 f"{self.limite_instrucciones} instrucciones.") from None
+        if inicial is not None:
+            self.pasos = inicial - r[programa.slot_presupuesto]
+        self.registros = r
+        self.memory = programa.memoria(r)
+        return self.memory
@@ -0,0 +1,242 @@
+from analizador_semantico import NodeVisitor, Identifier, Num, String, Bool, es_binop
+from tac_assembler import OPERADORES
+
+# ===============================================================
+# OPTIMIZADOR DE AST
+# ===============================================================
+#
+# Pasada entre SemanticAnalyzer y TACGenerator (el AST ya es válido):
+#
+#   - Plegado de constantes: '20 * 30' pasa a ser Num(600), '5 < 3' Bool(False).
+#   - Propagación de constantes: tras 'var int a = 15;' cada lectura de 'a'
+#     se reemplaza por 15 mientras 'a' no cambie. Las asignaciones se
+#     conservan (la memoria final del programa no cambia).
+#   - Identidades algebraicas: x*1, x+0, x-0, x/1 -> x;  x*0 -> 0;
+#     x && true -> x;  x && false -> false.
+#     x*0 y x && false solo se aplican si 'x' no tiene divisiones que
+#     puedan fallar (descartarlo borraría el error). x && true solo si 'x'
+#     ya es un bool (literal, comparación u otro &&): '&&' siempre da bool
+#     y una variable bool sin asignar vale 0.
+#
+# El entorno de constantes se mantiene en código lineal. En un 'if' cada
+# rama parte de una copia y al salir solo quedan las constantes en que
+# coinciden ambas (o las de la rama tomada, si la condición es constante).
+# En un 'while' se olvidan antes de entrar las variables asignadas en el
+# cuerpo. Las divisiones por cero no se pliegan: el error sigue ocurriendo
+# al ejecutar.
+#
+# Los valores se calculan con los mismos operadores que el intérprete
+# (tac_assembler.OPERADORES), así el resultado plegado es idéntico.
+
+
+def es_constante(node):
+    return isinstance(node, (Num, String, Bool))
+
+
+def constante(valor):
+    """Nodo literal para un valor de Python"""
+    if isinstance(valor, bool):
+        return Bool(valor)
+    if isinstance(valor, int):
+        return Num(valor)
+    return String(valor)  # Las cadenas conservan sus comillas, como en el parser
+
+
+def es_entero(node, valor):
+    """¿Es 'node' el literal entero 'valor'? (los bool no cuentan)"""
+    return type(node) is Num and type(node.value) is int and node.value == valor
+
+
+def es_booleano(node, valor):
+    return type(node) is Bool and node.value is valor
+
+
+COMPARADORES = frozenset(('==', '!=', '<', '>', '<=', '>='))
+
+
+def es_bool(node):
+    """¿El valor de 'node' es seguro un bool de Python?"""
+    if type(node) is Bool:
+        return True
+    return es_binop(node) and (node.op in COMPARADORES or node.op == '&&')
+
+
+def puede_fallar(node):
+    """¿Tiene 'node' una división cuyo divisor no es un entero literal distinto de 0?"""
+    pendientes = [node]
+    while pendientes:
+        n = pendientes.pop()
+        if es_binop(n):
+            if n.op == '/' and not (type(n.right) is Num and type(n.right.value) is int
+                                    and n.right.value != 0):
+                return True
+            pendientes.append(n.left)
+            pendientes.append(n.right)
+    return False
+
+
+def asignadas(node):
+    """Nombres de las variables asignadas en algún punto de 'node'"""
+    nombres = set()
+    pendientes = [node]
+    while pendientes:
+        n = pendientes.pop()
+        if n is None:
+            continue
+        nombre = type(n).__name__
+        if nombre == 'Assign':
+            nombres.add(n.target.name)
+        elif nombre == 'Block':
+            pendientes.extend(n.children)
+        elif nombre == 'IfStatement':
+            pendientes.extend((n.then_block, n.else_block))
+        elif nombre == 'WhileStatement':
+            pendientes.append(n.body)
+    return nombres
+
+
+class ASTOptimizer(NodeVisitor):
+    def __init__(self):
+        self.entorno = {}        # nombre -> valor constante conocido
+        self.plegadas = 0        # operaciones calculadas en compilación
+        self.propagadas = 0      # lecturas de variables reemplazadas por su valor
+        self.simplificadas = 0   # identidades algebraicas aplicadas
+
+    def optimizar(self, ast):
+        """Optimiza el AST (lo modifica) y lo devuelve"""
+        return self.visit(ast)
+
+    def resumen(self):
+        return (f"{self.plegadas} operaciones plegadas, "
+                f"{self.propagadas} constantes propagadas, "
+                f"{self.simplificadas} identidades simplificadas")
+
+    # -----------------------------------------------------------
+    # EXPRESIONES
+    # -----------------------------------------------------------
+
+    def optimizar_expr(self, node):
+        # Post-orden con pila explícita, igual que los demás visitors de BinOp
+        resultados = []
+        pila = [(node, False)]
+        while pila:
+            actual, listo = pila.pop()
+            if listo:
+                right = resultados.pop()
+                left = resultados.pop()
+                resultados.append(self.simplificar(actual, left, right))
+            elif es_binop(actual):
+                pila.append((actual, True))
+                pila.append((actual.right, False))
+                pila.append((actual.left, False))
+            elif isinstance(actual, Identifier) and actual.name in self.entorno:
+                self.propagadas += 1
+                resultados.append(constante(self.entorno[actual.name]))
+            else:
+                resultados.append(actual)
+        return resultados[0]
+
+    def simplificar(self, node, left, right):
+        """Nodo equivalente a 'left node.op right' con los operandos ya optimizados"""
+        op = node.op
+
+        if es_constante(left) and es_constante(right):
+            if not (op == '/' and right.value == 0) and op in OPERADORES:
+                self.plegadas += 1
+                return constante(OPERADORES[op](left.value, right.value))
+
+        if op == '+':
+            if es_entero(right, 0):
+                return self._identidad(left)
+            if es_entero(left, 0):
+                return self._identidad(right)
+        elif op == '-':
+            if es_entero(right, 0):
+                return self._identidad(left)
+        elif op == '*':
+            if es_entero(right, 1):
+                return self._identidad(left)
+            if es_entero(left, 1):
+                return self._identidad(right)
+            if ((es_entero(left, 0) and not puede_fallar(right))
+                    or (es_entero(right, 0) and not puede_fallar(left))):
+                return self._identidad(Num(0))
+        elif op == '/':
+            if es_entero(right, 1):
+                return self._identidad(left)
+        elif op == '&&':
+            if es_booleano(right, True) and es_bool(left):
+                return self._identidad(left)
+            if es_booleano(left, True) and es_bool(right):
+                return self._identidad(right)
+            if ((es_booleano(left, False) and not puede_fallar(right))
+                    or (es_booleano(right, False) and not puede_fallar(left))):
+                return self._identidad(Bool(False))
+
+        node.left = left
+        node.right = right
+        return node
+
+    def _identidad(self, node):
+        self.simplificadas += 1
+        return node
+
+    # -----------------------------------------------------------
+    # SENTENCIAS
+    # -----------------------------------------------------------
+
+    def generic_visit(self, node):
+        return node
+
+    def visit_Block(self, node):
+        node.children = [self.visit(child) for child in node.children]
+        return node
+
+    def visit_Assign(self, node):
+        node.value = self.optimizar_expr(node.value)
+        if es_constante(node.value):
+            self.entorno[node.target.name] = node.value.value
+        else:
+            self.entorno.pop(node.target.name, None)
+        return node
+
+    def visit_Print(self, node):
+        node.expression = self.optimizar_expr(node.expression)
+        return node
+
+    def visit_IfStatement(self, node):
+        node.condition = self.optimizar_expr(node.condition)
+        entrada = self.entorno
+
+        self.entorno = dict(entrada)
+        node.then_block = self.visit(node.then_block)
+        tras_then = self.entorno
+
+        self.entorno = dict(entrada)
+        if node.else_block:
+            node.else_block = self.visit(node.else_block)
+        tras_else = self.entorno
+
+        if es_booleano(node.condition, True):
+            self.entorno = tras_then
+        elif es_booleano(node.condition, False):
+            self.entorno = tras_else
+        else:
+            # Solo sobrevive lo que vale lo mismo por ambos caminos
+            self.entorno = {nombre: valor for nombre, valor in tras_then.items()
+                            if nombre in tras_else and tras_else[nombre] == valor
+                            and type(tras_else[nombre]) is type(valor)}
+        return node
+
+    def visit_WhileStatement(self, node):
+        # Lo que el cuerpo modifica no es constante ni en la condición
+        for nombre in asignadas(node.body):
+            self.entorno.pop(nombre, None)
+        entrada = self.entorno
+
+        node.condition = self.optimizar_expr(node.condition)
+        self.entorno = dict(entrada)
+        node.body = self.visit(node.body)
+
+        self.entorno = entrada
+        return node
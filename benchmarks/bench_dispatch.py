@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del despacho de visitors.
+Compara el despacho original ('visit_' + nombre + getattr en cada nodo)
+con la caché por (clase de visitor, clase de nodo) de NodeVisitor.
+
+Uso: python3 benchmarks/bench_dispatch.py [profundidad] [repeticiones]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from analizador_semantico import BinOp, Identifier, Num
+from tac_generator import TACGenerator
+
+
+class TACGeneratorSinCache(TACGenerator):
+    """Mismo generador, con el despacho anterior (sin caché)"""
+
+    def visit(self, node):
+        method_name = 'visit_' + type(node).__name__
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+
+def arbol_profundo(profundidad):
+    """x + (1 * (x + (2 * ...))) con 'profundidad' niveles"""
+    node = Identifier('x')
+    for i in range(profundidad):
+        node = BinOp(Num(i), '*' if i % 2 else '+', node)
+    return node
+
+
+def medir(clase, arbol, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        generador = clase()
+        inicio = time.perf_counter()
+        generador.visit(arbol)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    profundidad = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), profundidad * 4))
+
+    arbol = arbol_profundo(profundidad)
+    nodos = profundidad * 2 + 1
+    sin_cache = medir(TACGeneratorSinCache, arbol, repeticiones)
+    con_cache = medir(TACGenerator, arbol, repeticiones)
+
+    print(f"Árbol de {nodos} nodos (profundidad {profundidad}), mejor de {repeticiones}")
+    print(f"  sin caché: {sin_cache * 1e6:9.1f} µs  ({sin_cache / nodos * 1e9:6.1f} ns/nodo)")
+    print(f"  con caché: {con_cache * 1e6:9.1f} µs  ({con_cache / nodos * 1e9:6.1f} ns/nodo)")
+    print(f"  aceleración: {sin_cache / con_cache:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks del compilador completo. Genera programas sintéticos
+(benchmarks/generador.py) de varios tamaños, mide cada fase desde el
+léxico hasta la ejecución en TACInterpreter, muestra cómo crece cada una
+con el tamaño y guarda los resultados en JSON. 'comparar' marca las
+regresiones de un resultado contra otro guardado antes (la base).
+
+Uso:
+  python3 benchmarks/bench_suite.py correr [--salida RESULTADO.json] [--escala F]
+                                           [--familias ...] [--repeticiones N]
+                                           [--memoria] [--comparar BASE.json]
+  python3 benchmarks/bench_suite.py comparar BASE.json NUEVO.json [--umbral 0.10]
+
+Cada fase se mide 'repeticiones' veces y se guarda el mínimo (el valor
+menos afectado por el ruido de la máquina). Con --memoria se hace una
+corrida más con tracemalloc para el pico de memoria de cada fase, aparte,
+así no infla los tiempos. La comparación termina con código 1 si hay
+regresiones.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from Analizador_lexico import tokenizar
+from parser import Parser
+from analizador_semantico import SemanticAnalyzer
+from ast_optimizer import ASTOptimizer
+from tac_generator import TACGenerator
+from tac_assembler import ensamblar
+from tac_interpreter import TACInterpreter
+from compile_cache import VERSION_COMPILADOR
+from compile_profile import PhaseProfiler, contar_nodos
+from generador import FAMILIAS, generar
+
+FORMATO = 1
+
+FASES = ('Léxico', 'Sintáctico', 'Semántico', 'Optimización', 'Generación TAC', 'Ensamblado',
+         'Ejecución')
+COLUMNAS = ('Léxico', 'Sintáct.', 'Semánt.', 'Optim.', 'Gen. TAC', 'Ensamb.', 'Ejecución')
+
+# Tamaños por defecto de cada familia (se multiplican por --escala)
+TAMANOS = {
+    'declaraciones': (1_000, 4_000, 16_000),
+    'expresiones': (1_000, 4_000, 16_000),
+    'condicionales': (500, 2_000, 8_000),
+    'ciclos': (20_000, 80_000, 320_000),
+}
+
+# Debajo de esta diferencia (ms) una fase no se considera regresión aunque
+# supere el umbral relativo: son fases demasiado cortas para medirlas así
+MINIMO_MS = 1.0
+
+
+def descartar(valor):
+    pass
+
+
+def correr_fases(fuente, perfil):
+    """Todas las fases sobre 'fuente', cada una medida con 'perfil'"""
+    with perfil.fase('Léxico'):
+        tokens = tokenizar(fuente, log=None)
+    perfil.contar('tokens', len(tokens))
+
+    with perfil.fase('Sintáctico'):
+        ast = Parser(tokens).parse()
+    nodos = contar_nodos(ast)
+    perfil.contar('nodos', nodos)
+
+    with perfil.fase('Semántico'):
+        SemanticAnalyzer(log=None).visit(ast)
+    perfil.contar('nodos', nodos)
+
+    with perfil.fase('Optimización'):
+        ast = ASTOptimizer().optimizar(ast)
+    perfil.contar('nodos', contar_nodos(ast))
+
+    with perfil.fase('Generación TAC'):
+        tac = TACGenerator().generate(ast)
+
+    with perfil.fase('Ensamblado'):
+        programa = ensamblar(tac)
+    perfil.contar('instrucciones', len(programa))
+
+    interprete = TACInterpreter(salida=descartar)
+    with perfil.fase('Ejecución'):
+        interprete.execute(programa)
+    perfil.contar('cota_ejecutadas', interprete.pasos)
+
+
+def medir_caso(familia, tamano, repeticiones, memoria):
+    """
+    Dict con el mínimo de cada fase, los contadores de cada fase y
+    (opcional) los picos de memoria
+    """
+    fuente = generar(familia, tamano)
+    mejores = {}
+    contadores = {}
+    for _ in range(repeticiones):
+        with PhaseProfiler(memoria=False) as perfil:
+            correr_fases(fuente, perfil)
+        for medicion in perfil.mediciones:
+            anterior = mejores.get(medicion.fase)
+            mejores[medicion.fase] = medicion.ms if anterior is None else min(anterior, medicion.ms)
+            contadores[medicion.fase] = medicion.contadores
+
+    picos = None
+    if memoria:
+        with PhaseProfiler(memoria=True) as perfil:
+            correr_fases(fuente, perfil)
+        picos = {medicion.fase: medicion.pico_kb for medicion in perfil.mediciones}
+
+    return {
+        'familia': familia,
+        'tamano': tamano,
+        'bytes': len(fuente.encode('utf-8')),
+        'contadores': contadores,
+        'fases': mejores,
+        'total_ms': sum(mejores.values()),
+        'pico_kb': picos,
+    }
+
+
+def correr(familias, escala, repeticiones, memoria):
+    casos = []
+    for familia in familias:
+        for base in TAMANOS[familia]:
+            tamano = max(1, int(base * escala))
+            print(f"  {familia} N={tamano}...", file=sys.stderr, flush=True)
+            casos.append(medir_caso(familia, tamano, repeticiones, memoria))
+    return {
+        'formato': FORMATO,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'compilador': VERSION_COMPILADOR,
+        'repeticiones': repeticiones,
+        'casos': casos,
+    }
+
+
+# ===============================================================
+# INFORME
+# ===============================================================
+
+def pendiente(x1, y1, x2, y2):
+    """Exponente de crecimiento entre dos puntos (1 = lineal, 2 = cuadrático)"""
+    if min(x1, y1, x2, y2) <= 0 or x1 == x2:
+        return None
+    return math.log(y2 / y1) / math.log(x2 / x1)
+
+
+def imprimir_resultados(resultados):
+    """Una tabla por familia: ms por fase y tamaño, y la pendiente de cada fase"""
+    columnas = list(COLUMNAS) + ['Total']
+    for familia in dict.fromkeys(c['familia'] for c in resultados['casos']):
+        casos = [c for c in resultados['casos'] if c['familia'] == familia]
+        print(f"\n=== {familia} (ms, mínimo de {resultados['repeticiones']}) ===")
+        print(f"{'N':>9}  " + "  ".join(f"{c:>10}" for c in columnas))
+        for caso in casos:
+            tiempos = [caso['fases'].get(f, 0.0) for f in FASES] + [caso['total_ms']]
+            print(f"{caso['tamano']:>9}  " + "  ".join(f"{t:>10.2f}" for t in tiempos))
+        if len(casos) > 1:
+            primero, ultimo = casos[0], casos[-1]
+            pendientes = [pendiente(primero['tamano'], primero['fases'].get(f, 0),
+                                    ultimo['tamano'], ultimo['fases'].get(f, 0)) for f in FASES]
+            pendientes.append(pendiente(primero['tamano'], primero['total_ms'],
+                                        ultimo['tamano'], ultimo['total_ms']))
+            print(f"{'pendiente':>9}  " + "  ".join(
+                f"{'-':>10}" if p is None else f"{p:>10.2f}" for p in pendientes))
+        ultimo = casos[-1]
+        ritmos = []
+        for fase, contador in (('Léxico', 'tokens'), ('Sintáctico', 'nodos'),
+                               ('Ejecución', 'cota_ejecutadas')):
+            ms = ultimo['fases'].get(fase)
+            cantidad = ultimo['contadores'].get(fase, {}).get(contador)
+            if ms and cantidad:
+                ritmos.append(f"{contador}/s en {fase}: {cantidad * 1000 / ms:,.0f}")
+        if ritmos:
+            print(f"{'':>9}  N={ultimo['tamano']}: " + "; ".join(ritmos))
+
+
+# ===============================================================
+# COMPARACIÓN CONTRA UNA BASE
+# ===============================================================
+
+def comparar(base, nuevo, umbral, minimo_ms=MINIMO_MS):
+    """
+    Lista de (familia, tamaño, fase, ms base, ms nuevo, es_regresion) de
+    los casos presentes en ambos resultados. Una fase es regresión si tarda
+    más que base * (1 + umbral) y la diferencia supera 'minimo_ms'.
+    """
+    casos_base = {(c['familia'], c['tamano']): c for c in base['casos']}
+    filas = []
+    for caso in nuevo['casos']:
+        anterior = casos_base.get((caso['familia'], caso['tamano']))
+        if anterior is None:
+            continue
+        pares = [(f, anterior['fases'].get(f), caso['fases'].get(f)) for f in FASES]
+        pares.append(('Total', anterior['total_ms'], caso['total_ms']))
+        for fase, ms_base, ms_nuevo in pares:
+            if ms_base is None or ms_nuevo is None:
+                continue
+            regresion = ms_nuevo > ms_base * (1 + umbral) and ms_nuevo - ms_base >= minimo_ms
+            filas.append((caso['familia'], caso['tamano'], fase, ms_base, ms_nuevo, regresion))
+    return filas
+
+
+def imprimir_comparacion(base, nuevo, umbral):
+    """Imprime la comparación y devuelve cuántas regresiones hay"""
+    for campo in ('compilador', 'python', 'plataforma'):
+        if base.get(campo) != nuevo.get(campo):
+            print(f"ℹ️  {campo}: {base.get(campo)} -> {nuevo.get(campo)}")
+    filas = comparar(base, nuevo, umbral)
+    if not filas:
+        print("Los resultados no tienen casos (familia, N) en común.")
+        return 0
+
+    print(f"\n{'Familia':<14} {'N':>8}  {'Fase':<15} {'base ms':>10} {'nuevo ms':>10} {'cambio':>8}")
+    print("-" * 72)
+    for familia, tamano, fase, ms_base, ms_nuevo, regresion in filas:
+        cambio = f"{(ms_nuevo / ms_base - 1) * 100:+.1f}%" if ms_base > 0 else "-"
+        marca = "  ❌ REGRESIÓN" if regresion else ""
+        print(f"{familia:<14} {tamano:>8}  {fase:<15} {ms_base:>10.2f} {ms_nuevo:>10.2f} "
+              f"{cambio:>8}{marca}")
+
+    regresiones = sum(1 for fila in filas if fila[5])
+    print(f"\n{regresiones} regresiones (umbral {umbral:.0%}, diferencia mínima {MINIMO_MS:g} ms)")
+    return regresiones
+
+
+def leer(ruta):
+    try:
+        with open(ruta, encoding='utf-8') as archivo:
+            resultados = json.load(archivo)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"Error: no se pudo leer {ruta}: {e}")
+    if not isinstance(resultados, dict) or resultados.get('formato') != FORMATO:
+        raise SystemExit(f"Error: {ruta} no es un resultado de bench_suite (formato {FORMATO})")
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks del compilador")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    p_correr = comandos.add_parser('correr', help="medir y (opcional) guardar los resultados")
+    p_correr.add_argument('--familias', nargs='+', choices=sorted(FAMILIAS), default=list(FAMILIAS),
+                          help="familias de programas a medir (por defecto, todas)")
+    p_correr.add_argument('--escala', type=float, default=1.0,
+                          help="multiplica los tamaños por defecto (ej. 0.1 para una corrida rápida)")
+    p_correr.add_argument('--repeticiones', type=int, default=3,
+                          help="corridas por caso; se guarda el mínimo (por defecto: 3)")
+    p_correr.add_argument('--memoria', action='store_true',
+                          help="medir también el pico de memoria de cada fase (tracemalloc)")
+    p_correr.add_argument('--salida', metavar='JSON', help="guardar los resultados en este archivo")
+    p_correr.add_argument('--comparar', metavar='BASE',
+                          help="comparar contra un resultado guardado antes")
+    p_correr.add_argument('--umbral', type=float, default=0.10,
+                          help="aumento relativo que cuenta como regresión (por defecto: 0.10)")
+
+    p_comparar = comandos.add_parser('comparar', help="comparar dos resultados guardados")
+    p_comparar.add_argument('base')
+    p_comparar.add_argument('nuevo')
+    p_comparar.add_argument('--umbral', type=float, default=0.10,
+                            help="aumento relativo que cuenta como regresión (por defecto: 0.10)")
+    args = parser.parse_args()
+
+    if args.comando == 'comparar':
+        sys.exit(1 if imprimir_comparacion(leer(args.base), leer(args.nuevo), args.umbral) else 0)
+
+    base = leer(args.comparar) if args.comparar else None
+    resultados = correr(args.familias, args.escala, max(1, args.repeticiones), args.memoria)
+    imprimir_resultados(resultados)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, ensure_ascii=False, indent=1)
+        print(f"\nResultados guardados en {args.salida}")
+    if base is not None:
+        sys.exit(1 if imprimir_comparacion(base, resultados, args.umbral) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los niveles de ejecución: TACInterpreter contra el TAC
+traducido a Python (tac_python). Mide dos programas aritméticos: un while
+de N vueltas y un programa lineal de N sentencias.
+
+Uso: python3 benchmarks/bench_tiers.py [iteraciones] [sentencias]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from parser import parse_source
+from tac_generator import TACGenerator
+from tac_assembler import ensamblar
+from tac_interpreter import TACInterpreter
+from tac_python import compilar_python, TACPythonExecutor
+
+CICLO = """
+var int i = 0;
+var int suma = 0;
+while (i < {n}) {{
+    suma = suma + i * 3 - i / 2;
+    i = i + 1;
+}}
+"""
+
+
+def lineal(n):
+    sentencias = ["var int x = 1;", "var int y = 2;"]
+    for i in range(n):
+        sentencias.append(f"x = (x + y) * (y - {i % 7}) / (x + 1) + y;")
+    return "\n".join(sentencias)
+
+
+def medir(nombre, fuente):
+    tac = TACGenerator().generate(parse_source(fuente))
+
+    inicio = time.perf_counter()
+    programa = ensamblar(tac)
+    preparar_interprete = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    memoria_a = TACInterpreter().execute(programa)
+    interprete = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    programa_python = compilar_python(tac)
+    preparar_python = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    memoria_b = TACPythonExecutor().execute(programa_python)
+    python = time.perf_counter() - inicio
+
+    assert memoria_a == memoria_b, "los dos niveles deben dar la misma memoria"
+    print(nombre)
+    print(f"  intérprete: {interprete:7.3f} s  (+{preparar_interprete:.3f} s ensamblado)")
+    print(f"  python:     {python:7.3f} s  (+{preparar_python:.3f} s traducción y compile())")
+    print(f"  aceleración: {interprete / python:.1f}x")
+
+
+def main():
+    iteraciones = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sentencias = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+    medir(f"while de {iteraciones} vueltas", CICLO.format(n=iteraciones))
+    medir(f"programa lineal de {sentencias} sentencias", lineal(sentencias))
+
+
+if __name__ == "__main__":
+    main()
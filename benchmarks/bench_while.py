@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark de ciclos while en el intérprete TAC.
+Compila un while de N vueltas (10 millones por defecto) y lo ejecuta
+ensamblado sin y con fusionar_saltos (comparación + salto fusionados y
+salto de vuelta rotado).
+
+Uso: python3 benchmarks/bench_while.py [iteraciones]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from parser import parse_source
+from analizador_semantico import SemanticAnalyzer
+from tac_generator import TACGenerator
+from tac_assembler import decodificar, fusionar_saltos, resolver
+from tac_interpreter import TACInterpreter
+
+PROGRAMA = """
+var int i = 0;
+var int suma = 0;
+while (i < {n}) {{
+    suma = suma + i;
+    i = i + 1;
+}}
+"""
+
+
+def medir(programa):
+    interprete = TACInterpreter()
+    inicio = time.perf_counter()
+    memoria = interprete.execute(programa)
+    return time.perf_counter() - inicio, memoria
+
+
+def main():
+    iteraciones = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    ast = parse_source(PROGRAMA.format(n=iteraciones))
+    SemanticAnalyzer().visit(ast)
+    simbolicas = decodificar(TACGenerator().generate(ast))
+
+    sin_fusion, memoria_a = medir(resolver(simbolicas))
+    con_fusion, memoria_b = medir(resolver(fusionar_saltos(simbolicas)))
+    assert memoria_a == memoria_b, "los dos programas deben dar la misma memoria"
+
+    print(f"while de {iteraciones} vueltas (suma = {memoria_b['suma']})")
+    print(f"  sin fusión: {sin_fusion:7.2f} s  ({sin_fusion / iteraciones * 1e9:6.1f} ns/vuelta)")
+    print(f"  con fusión: {con_fusion:7.2f} s  ({con_fusion / iteraciones * 1e9:6.1f} ns/vuelta)")
+    print(f"  aceleración: {sin_fusion / con_fusion:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Generador de programas sintéticos para los benchmarks. Cada familia
+produce un programa válido cuyo tamaño crece linealmente con N:
+
+  declaraciones  N declaraciones (int, string y bool), cada int usa el anterior
+  expresiones    una expresión con N niveles de paréntesis anidados
+  condicionales  N 'if/else' seguidos con condiciones compuestas (&&)
+  ciclos         un while de N vueltas con aritmética y un 'if' en el cuerpo
+
+Uso: python3 benchmarks/generador.py FAMILIA N > programa.src
+"""
+import sys
+
+
+def declaraciones(n):
+    lineas = ["var int v0 = 1;"]
+    anterior = 0  # Último int declarado
+    for k in range(1, n):
+        if k % 5 == 3:
+            lineas.append(f'var string s{k} = "cadena {k}";')
+        elif k % 5 == 4:
+            lineas.append(f"var bool b{k} = {'true' if k % 2 else 'false'};")
+        else:
+            lineas.append(f"var int v{k} = v{anterior} + {k % 10};")
+            anterior = k
+    return "\n".join(lineas) + "\n"
+
+
+def expresiones(n):
+    # x + (y - (x + (y - ... 1))): los valores no crecen con N.
+    # x e y se asignan dentro de un while para que el optimizador no las
+    # propague como constantes: si no, plegaría la expresión entera y el
+    # TAC, el ensamblado y la ejecución no crecerían con N
+    partes = []
+    for k in range(n):
+        variable = 'x' if k % 2 == 0 else 'y'
+        operador = '+' if k % 2 == 0 else '-'
+        partes.append(f"({variable} {operador} ")
+    expresion = "".join(partes) + "1" + ")" * n
+    return f"""var int x = 0;
+var int y = 0;
+var int i = 0;
+while (i < 1) {{
+    x = x + 3;
+    y = y + 2;
+    i = i + 1;
+}}
+var int r = {expresion};
+print(r);
+"""
+
+
+def condicionales(n):
+    lineas = ["var int x = 7;", "var int y = 0;"]
+    for k in range(n):
+        lineas.append(f"if (x > {k % 13} && y < {k * 3}) {{ y = y + {k % 7}; }} "
+                      f"else {{ y = y - 1; }}")
+    lineas.append("print(y);")
+    return "\n".join(lineas) + "\n"
+
+
+def ciclos(n):
+    return f"""var int i = 0;
+var int suma = 0;
+while (i < {n}) {{
+    suma = suma + i * 3 - i / 2;
+    if (suma > 1000000) {{
+        suma = suma - 1000000;
+    }}
+    i = i + 1;
+}}
+print(suma);
+"""
+
+
+FAMILIAS = {
+    'declaraciones': declaraciones,
+    'expresiones': expresiones,
+    'condicionales': condicionales,
+    'ciclos': ciclos,
+}
+
+
+def generar(familia, n):
+    """Código fuente de la familia indicada con tamaño N"""
+    if familia not in FAMILIAS:
+        raise ValueError(f"familia desconocida: {familia!r} (opciones: {', '.join(FAMILIAS)})")
+    return FAMILIAS[familia](n)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__.strip())
+        sys.exit(1)
+    sys.stdout.write(generar(sys.argv[1], int(sys.argv[2])))
+
+
+if __name__ == "__main__":
+    main()
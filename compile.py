@@ -1,76 +1,254 @@
 #!/usr/bin/env python3
+import argparse
+import glob
+import os
 import sys
+import time
 
 # Importamos los componentes que SÍ existen en tus otros archivos
 try:
-    from Analizador_lexico import analizar
-    from parser import parse_source
+    from source_loader import abrir_fuente
+    from parser import Parser
     from analizador_semantico import SemanticAnalyzer
+    from ast_optimizer import ASTOptimizer
     from tac_generator import TACGenerator
+    from tac_optimizer import optimizar_texto
     from tac_interpreter import TACInterpreter
+    from tac_python import TACPythonExecutor
+    from tac_assembler import ensamblar
+    from tac_bytecode import guardar_modulo, cargar_modulo, es_modulo
+    from compile_cache import CompileCache, EntradaCache, cache_en_disco
+    from compile_batch import expandir, compilar_lote, cantidad_trabajadores, imprimir_resumen
+    from compile_profile import PhaseProfiler, contar_nodos, medir
 except ImportError as e:
     print(f"Error de importación: {e}")
     print("Asegúrate de que los archivos (Analizador_lexico.py, parser.py, etc.) estén en la misma carpeta.")
     sys.exit(1)
 
-def main():
-    if len(sys.argv) != 2:
-        print("Uso correcto: python3 compile.py <archivo.src>")
+# Niveles de ejecución disponibles para --tier
+EJECUTORES = {
+    'interprete': TACInterpreter,    # bucle de despacho sobre el TAC ensamblado
+    'python': TACPythonExecutor,     # TAC traducido a una función Python nativa
+}
+
+def compilar(filename, fuente, optimizar=True, optimizar_tac=False, tier='interprete', cache=None,
+             emitir=None, perfil=None):
+    print(f"--- Compilando: {filename} ---")
+
+    # 1b. Caché: si este mismo fuente ya se compiló, se salta hasta la ejecución
+    entrada = None
+    if cache is not None:
+        with medir(perfil, 'Caché'):
+            clave = cache.clave(fuente.datos, optimizar, optimizar_tac)
+            entrada = cache.obtener(clave)
+        if entrada is not None:
+            print(f"♻️  Compilación encontrada en caché ({clave[:12]})")
+            print("\n--- CÓDIGO TAC ---")
+            print(entrada.tac)
+            print("---------------------------")
+
+    if entrada is None:
+        entrada = compilar_fases(fuente, optimizar, optimizar_tac, perfil)
+        if entrada is None:
+            return
+        if cache is not None:
+            cache.guardar(clave, entrada)
+
+    # 5c. Módulo binario: el Programa ensamblado, listo para volver a ejecutarse
+    if emitir:
+        guardar_modulo(entrada.programa, emitir)
+        print(f"📦 Módulo binario escrito en {emitir} ({len(entrada.programa)} instrucciones)")
+
+    # 6. Ejecución (Intérprete o código Python generado)
+    print(f"5. Ejecutando ({tier})...")
+    interpreter = EJECUTORES[tier]()
+    # El intérprete usa directamente el Programa ya ensamblado
+    with medir(perfil, 'Ejecución'):
+        resultado = interpreter.execute(entrada.programa if tier == 'interprete' else entrada.tac)
+    if perfil is not None:
+        perfil.contar('cota_ejecutadas', getattr(interpreter, 'pasos', None))
+    mostrar_memoria(resultado)
+
+def ejecutar_modulo(filename, tier='interprete', perfil=None):
+    """Ejecuta un módulo binario (.tacb) sin pasar por ninguna fase de compilación"""
+    print(f"--- Cargando módulo: {filename} ---")
+    if tier != 'interprete':
+        print(f"❌ Un módulo binario solo se ejecuta con --tier interprete (no tiene el TAC para '{tier}')")
         return
+    with medir(perfil, 'Carga'):
+        programa = cargar_modulo(filename)
+    if perfil is not None:
+        perfil.contar('instrucciones', len(programa))
+    print(f"Instrucciones: {len(programa)}")
+    print("5. Ejecutando (interprete)...")
+    interpreter = TACInterpreter()
+    with medir(perfil, 'Ejecución'):
+        resultado = interpreter.execute(programa)
+    if perfil is not None:
+        perfil.contar('cota_ejecutadas', interpreter.pasos)
+    mostrar_memoria(resultado)
+
+def mostrar_memoria(resultado):
+    print("\n✅ EJECUCIÓN EXITOSA.")
+    print("Memoria final:")
+    for k, v in resultado.items(): # Los temporales ya no forman parte de la memoria
+        print(f"  {k} = {v}")
+
+def compilar_fases(fuente, optimizar, optimizar_tac, perfil=None):
+    """
+    Todas las fases hasta el TAC ensamblado; None si hay un error.
+    Con un PhaseProfiler se mide cada fase (sin contar lo que se imprime).
+    """
+    # 2. Análisis Léxico (una sola pasada, directo sobre los bytes)
+    print("1. Ejecutando Lexer...")
+    with medir(perfil, 'Léxico'):
+        tokens = fuente.tokenizar()
+    if perfil is not None:
+        perfil.contar('tokens', len(tokens))
     
-    filename = sys.argv[1]
-    
+    # 3. Análisis Sintáctico (Parser) sobre los tokens ya generados
+    print("2. Ejecutando Parser...")
     try:
-        # 1. Leer el archivo
-        with open(filename, 'r') as f:
-            source_code = f.read()
-        
-        print(f"--- Compilando: {filename} ---")
-        
-        # 2. Análisis Léxico
-        print("1. Ejecutando Lexer...")
-        tokens = analizar(source_code)
-        
-        # 3. Análisis Sintáctico (Parser)
-        print("2. Ejecutando Parser...")
-        try:
-            ast = parse_source(source_code)
-        except Exception as e:
-            print(f"❌ Error Sintáctico: {e}")
-            return
+        with medir(perfil, 'Sintáctico'):
+            ast = Parser(tokens).parse()
+    except Exception as e:
+        print(f"❌ Error Sintáctico: {e}")
+        return None
+    if perfil is not None:
+        nodos = contar_nodos(ast)
+        perfil.contar('nodos', nodos)
 
-        # 4. Análisis Semántico
-        print("3. Ejecutando Semántico...")
-        try:
-            analyzer = SemanticAnalyzer()
+    # 4. Análisis Semántico
+    print("3. Ejecutando Semántico...")
+    if perfil is not None:
+        # Sin trazas: el tiempo medido es el del análisis, no el de imprimirlo
+        print("    (trazas del semántico omitidas al perfilar)")
+    try:
+        with medir(perfil, 'Semántico'):
+            analyzer = SemanticAnalyzer(log=print if perfil is None else None)
             analyzer.visit(ast)
-        except Exception as e:
-            print(f"❌ Error Semántico: {e}")
-            return
+    except Exception as e:
+        print(f"❌ Error Semántico: {e}")
+        return None
+    if perfil is not None:
+        perfil.contar('nodos', nodos)
+
+    # 4b. Optimización del AST (plegado y propagación de constantes)
+    if optimizar:
+        print("3b. Optimizando AST...")
+        optimizador = ASTOptimizer()
+        with medir(perfil, 'Optimización'):
+            ast = optimizador.optimizar(ast)
+        if perfil is not None:
+            perfil.contar('nodos', contar_nodos(ast))
+        print(f"    {optimizador.resumen()}")
 
-        # 5. Generación de Código Intermedio (TAC)
-        print("4. Generando TAC...")
-        tac_gen = TACGenerator()
+    # 5. Generación de Código Intermedio (TAC)
+    print("4. Generando TAC...")
+    tac_gen = TACGenerator()
+    with medir(perfil, 'Generación TAC'):
         tac_code = tac_gen.generate(ast)
-        print("\n--- CÓDIGO TAC GENERADO ---")
+    print("\n--- CÓDIGO TAC GENERADO ---")
+    print(tac_code)
+    print("---------------------------")
+    print(f"Instrucciones TAC: {sum(1 for linea in tac_code.splitlines() if linea.strip() and not linea.endswith(':'))}")
+
+    # 5b. Optimización del TAC (CSE, propagación de copias, código muerto)
+    if optimizar_tac:
+        print("4b. Optimizando TAC...")
+        with medir(perfil, 'Optimización TAC'):
+            tac_code, antes, despues = optimizar_texto(tac_code)
+        print("\n--- CÓDIGO TAC OPTIMIZADO ---")
         print(tac_code)
         print("---------------------------")
+        print(f"Instrucciones TAC: {antes} -> {despues}")
+
+    with medir(perfil, 'Ensamblado'):
+        programa = ensamblar(tac_code)
+    if perfil is not None:
+        perfil.contar('instrucciones', len(programa))
+    return EntradaCache(tokens, ast, tac_code, programa)
+
+def mostrar_perfil(perfil):
+    print("\n--- PERFIL POR FASES ---")
+    print(perfil.informe())
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila y ejecuta un archivo .src")
+    parser.add_argument('archivos', nargs='+',
+                        help="archivo fuente a compilar, o un módulo .tacb a ejecutar; "
+                             "con varios archivos, directorios o globs se compila por lotes")
+    parser.add_argument('--sin-optimizar', action='store_true',
+                        help="no aplicar el optimizador de AST")
+    parser.add_argument('--optimizar-tac', action='store_true',
+                        help="aplicar el optimizador de TAC (CSE, copias, código muerto)")
+    parser.add_argument('--tier', choices=sorted(EJECUTORES), default='interprete',
+                        help="nivel de ejecución (por defecto: interprete)")
+    parser.add_argument('--cache-dir', metavar='DIR',
+                        help="guardar la caché de compilación en DIR "
+                             "(por defecto, la variable COMPILADOR_CACHE_DIR; sin "
+                             "ninguna de las dos no se usa caché)")
+    parser.add_argument('--sin-cache', action='store_true',
+                        help="compilar siempre desde cero")
+    parser.add_argument('--emitir', metavar='MODULO',
+                        help="guardar el programa ensamblado como módulo binario "
+                             "(.tacb) que se ejecuta sin recompilar")
+    parser.add_argument('-j', '--jobs', type=int, metavar='N',
+                        help="procesos para compilar por lotes (por defecto, uno por núcleo)")
+    parser.add_argument('--perfil', '--profile', action='store_true',
+                        help="medir tiempo, contadores y pico de memoria de cada fase "
+                             "(no aplica a la compilación por lotes)")
+    args = parser.parse_args()
+    
+    if es_lote(args.archivos):
+        sys.exit(1 if compilar_por_lotes(args) else 0)
+
+    filename = args.archivos[0]
+    if args.sin_cache:
+        cache = None
+    elif args.cache_dir:
+        cache = CompileCache(directorio=args.cache_dir)
+    else:
+        cache = cache_en_disco()
 
-        # 6. Ejecución (Intérprete)
-        print("5. Ejecutando...")
-        interpreter = TACInterpreter()
-        resultado = interpreter.execute(tac_code)
-        
-        print("\n✅ EJECUCIÓN EXITOSA.")
-        print("Memoria final:")
-        for k, v in resultado.items():
-            if not k.startswith('t'): # Ocultamos temporales para limpiar la salida
-                print(f"  {k} = {v}")
+    perfil = PhaseProfiler().iniciar() if args.perfil else None
+    try:
+        if es_modulo(filename):
+            ejecutar_modulo(filename, tier=args.tier, perfil=perfil)
+            return
+
+        # 1. Abrir el archivo (mapeado en memoria, sin copiarlo a un str)
+        with abrir_fuente(filename) as fuente:
+            compilar(filename, fuente, optimizar=not args.sin_optimizar,
+                     optimizar_tac=args.optimizar_tac, tier=args.tier, cache=cache,
+                     emitir=args.emitir, perfil=perfil)
             
     except FileNotFoundError:
         print(f"Error: Archivo '{filename}' no encontrado.")
     except Exception as e:
         print(f"Error inesperado: {e}")
+    finally:
+        if perfil is not None:
+            perfil.terminar()
+            mostrar_perfil(perfil)
+
+def es_lote(rutas):
+    """Varios archivos, un directorio o un glob: compilación por lotes"""
+    return len(rutas) > 1 or any(os.path.isdir(r) or glob.has_magic(r) for r in rutas)
+
+def compilar_por_lotes(args):
+    """Compila (sin ejecutar) todos los archivos en paralelo; devuelve cuántos fallaron"""
+    archivos = expandir(args.archivos)
+    if not archivos:
+        print("Error: no se encontraron archivos .src")
+        return 1
+    trabajadores = cantidad_trabajadores(args.jobs, len(archivos))
+    print(f"--- Compilando {len(archivos)} archivos con {trabajadores} procesos ---")
+    inicio = time.perf_counter()
+    resultados = compilar_lote(archivos, trabajadores, optimizar=not args.sin_optimizar,
+                               optimizar_tac=args.optimizar_tac,
+                               cache_dir=None if args.sin_cache else args.cache_dir)
+    return imprimir_resumen(resultados, time.perf_counter() - inicio, trabajadores)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
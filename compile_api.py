@@ -0,0 +1,260 @@
+import time
+
+from Analizador_lexico import tokenizar
+from parser import Parser
+from analizador_semantico import SemanticAnalyzer
+from ast_optimizer import ASTOptimizer
+from tac_generator import TACGenerator
+from tac_optimizer import optimizar_texto
+from tac_assembler import ensamblar
+from tac_interpreter import TACInterpreter
+from ast_closures import ASTClosureExecutor, compilar_ast
+from compile_cache import EntradaCache, cache_global
+from compile_profile import PhaseProfiler, contar_nodos, medir
+
+# ===============================================================
+# API DE COMPILACIÓN ESTRUCTURADA
+# ===============================================================
+#
+# compilar() ejecuta todas las fases y devuelve un ResultadoCompilacion
+# en vez de texto impreso. No toca sys.stdout: las trazas de las fases van
+# a la función 'log' (por defecto ninguna, y entonces ni se formatean) y
+# la salida de 'print' del programa se junta en una lista propia de cada
+# llamada, así que varias compilaciones pueden correr a la vez en hilos
+# distintos sin mezclar sus resultados.
+#
+# Con 'eventos', compilar() además avisa el avance apenas ocurre (para
+# transmitirlo al navegador sin esperar al final). Cada evento es un dict
+# serializable a JSON:
+#   {'evento': 'fase', 'fase': 'Léxico', 'ms': 1.2, ...}  una fase terminó
+#        (Léxico trae 'tokens' y 'diagnosticos', Generación TAC trae 'tac';
+#        un acierto de caché es la fase 'Caché' con ambos)
+#   {'evento': 'salida', 'lineas': [...]}   líneas impresas por el programa,
+#        agrupadas de a LINEAS_POR_EVENTO o cada SEGUNDOS_POR_EVENTO
+#   {'evento': 'fin', 'resultado': {...}}   el ResultadoCompilacion (sin
+#        'salida', que ya se envió)
+#
+# Con perfilar=True cada fase se mide con un PhaseProfiler (tiempos,
+# contadores y pico de memoria) y el resultado lo trae en 'perfil'.
+
+# Niveles de ejecución: el intérprete sobre el TAC ensamblado, o el AST
+# compilado a clausuras (ast_closures)
+NIVELES = ('interprete', 'clausuras')
+
+LINEAS_POR_EVENTO = 200
+SEGUNDOS_POR_EVENTO = 0.05
+
+
+class ResultadoCompilacion:
+    """
+    Resultado de compilar (y ejecutar) un programa.
+      ok:            True si todas las fases pedidas terminaron sin error
+      tokens:        cantidad de tokens
+      diagnosticos:  mensajes de error (léxicos, sintácticos, semánticos, de ejecución)
+      tac:           código TAC generado
+      salida:        líneas impresas por el programa
+      memoria:       volcado final de variables
+      cache:         True si la compilación se tomó de la caché
+      tiempo_ms:     duración total
+      perfil:        PhaseProfiler.a_dict() si se pidió perfilar (si no, None)
+      entrada:       EntradaCache con tokens, AST y Programa (no se serializa)
+    """
+
+    __slots__ = ('ok', 'tokens', 'diagnosticos', 'tac', 'salida', 'memoria', 'cache',
+                 'tiempo_ms', 'perfil', 'entrada')
+
+    CAMPOS_JSON = ('ok', 'tokens', 'diagnosticos', 'tac', 'salida', 'memoria', 'cache',
+                   'tiempo_ms', 'perfil')
+
+    def __init__(self):
+        self.ok = False
+        self.tokens = 0
+        self.diagnosticos = []
+        self.tac = ''
+        self.salida = []
+        self.memoria = {}
+        self.cache = False
+        self.tiempo_ms = 0.0
+        self.perfil = None
+        self.entrada = None
+
+    def a_dict(self):
+        """Dict serializable a JSON"""
+        return {campo: getattr(self, campo) for campo in self.CAMPOS_JSON}
+
+
+def mensaje_error(fase, error):
+    """Texto del diagnóstico; los errores que ya dicen su tipo no se prefijan otra vez"""
+    mensaje = str(error)
+    if mensaje.startswith("Error"):
+        return mensaje
+    return f"Error {fase}: {mensaje}"
+
+
+class SalidaEnVivo:
+    """Función de salida que junta las líneas y las emite por tandas como eventos"""
+
+    def __init__(self, lineas, eventos):
+        self.lineas = lineas
+        self.eventos = eventos
+        self.enviadas = 0
+        self.ultimo_envio = 0.0  # La primera línea sale enseguida
+
+    def __call__(self, valor):
+        self.lineas.append(f"{valor}")
+        if (len(self.lineas) - self.enviadas >= LINEAS_POR_EVENTO
+                or time.perf_counter() - self.ultimo_envio >= SEGUNDOS_POR_EVENTO):
+            self.vaciar()
+
+    def vaciar(self):
+        if len(self.lineas) > self.enviadas:
+            self.eventos({'evento': 'salida', 'lineas': self.lineas[self.enviadas:]})
+            self.enviadas = len(self.lineas)
+        self.ultimo_envio = time.perf_counter()
+
+
+def compilar(codigo_fuente, ejecutar=True, nivel='clausuras', optimizar_tac=False,
+             log=None, cache=None, limite_instrucciones=None, eventos=None, perfilar=False):
+    """
+    Compila 'codigo_fuente' (str, bytes o mmap) y, si 'ejecutar', lo corre
+    con el nivel indicado. Nunca lanza excepciones de compilación: los
+    errores quedan en resultado.diagnosticos.
+      log:    función que recibe las trazas de las fases (None = silencioso)
+      cache:  CompileCache a usar (por defecto, la del proceso)
+      limite_instrucciones: máximo de instrucciones a ejecutar (None = sin límite)
+      eventos: función que recibe los eventos de avance (ver arriba)
+      perfilar: medir cada fase (ver compile_profile)
+    """
+    if nivel not in NIVELES:
+        raise ValueError(f"nivel de ejecución desconocido: {nivel!r}")
+
+    resultado = ResultadoCompilacion()
+    cache = cache if cache is not None else cache_global()
+    perfil = PhaseProfiler() if perfilar else None
+    inicio = time.perf_counter()
+    fase = 'Léxico'
+
+    def contar(nombre, cantidad):
+        # Los contadores caros se pasan como función: solo se calculan al perfilar
+        if perfil is None:
+            return None
+        if callable(cantidad):
+            cantidad = cantidad()
+        perfil.contar(nombre, cantidad)
+        return cantidad
+
+    def terminada(nombre, **datos):
+        if eventos is not None:
+            eventos({'evento': 'fase', 'fase': nombre,
+                     'ms': (time.perf_counter() - inicio) * 1000, **datos})
+
+    if perfil is not None:
+        perfil.iniciar()
+    try:
+        with medir(perfil, 'Caché'):
+            clave = cache.clave(codigo_fuente, True, optimizar_tac)
+            entrada = cache.obtener(clave)
+        resultado.cache = entrada is not None
+
+        if entrada is None:
+            with medir(perfil, fase):
+                tokens = tokenizar(codigo_fuente, log=log)
+            resultado.tokens = len(tokens)  # También si falla una fase posterior
+            resultado.diagnosticos.extend(tokens.errores)
+            terminada(fase, tokens=len(tokens), diagnosticos=list(tokens.errores))
+            contar('tokens', len(tokens))
+
+            fase = 'Sintáctico'
+            with medir(perfil, fase):
+                ast = Parser(tokens).parse()
+            terminada(fase)
+            nodos = contar('nodos', lambda: contar_nodos(ast))
+
+            fase = 'Semántico'
+            with medir(perfil, fase):
+                SemanticAnalyzer(log=log).visit(ast)
+            terminada(fase)
+            contar('nodos', nodos)  # El semántico no cambia el AST
+
+            fase = 'Optimización'
+            with medir(perfil, fase):
+                ast = ASTOptimizer().optimizar(ast)
+            terminada(fase)
+            contar('nodos', lambda: contar_nodos(ast))
+
+            fase = 'Generación TAC'
+            with medir(perfil, fase):
+                tac = TACGenerator().generate(ast)
+                if optimizar_tac:
+                    tac = optimizar_texto(tac)[0]
+                entrada = EntradaCache(tokens, ast, tac, ensamblar(tac))
+            cache.guardar(clave, entrada)
+            terminada(fase, tac=tac)
+            contar('instrucciones', len(entrada.programa))
+        else:
+            terminada('Caché', tokens=len(entrada.tokens), tac=entrada.tac)
+
+        resultado.entrada = entrada
+        resultado.tokens = len(entrada.tokens)
+        resultado.tac = entrada.tac
+
+        if ejecutar:
+            fase = 'Ejecución'
+            with medir(perfil, fase):
+                resultado.memoria = dict(ejecutar_entrada(entrada, nivel, resultado.salida,
+                                                          limite_instrucciones, eventos, perfil))
+            terminada(fase)
+        resultado.ok = True
+    except Exception as e:
+        resultado.diagnosticos.append(mensaje_error(fase, e))
+    finally:
+        if perfil is not None:
+            perfil.terminar()
+
+    resultado.tiempo_ms = (time.perf_counter() - inicio) * 1000
+    if perfil is not None:
+        resultado.perfil = perfil.a_dict()
+    if eventos is not None:
+        final = resultado.a_dict()
+        del final['salida']
+        eventos({'evento': 'fin', 'resultado': final})
+    return resultado
+
+
+def ejecutar_entrada(entrada, nivel, lineas, limite_instrucciones=None, eventos=None,
+                     perfil=None):
+    """
+    Ejecuta una entrada compilada; cada 'print' agrega una línea a 'lineas'
+    (y, con 'eventos', se transmite por tandas). Con un PhaseProfiler, le
+    suma lo que el ejecutor cobró a su límite de instrucciones (ver
+    compile_profile).
+    """
+    if eventos is None:
+        def salida(valor):
+            lineas.append(f"{valor}")
+    else:
+        salida = SalidaEnVivo(lineas, eventos)
+
+    try:
+        if nivel == 'interprete':
+            ejecutor = TACInterpreter(salida=salida, limite_instrucciones=limite_instrucciones)
+            memoria = ejecutor.execute(entrada.programa)
+        else:
+            # Las clausuras se guardan junto a la entrada de la caché; con
+            # límite se usa una versión aparte que descuenta el presupuesto
+            # en los ciclos
+            limitar = limite_instrucciones is not None
+            nombre = 'clausuras_limitadas' if limitar else 'clausuras'
+            clausuras = entrada.extras.get(nombre)
+            if clausuras is None:
+                clausuras = entrada.extras[nombre] = compilar_ast(entrada.ast, limitar)
+            ejecutor = ASTClosureExecutor(salida=salida, limite_instrucciones=limite_instrucciones)
+            memoria = ejecutor.execute(clausuras)
+        if perfil is not None:
+            perfil.contar('cota_ejecutadas' if nivel == 'interprete' else 'costo_ciclos',
+                          ejecutor.pasos)
+            perfil.contar('impresas', len(lineas))
+        return memoria
+    finally:
+        if eventos is not None:
+            salida.vaciar()  # También lo impreso antes de un error
@@ -0,0 +1,132 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from source_loader import abrir_fuente
+from compile_cache import CompileCache, compilar_fuente
+from compile_api import mensaje_error
+
+# ===============================================================
+# COMPILACIÓN POR LOTES
+# ===============================================================
+#
+# Compila muchos archivos (léxico -> sintáctico -> semántico -> TAC, sin
+# ejecutar) repartiéndolos entre procesos con un ProcessPoolExecutor del
+# tamaño de los núcleos disponibles. Cada archivo se compila completo en
+# un proceso y devuelve solo un dict pequeño con sus diagnósticos, así que
+# el costo de comunicación no depende del tamaño del programa.
+#
+# El orden de los resultados es el de la lista de archivos (ordenada),
+# no el orden en que terminan los procesos.
+#
+# Con un directorio de caché, cada proceso consulta y llena la caché en
+# disco de compile_cache: los archivos sin cambios no se recompilan.
+
+EXTENSION_FUENTE = '.src'
+
+
+def expandir(rutas):
+    """Lista ordenada y sin repetidos de archivos .src a partir de archivos, directorios o globs"""
+    archivos = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for carpeta, _, nombres in os.walk(ruta):
+                archivos.extend(os.path.join(carpeta, nombre) for nombre in nombres
+                                if nombre.endswith(EXTENSION_FUENTE))
+        elif glob.has_magic(ruta):
+            archivos.extend(r for r in glob.glob(ruta, recursive=True) if os.path.isfile(r))
+        else:
+            archivos.append(ruta)  # Si no existe, se informa como diagnóstico
+    return sorted(set(archivos))
+
+
+def compilar_archivo(ruta, optimizar=True, optimizar_tac=False, cache_dir=None):
+    """Compila un archivo sin ejecutarlo; devuelve un dict con el resultado"""
+    resultado = {
+        'archivo': ruta,
+        'ok': False,
+        'cache': False,
+        'tokens': 0,
+        'instrucciones': 0,
+        'diagnosticos': [],
+    }
+    # Fase en curso y tokens, para informar dónde falló (ver compilar_fuente)
+    avance = {'fase': 'Léxico'}
+    inicio = time.perf_counter()
+
+    try:
+        with abrir_fuente(ruta) as fuente:
+            # Las trazas de las fases no interesan en un lote: log=None evita
+            # hasta formatearlas
+            if cache_dir:
+                entrada, resultado['cache'] = CompileCache(directorio=cache_dir).compilar(
+                    fuente.datos, optimizar, optimizar_tac, avance=avance)
+            else:
+                entrada = compilar_fuente(fuente.datos, optimizar, optimizar_tac, avance=avance)
+            resultado['diagnosticos'].extend(entrada.tokens.errores)
+            resultado['tokens'] = len(entrada.tokens)
+            resultado['instrucciones'] = len(entrada.programa)
+            # El lexer salta los caracteres inválidos y sigue, pero el
+            # archivo no es válido: cuenta como fallido
+            resultado['ok'] = not entrada.tokens.errores
+    except FileNotFoundError:
+        resultado['diagnosticos'].append(f"Error: archivo '{ruta}' no encontrado")
+    except Exception as e:
+        if 'tokens' in avance:
+            resultado['diagnosticos'].extend(avance['tokens'].errores)
+        resultado['diagnosticos'].append(mensaje_error(avance['fase'], e))
+
+    resultado['tiempo_ms'] = (time.perf_counter() - inicio) * 1000
+    return resultado
+
+
+def cantidad_trabajadores(pedidos, archivos):
+    """Procesos a usar: los pedidos (o los núcleos), nunca más que archivos"""
+    return max(1, min(pedidos or os.cpu_count() or 1, archivos))
+
+
+def compilar_lote(archivos, trabajadores=None, optimizar=True, optimizar_tac=False, cache_dir=None):
+    """
+    Compila una lista de archivos en paralelo y devuelve sus resultados en
+    el mismo orden. 'trabajadores' es la cantidad de procesos (por defecto,
+    los núcleos disponibles); con 1 se compila en este mismo proceso.
+    """
+    tarea = partial(compilar_archivo, optimizar=optimizar, optimizar_tac=optimizar_tac,
+                    cache_dir=cache_dir)
+    trabajadores = cantidad_trabajadores(trabajadores, len(archivos))
+    if trabajadores <= 1:
+        return [tarea(ruta) for ruta in archivos]
+
+    # Tandas de varios archivos por envío: menos idas y vueltas con cientos
+    # de archivos chicos, pero suficientes tandas para repartir la carga
+    tanda = max(1, len(archivos) // (trabajadores * 4))
+    with ProcessPoolExecutor(max_workers=trabajadores) as ejecutor:
+        return list(ejecutor.map(tarea, archivos, chunksize=tanda))
+
+
+def imprimir_resumen(resultados, tiempo_total, trabajadores):
+    """Tabla con una fila por archivo, los diagnósticos de los que fallaron y los totales"""
+    ancho = max([len('Archivo')] + [len(r['archivo']) for r in resultados])
+    print(f"{'Archivo':<{ancho}}  {'Estado':<6}  {'Tokens':>8}  {'TAC':>8}  {'ms':>9}")
+    print("-" * (ancho + 41))
+    for r in resultados:
+        estado = ('caché' if r['cache'] else 'ok') if r['ok'] else 'ERROR'
+        print(f"{r['archivo']:<{ancho}}  {estado:<6}  {r['tokens']:>8}  "
+              f"{r['instrucciones']:>8}  {r['tiempo_ms']:>9.1f}")
+
+    con_diagnosticos = [r for r in resultados if r['diagnosticos']]
+    if con_diagnosticos:
+        print("\n--- DIAGNÓSTICOS ---")
+        for r in con_diagnosticos:
+            for diagnostico in r['diagnosticos']:
+                print(f"{r['archivo']}: {diagnostico}")
+
+    fallidos = sum(1 for r in resultados if not r['ok'])
+    cpu = sum(r['tiempo_ms'] for r in resultados) / 1000
+    print(f"\n{len(resultados)} archivos, {len(resultados) - fallidos} compilados, "
+          f"{fallidos} con errores")
+    print(f"Tiempo total: {tiempo_total:.2f} s con {trabajadores} procesos "
+          f"(suma por archivo: {cpu:.2f} s)")
+    return fallidos
@@ -0,0 +1,283 @@
+import hashlib
+import marshal
+import os
+import threading
+from collections import OrderedDict
+
+from Analizador_lexico import TokenBuffer, tokenizar
+from parser import Parser
+from analizador_semantico import SemanticAnalyzer
+from ast_optimizer import ASTOptimizer
+from ast_arena import ASTArena
+from tac_generator import TACGenerator
+from tac_optimizer import optimizar_texto
+from tac_assembler import Programa, ensamblar, OPERADORES, SIMBOLOS, operador_desconocido
+
+# ===============================================================
+# CACHÉ DE COMPILACIÓN (DIRECCIONADA POR CONTENIDO)
+# ===============================================================
+#
+# La clave de una compilación es un hash SHA-256 de:
+#   - la versión del compilador (hash del código de sus módulos),
+#   - las opciones que cambian el resultado (optimizaciones),
+#   - el código fuente.
+# Dos compilaciones del mismo texto con el mismo compilador comparten
+# entrada, venga de server.py, main.py, compile.py o del worker de la GUI.
+#
+# Cada entrada guarda el TokenBuffer, el AST verificado (y optimizado), el
+# texto TAC y el Programa ensamblado. En memoria se guardan las últimas
+# 'capacidad' entradas (LRU). Opcionalmente se guardan también en disco,
+# un archivo por clave, con marshal:
+#   - tokens:    bytes del fuente + columnas tipos/inicios/fines
+#   - AST:       columnas de una ASTArena + su pool de constantes
+#   - programa:  instrucciones como tuplas de enteros, con el operador
+#                por su símbolo ('+', '<', ...)
+#
+# La parte en memoria se comparte entre hilos (los pedidos de server.py,
+# las transmisiones): consultarla y actualizarla se hace con un cerrojo.
+#
+# Los errores de compilación no se guardan: se vuelven a producir. Tampoco
+# un fuente con errores léxicos (el lexer los salta y sigue), para que sus
+# mensajes se vuelvan a mostrar.
+
+# Módulos cuyo código define el resultado de una compilación
+MODULOS_COMPILADOR = ('Analizador_lexico.py', 'parser.py', 'analizador_semantico.py',
+                      'ast_optimizer.py', 'ast_arena.py', 'tac_generator.py',
+                      'tac_optimizer.py', 'tac_assembler.py', 'compile_cache.py')
+
+FORMATO_DISCO = 1
+EXTENSION = '.cmp'
+
+
+def calcular_version():
+    """Hash del código de los módulos del compilador"""
+    base = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+    for nombre in MODULOS_COMPILADOR:
+        with open(os.path.join(base, nombre), 'rb') as archivo:
+            h.update(archivo.read())
+    return h.hexdigest()[:16]
+
+
+VERSION_COMPILADOR = calcular_version()
+
+
+class EntradaCache:
+    """Resultado de compilar un fuente (todo lo previo a la ejecución)"""
+
+    __slots__ = ('tokens', 'ast', 'tac', 'programa', 'extras')
+
+    def __init__(self, tokens, ast, tac, programa):
+        self.tokens = tokens
+        self.ast = ast
+        self.tac = tac
+        self.programa = programa
+        self.extras = {}  # Derivados solo en memoria (ej. clausuras ya compiladas)
+
+
+def compilar_fuente(fuente, optimizar=True, optimizar_tac=False, log=None, avance=None):
+    """
+    Ejecuta todas las fases hasta el Programa ensamblado (sin caché).
+    'log' recibe las trazas del léxico y el semántico (None = silencioso).
+    'avance' es un dict opcional donde se anota la fase en curso ('fase') y
+    el TokenBuffer apenas existe ('tokens'): si una fase falla, queda ahí.
+    """
+    if avance is None:
+        avance = {}
+    avance['fase'] = 'Léxico'
+    tokens = avance['tokens'] = tokenizar(fuente, log=log)
+    avance['fase'] = 'Sintáctico'
+    ast = Parser(tokens).parse()
+    avance['fase'] = 'Semántico'
+    SemanticAnalyzer(log=log).visit(ast)
+    if optimizar:
+        avance['fase'] = 'Optimización'
+        ast = ASTOptimizer().optimizar(ast)
+    avance['fase'] = 'Generación TAC'
+    tac = TACGenerator().generate(ast)
+    if optimizar_tac:
+        tac = optimizar_texto(tac)[0]
+    return EntradaCache(tokens, ast, tac, ensamblar(tac))
+
+
+class CompileCache:
+    def __init__(self, capacidad=64, directorio=None):
+        self.capacidad = capacidad
+        self.directorio = directorio
+        self.entradas = OrderedDict()  # clave -> EntradaCache (la última es la más reciente)
+        self.aciertos = 0
+        self.fallos = 0
+        self._cerrojo = threading.Lock()  # Protege 'entradas' (orden LRU incluido)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def clave(self, fuente, optimizar=True, optimizar_tac=False):
+        h = hashlib.sha256()
+        h.update(f"{VERSION_COMPILADOR}:{int(optimizar)}{int(optimizar_tac)}:".encode())
+        h.update(fuente.encode('utf-8') if isinstance(fuente, str) else fuente)
+        return h.hexdigest()
+
+    def obtener(self, clave):
+        with self._cerrojo:
+            entrada = self.entradas.get(clave)
+            if entrada is not None:
+                self.entradas.move_to_end(clave)
+                return entrada
+        if self.directorio:
+            entrada = self._leer_disco(clave)
+            if entrada is not None:
+                self._recordar(clave, entrada)
+        return entrada
+
+    def guardar(self, clave, entrada):
+        if entrada.tokens.errores:
+            return
+        if not isinstance(entrada.tokens.source, (str, bytes)):
+            # La entrada sobrevive al archivo: no puede depender de un mmap
+            entrada.tokens.source = bytes(entrada.tokens.source)
+        self._recordar(clave, entrada)
+        if self.directorio:
+            self._escribir_disco(clave, entrada)
+
+    def compilar(self, fuente, optimizar=True, optimizar_tac=False, log=None, avance=None):
+        """Devuelve (entrada, desde_cache); 'log' y 'avance' como en compilar_fuente()"""
+        clave = self.clave(fuente, optimizar, optimizar_tac)
+        entrada = self.obtener(clave)
+        if entrada is not None:
+            self.aciertos += 1
+            return entrada, True
+        self.fallos += 1
+        entrada = compilar_fuente(fuente, optimizar, optimizar_tac, log, avance)
+        self.guardar(clave, entrada)
+        return entrada, False
+
+    def limpiar(self):
+        with self._cerrojo:
+            self.entradas.clear()
+
+    def _recordar(self, clave, entrada):
+        with self._cerrojo:
+            self.entradas[clave] = entrada
+            self.entradas.move_to_end(clave)
+            while len(self.entradas) > self.capacidad:
+                self.entradas.popitem(last=False)
+
+    # -----------------------------------------------------------
+    # DISCO
+    # -----------------------------------------------------------
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + EXTENSION)
+
+    def _escribir_disco(self, clave, entrada):
+        datos = marshal.dumps((FORMATO_DISCO, serializar(entrada)))
+        temporal = self._ruta(clave) + '.tmp'
+        try:
+            with open(temporal, 'wb') as archivo:
+                archivo.write(datos)
+            os.replace(temporal, self._ruta(clave))  # Los lectores nunca ven un archivo a medias
+        except OSError:
+            pass  # El disco es opcional: la entrada sigue en memoria
+
+    def _leer_disco(self, clave):
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as archivo:
+                contenido = archivo.read()
+        except OSError:
+            return None  # Archivo ausente: se compila
+        try:
+            formato, datos = marshal.loads(contenido)
+            if formato == FORMATO_DISCO:
+                return deserializar(datos)
+        except Exception:
+            pass
+        # Archivo viejo o dañado (cualquier error al reconstruir la entrada):
+        # se borra y se recompila
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+        return None
+
+
+# ===============================================================
+# FORMATO EN DISCO
+# ===============================================================
+
+def serializar(entrada):
+    tokens = entrada.tokens
+    fuente = tokens.source  # str o bytes: los offsets de los tokens dependen del tipo
+    if not isinstance(fuente, str):
+        fuente = bytes(fuente)
+
+    arena = ASTArena.from_ast(entrada.ast)
+    programa = entrada.programa
+    instrucciones = tuple(
+        (op, destino, a, b, None if operador is None else SIMBOLOS.get(operador, '?'))
+        for op, destino, a, b, operador in programa.instrucciones
+    )
+    return {
+        'fuente': fuente,
+        'tokens': (tokens.tipos.tobytes(), tokens.inicios.tobytes(), tokens.fines.tobytes()),
+        'arena': (arena.tipos.tobytes(), arena.a.tobytes(), arena.b.tobytes(),
+                  arena.c.tobytes(), arena.hijos.tobytes(), tuple(arena.pool), arena.id_raiz),
+        'tac': entrada.tac,
+        'programa': (instrucciones, tuple(programa.valores_iniciales),
+                     programa.variables, programa.temporales),
+    }
+
+
+def deserializar(datos):
+    tokens = TokenBuffer(datos['fuente'])
+    for columna, contenido in zip((tokens.tipos, tokens.inicios, tokens.fines), datos['tokens']):
+        columna.frombytes(contenido)
+
+    tipos, a, b, c, hijos, pool, raiz = datos['arena']
+    arena = ASTArena()
+    for columna, contenido in zip((arena.tipos, arena.a, arena.b, arena.c, arena.hijos),
+                                  (tipos, a, b, c, hijos)):
+        columna.frombytes(contenido)
+    arena.pool = list(pool)
+    arena.id_raiz = raiz
+
+    instrucciones, valores, variables, temporales = datos['programa']
+    programa = Programa(
+        [(op, destino, x, y, None if simbolo is None else OPERADORES.get(simbolo, operador_desconocido))
+         for op, destino, x, y, simbolo in instrucciones],
+        list(valores), variables, temporales
+    )
+    return EntradaCache(tokens, arena.to_ast(), datos['tac'], programa)
+
+
+# ===============================================================
+# CACHÉ COMPARTIDA DEL PROCESO
+# ===============================================================
+
+_cache_global = None
+
+
+def cache_global():
+    """
+    Caché única del proceso. Se guarda también en disco si la variable de
+    entorno COMPILADOR_CACHE_DIR indica un directorio.
+    """
+    global _cache_global
+    if _cache_global is None:
+        _cache_global = CompileCache(directorio=os.environ.get('COMPILADOR_CACHE_DIR') or None)
+    return _cache_global
+
+
+def cache_en_disco():
+    """
+    cache_global() si COMPILADOR_CACHE_DIR indica un directorio; si no, None.
+    Para los programas de una sola compilación (compile.py, main.py): una
+    caché solo en memoria muere con el proceso y únicamente agregaría el
+    hash del fuente y la copia del mmap a bytes.
+    """
+    if os.environ.get('COMPILADOR_CACHE_DIR'):
+        return cache_global()
+    return None
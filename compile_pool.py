@@ -0,0 +1,312 @@
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from collections import deque
+
+from compile_api import compilar, ResultadoCompilacion
+
+# ===============================================================
+# POOL DE PROCESOS DE EJECUCIÓN
+# ===============================================================
+#
+# Los programas que llegan al servidor no se ejecutan en el hilo de la
+# petición sino en un pool acotado de procesos "tibios": cada uno ya
+# importó todas las fases del compilador (y compiló un programa de prueba)
+# y atiende un trabajo por vez a través de un Pipe. Así:
+#
+#   - el rendimiento escala con los núcleos (procesos, no hilos: sin GIL
+#     compartido);
+#   - un programa que no termina solo ocupa su proceso.
+#
+# Límites de cada trabajo:
+#   - instrucciones: el intérprete y las clausuras llevan un presupuesto
+#     (ver TACInterpreter y ast_closures);
+#   - tiempo de CPU: un temporizador ITIMER_PROF en el proceso corta el
+#     trabajo con una excepción, sin matar el proceso;
+#   - tiempo real: si el proceso no responde a tiempo (por ejemplo, una
+#     operación nativa larga que no deja actuar a la señal) se mata y se
+#     reemplaza por uno nuevo.
+#
+# En una transmisión, un hilo del pool lee los mensajes del proceso apenas
+# llegan y los deja en un búfer acotado del que consume el servidor. Así
+# el límite de tiempo real corre aunque el cliente HTTP deje de leer: si
+# no, el proceso quedaría bloqueado en send() con el Pipe lleno (sin gastar
+# CPU, así que ITIMER_PROF no lo corta) y ocuparía su lugar para siempre.
+# Si el búfer se llena, el trabajo se detiene y el proceso se reemplaza.
+#
+# Contrapresión: hay a lo sumo 'procesos + cola' trabajos admitidos (en
+# ejecución o esperando un proceso libre). Si la cola está llena, ejecutar()
+# y transmitir() lanzan PoolLleno de inmediato (el servidor responde HTTP 429).
+#
+# Protocolo con cada proceso: se envía (código, nivel, límites, transmitir,
+# perfilar) y el proceso responde con mensajes ('evento', dict) mientras avanza (solo
+# si se pidió transmitir; ver compile_api) y al final ('fin', resultado).
+
+PROGRAMA_PRUEBA = "var int x = 1; var int i = 0; while (i < 2) { i = i + x; }"
+
+# Eventos que una transmisión guarda mientras el cliente no los lee (cada
+# evento de salida trae hasta compile_api.LINEAS_POR_EVENTO líneas)
+EVENTOS_EN_BUFER = 256
+
+# Cada cuánto el lector de una transmisión mira si el cliente se fue
+# mientras el proceso calcula sin enviar nada (segundos)
+ESPERA_CANCELACION = 0.1
+
+
+class PoolLleno(Exception):
+    """No hay lugar en la cola del pool"""
+
+
+class TiempoExcedido(Exception):
+    """El trabajo superó su tiempo de CPU"""
+
+
+def _sin_tiempo(signum, frame):
+    raise TiempoExcedido("Error de Ejecución: se superó el límite de tiempo de CPU.")
+
+
+def _servir(conexion):
+    """Bucle de un proceso del pool: un trabajo por mensaje, None para terminar"""
+    puede_limitar = hasattr(signal, 'setitimer')
+    if puede_limitar:
+        signal.signal(signal.SIGPROF, _sin_tiempo)
+    compilar(PROGRAMA_PRUEBA)  # Calienta expresiones regulares y cachés de despacho
+
+    while True:
+        try:
+            trabajo = conexion.recv()
+        except (EOFError, OSError):
+            return
+        if trabajo is None:
+            return
+        codigo, nivel, limite_cpu, limite_instrucciones, transmitir, perfilar = trabajo
+        eventos = (lambda evento: conexion.send(('evento', evento))) if transmitir else None
+        try:
+            if puede_limitar and limite_cpu:
+                signal.setitimer(signal.ITIMER_PROF, limite_cpu)
+            try:
+                respuesta = compilar(codigo, nivel=nivel, limite_instrucciones=limite_instrucciones,
+                                     eventos=eventos, perfilar=perfilar).a_dict()
+            finally:
+                if puede_limitar:
+                    signal.setitimer(signal.ITIMER_PROF, 0)
+        except TiempoExcedido as e:
+            # La señal llegó fuera de compilar() (que ya convierte los errores)
+            respuesta = resultado_error(str(e))
+        conexion.send(('fin', respuesta))
+
+
+def resultado_error(mensaje):
+    """Dict de un ResultadoCompilacion fallido con un único diagnóstico"""
+    resultado = ResultadoCompilacion()
+    resultado.diagnosticos.append(mensaje)
+    return resultado.a_dict()
+
+
+class ExecutionPool:
+    """
+    Pool de procesos que compilan y ejecutan programas.
+      procesos:              cantidad de procesos (por defecto, uno por núcleo)
+      cola:                  trabajos que pueden esperar un proceso libre
+      limite_cpu:            segundos de CPU por trabajo (None = sin límite)
+      limite_instrucciones:  instrucciones por trabajo (None = sin límite)
+      limite_real:           segundos de espera antes de matar el proceso
+    """
+
+    def __init__(self, procesos=None, cola=None, limite_cpu=2.0, limite_instrucciones=5_000_000,
+                 limite_real=None):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.cola = self.procesos * 4 if cola is None else cola
+        self.limite_cpu = limite_cpu
+        self.limite_instrucciones = limite_instrucciones
+        # Con más procesos que núcleos el tiempo real supera al de CPU
+        self.limite_real = limite_real or max(10.0, 4 * (limite_cpu or 0))
+        self._contexto = multiprocessing.get_context('spawn')
+        self._cupos = threading.BoundedSemaphore(self.procesos + self.cola)
+        self._libres = queue.Queue()
+        for _ in range(self.procesos):
+            self._libres.put(self._lanzar())
+
+    def _lanzar(self):
+        propia, del_hijo = self._contexto.Pipe()
+        proceso = self._contexto.Process(target=_servir, args=(del_hijo,), daemon=True)
+        proceso.start()
+        del_hijo.close()
+        return proceso, propia
+
+    def ejecutar(self, codigo, nivel='clausuras', perfilar=False):
+        """
+        Compila y ejecuta 'codigo' en un proceso del pool y devuelve el dict
+        del ResultadoCompilacion (con su perfil si 'perfilar'). Lanza
+        PoolLleno si la cola está llena.
+        """
+        self._admitir()
+        respuesta = None
+        for tipo, datos in self._trabajo(codigo, nivel, False, perfilar):
+            if tipo == 'fin':
+                respuesta = datos
+        return respuesta
+
+    def transmitir(self, codigo, nivel='clausuras', perfilar=False):
+        """
+        Igual que ejecutar(), pero devuelve una Transmision: un iterador de
+        los eventos de compile_api a medida que el proceso los produce (el
+        último es el evento 'fin'). PoolLleno se lanza aquí mismo, antes de
+        generar nada.
+        """
+        self._admitir()
+        cancelada = threading.Event()
+        return Transmision(self._trabajo(codigo, nivel, True, perfilar, cancelada), cancelada)
+
+    def _admitir(self):
+        if not self._cupos.acquire(blocking=False):
+            raise PoolLleno("Error: el servidor está ocupado, intenta de nuevo en unos segundos.")
+
+    def _trabajo(self, codigo, nivel, transmitir, perfilar, cancelada=None):
+        """
+        Generador de los mensajes (tipo, datos) de un trabajo ya admitido;
+        libera su cupo al terminar. Si se cierra a mitad del trabajo, o se
+        activa el Event 'cancelada', el proceso (que sigue ocupado) se
+        reemplaza.
+        """
+        trabajador = None
+        terminado = False
+        try:
+            trabajador = self._libres.get()
+            if cancelada is not None and cancelada.is_set():
+                terminado = True  # Abandonado antes de empezar: el proceso sigue libre
+                return
+            conexion = trabajador[1]
+            limite = time.monotonic() + self.limite_real
+            try:
+                conexion.send((codigo, nivel, self.limite_cpu, self.limite_instrucciones,
+                               transmitir, perfilar))
+                while True:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        break
+                    if cancelada is not None:
+                        if cancelada.is_set():
+                            return  # El finally reemplaza el proceso
+                        restante = min(restante, ESPERA_CANCELACION)
+                    if not conexion.poll(restante):
+                        continue
+                    tipo, datos = conexion.recv()
+                    terminado = tipo == 'fin'
+                    yield tipo, datos
+                    if terminado:
+                        return
+                mensaje = (f"Error de Ejecución: el programa no terminó en "
+                           f"{self.limite_real:g} s y se detuvo.")
+            except (EOFError, OSError):
+                mensaje = "Error de Ejecución: el proceso de ejecución terminó inesperadamente."
+            terminado = True
+            trabajador = self._reemplazar(trabajador)
+            yield 'fin', resultado_error(mensaje)
+        finally:
+            if trabajador is not None:
+                if not terminado:
+                    trabajador = self._reemplazar(trabajador)
+                self._libres.put(trabajador)
+            self._cupos.release()
+
+    def _reemplazar(self, trabajador):
+        self._descartar(trabajador)
+        return self._lanzar()
+
+    @staticmethod
+    def _descartar(trabajador):
+        proceso, conexion = trabajador
+        proceso.kill()
+        proceso.join()
+        conexion.close()
+
+    def cerrar(self):
+        """Termina todos los procesos libres"""
+        while True:
+            try:
+                proceso, conexion = self._libres.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                conexion.send(None)
+            except OSError:
+                pass
+            proceso.join(1)
+            if proceso.is_alive():
+                proceso.kill()
+            conexion.close()
+
+
+class Transmision:
+    """
+    Eventos de un trabajo del pool (ver ExecutionPool.transmitir).
+    Un hilo lee los mensajes del proceso a medida que llegan (ver el
+    comentario del módulo) y el iterador los entrega desde ese búfer.
+    close() abandona el trabajo: el proceso se reemplaza si seguía ocupado
+    y el cupo se libera (el servidor lo llama si el cliente se desconecta).
+    """
+
+    def __init__(self, mensajes, cancelada, capacidad=EVENTOS_EN_BUFER):
+        self.cancelada = cancelada
+        self.capacidad = capacidad
+        self.pendientes = deque()        # mensajes (tipo, datos) aún no entregados
+        self.condicion = threading.Condition()
+        self.leidos = False              # el lector ya no agrega mensajes
+        self.cerrada = False
+        self.con_fin = False
+        threading.Thread(target=self._leer, args=(mensajes,), daemon=True).start()
+
+    def _leer(self, mensajes):
+        """Hilo lector: pasa los mensajes del proceso al búfer sin esperar al cliente"""
+        try:
+            for mensaje in mensajes:
+                with self.condicion:
+                    if self.cerrada:
+                        break
+                    tipo, datos = mensaje
+                    final = tipo == 'fin' or datos['evento'] == 'fin'
+                    if len(self.pendientes) >= self.capacidad and not final:
+                        self.pendientes.append(('fin', resultado_error(
+                            "Error de Ejecución: la salida no se leyó a tiempo y el "
+                            "programa se detuvo.")))
+                        break
+                    self.pendientes.append(mensaje)
+                    self.condicion.notify()
+        finally:
+            mensajes.close()  # Cortado a mitad: el proceso se reemplaza
+            with self.condicion:
+                self.leidos = True
+                self.condicion.notify()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            with self.condicion:
+                while not self.pendientes and not self.leidos and not self.cerrada:
+                    self.condicion.wait()
+                if self.cerrada or not self.pendientes:
+                    raise StopIteration
+                tipo, datos = self.pendientes.popleft()
+            if tipo == 'evento':
+                self.con_fin = self.con_fin or datos['evento'] == 'fin'
+                return datos
+            # El mensaje final del proceso solo se convierte en evento si
+            # compile_api no llegó a emitir el suyo (proceso detenido)
+            if not self.con_fin:
+                self.con_fin = True
+                return {'evento': 'fin', 'resultado': datos}
+
+    def close(self):
+        with self.condicion:
+            if self.cerrada:
+                return
+            self.cerrada = True
+            self.pendientes.clear()
+            self.condicion.notify_all()
+        self.cancelada.set()
@@ -0,0 +1,173 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+from ast_arena import ASTArena
+
+# ===============================================================
+# PERFIL DE COMPILACIÓN POR FASES
+# ===============================================================
+#
+# Mide cada fase del compilador (léxico, sintáctico, semántico,
+# optimización, generación TAC, ejecución) con time.perf_counter y le
+# asocia contadores de lo que procesó: tokens, nodos del AST,
+# instrucciones TAC, una cota de las ejecutadas. De cada contador se deriva
+# su ritmo (por ejemplo tokens/s), que es lo que se compara para ver qué
+# fase empeoró entre dos versiones.
+#
+# Con memoria=True además registra el pico de memoria de cada fase con
+# tracemalloc (lo reservado por encima de lo que había al empezarla).
+# tracemalloc hace más lenta cada reserva de memoria, así que los tiempos
+# medidos así solo se comparan con otros medidos igual. tracemalloc es
+# global al proceso: con varios perfiles a la vez en hilos distintos los
+# picos se mezclan (los tiempos no).
+#
+# Las instrucciones ejecutadas no se cuentan una por una (costaría en el
+# bucle de despacho): se informa lo que el ejecutor cobra contra su límite
+# de instrucciones, con un nombre que lo dice:
+#   cota_ejecutadas  TACInterpreter: cota superior de las instrucciones TAC
+#                    ejecutadas (ver TACInterpreter.execute)
+#   costo_ciclos     clausuras: solo el costo estático de las vueltas de
+#                    los while; el código fuera de ciclos no se cuenta
+# Sus ritmos (cota_ejecutadas_por_s) son cotas, no rendimiento medido.
+
+# Perfiles con memoria activos en el proceso; tracemalloc se detiene
+# cuando termina el último (si no estaba activo desde antes)
+_con_memoria = 0
+_detener_al_final = False
+_cerrojo = threading.Lock()
+
+
+def contar_nodos(ast):
+    """Cantidad de nodos de un AST"""
+    return len(ASTArena.from_ast(ast))
+
+
+def medir(perfil, nombre):
+    """perfil.fase(nombre), o un contexto vacío si no hay perfil (None)"""
+    return perfil.fase(nombre) if perfil is not None else nullcontext()
+
+
+class Medicion:
+    """Tiempo, pico de memoria y contadores de una fase"""
+
+    __slots__ = ('fase', 'ms', 'pico_kb', 'contadores')
+
+    def __init__(self, fase):
+        self.fase = fase
+        self.ms = 0.0
+        self.pico_kb = None  # None = sin medir memoria
+        self.contadores = {}
+
+    def ritmos(self):
+        """Contador -> cantidad por segundo"""
+        if self.ms <= 0:
+            return {}
+        return {nombre: cantidad * 1000 / self.ms for nombre, cantidad in self.contadores.items()}
+
+    def a_dict(self):
+        datos = {'fase': self.fase, 'ms': self.ms, 'pico_kb': self.pico_kb, **self.contadores}
+        for nombre, ritmo in self.ritmos().items():
+            datos[f'{nombre}_por_s'] = ritmo
+        return datos
+
+
+class PhaseProfiler:
+    """
+    Perfil de una compilación. Se usa como contexto (o entre iniciar() y
+    terminar()) y cada fase se mide con fase():
+
+        with PhaseProfiler() as perfil:
+            with perfil.fase('Léxico'):
+                tokens = tokenizar(fuente)
+            perfil.contar('tokens', len(tokens))
+        print(perfil.informe())
+
+    contar() se aplica a la última fase empezada, así que los contadores
+    se pueden calcular fuera del tramo medido.
+    """
+
+    def __init__(self, memoria=True):
+        self.memoria = memoria
+        self.mediciones = []
+        self.total_ms = 0.0
+        self._inicio = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *excepcion):
+        self.terminar()
+        return False
+
+    def iniciar(self):
+        global _con_memoria, _detener_al_final
+        if self.memoria:
+            with _cerrojo:
+                if _con_memoria == 0:
+                    _detener_al_final = not tracemalloc.is_tracing()
+                    if _detener_al_final:
+                        tracemalloc.start()
+                _con_memoria += 1
+        self._inicio = time.perf_counter()
+        return self
+
+    def terminar(self):
+        global _con_memoria
+        self.total_ms = (time.perf_counter() - self._inicio) * 1000
+        if self.memoria:
+            with _cerrojo:
+                _con_memoria -= 1
+                if _con_memoria == 0 and _detener_al_final:
+                    tracemalloc.stop()
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide el bloque como la fase 'nombre' (también si termina con error)"""
+        medicion = Medicion(nombre)
+        self.mediciones.append(medicion)
+        if self.memoria:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        try:
+            yield medicion
+        finally:
+            medicion.ms = (time.perf_counter() - inicio) * 1000
+            if self.memoria:
+                medicion.pico_kb = max(0, tracemalloc.get_traced_memory()[1] - base) / 1024
+
+    def contar(self, nombre, cantidad):
+        """Suma 'cantidad' al contador 'nombre' de la última fase"""
+        if cantidad is None or not self.mediciones:
+            return
+        contadores = self.mediciones[-1].contadores
+        contadores[nombre] = contadores.get(nombre, 0) + cantidad
+
+    def a_dict(self):
+        """Dict serializable a JSON"""
+        picos = [m.pico_kb for m in self.mediciones if m.pico_kb is not None]
+        return {
+            'total_ms': self.total_ms,
+            'pico_kb': max(picos) if picos else None,
+            'fases': [m.a_dict() for m in self.mediciones],
+        }
+
+    def informe(self):
+        """Tabla de texto con una fila por fase"""
+        lineas = [f"{'Fase':<16} {'ms':>10} {'pico KB':>10}  Contadores",
+                  "-" * 72]
+        for m in self.mediciones:
+            pico = '-' if m.pico_kb is None else f"{m.pico_kb:.1f}"
+            ritmos = m.ritmos()
+            contadores = ", ".join(
+                f"{nombre}: {cantidad}" + (f" ({ritmos[nombre]:,.0f}/s)" if nombre in ritmos else "")
+                for nombre, cantidad in m.contadores.items()
+            )
+            lineas.append(f"{m.fase:<16} {m.ms:>10.3f} {pico:>10}  {contadores}".rstrip())
+        lineas.append("-" * 72)
+        lineas.append(f"{'Total':<16} {self.total_ms:>10.3f}")
+        if self.memoria:
+            lineas.append("(con tracemalloc activo: los tiempos incluyen su costo)")
+        return "\n".join(lineas)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Proceso compilador persistente ("worker").
+
+Se lanza UNA vez y se queda con todas las fases ya importadas (lexer,
+parser, semántico, TAC e intérprete). Habla un protocolo de líneas JSON:
+
+    petición:   {"id": 1, "code": "var int x = 1;"}
+    respuesta:  {"id": 1, "ok": true, "tokens": [...], "diagnosticos": [...],
+                 "tac": "...", "salida": [...], "memoria": {...}, "cache": false,
+                 "tiempo_ms": 1.2}
+
+Lo usa GUI.app mediante la clase CompileWorker en vez de lanzar main.py
+como subproceso en cada compilación.
+"""
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from compile_api import compilar as compilar_programa
+
+WORKER_PATH = os.path.abspath(__file__)
+
+
+# ===============================================================
+# COMPILACIÓN ESTRUCTURADA (lado del worker)
+# ===============================================================
+
+def compilar(codigo_fuente):
+    """
+    Ejecuta todas las fases con compile_api y devuelve un dict serializable
+    con el resultado. La salida del programa llega en 'salida' sin pasar
+    por stdout (que es el canal del protocolo) y las trazas de las fases no
+    se generan. Un fuente ya compilado se toma de la caché y solo se ejecuta.
+    """
+    resultado = compilar_programa(codigo_fuente, nivel='interprete')
+    respuesta = resultado.a_dict()
+    # La GUI muestra la lista de tokens, no solo la cantidad
+    entrada = resultado.entrada
+    respuesta['tokens'] = [list(token) for token in entrada.tokens] if entrada else []
+    return respuesta
+
+
+def servir(entrada=sys.stdin, salida=sys.stdout):
+    """Bucle principal del worker: una petición JSON por línea"""
+    for linea in entrada:
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            peticion = json.loads(linea)
+            respuesta = compilar(peticion.get('code', ''))
+            respuesta['id'] = peticion.get('id')
+        except Exception as e:
+            respuesta = {'id': None, 'ok': False, 'diagnosticos': [f"Error del worker: {e}"]}
+        salida.write(json.dumps(respuesta, ensure_ascii=False, default=str) + "\n")
+        salida.flush()
+
+
+# ===============================================================
+# CLIENTE (lado de la GUI)
+# ===============================================================
+
+class CompileWorker:
+    """
+    Mantiene vivo un proceso compile_worker.py y le envía programas.
+    Si el proceso muere o excede el tiempo límite, se reinicia en la
+    siguiente compilación.
+    """
+
+    def __init__(self, timeout=10.0):
+        self.timeout = timeout
+        self.proceso = None
+        self.respuestas = None
+        self.siguiente_id = 0
+
+    def iniciar(self):
+        self.proceso = subprocess.Popen(
+            [sys.executable, '-u', WORKER_PATH],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding='utf-8'
+        )
+        # Un hilo lector permite esperar la respuesta con tiempo límite
+        self.respuestas = queue.Queue()
+        lector = threading.Thread(target=self._leer, args=(self.proceso, self.respuestas),
+                                  daemon=True)
+        lector.start()
+
+    @staticmethod
+    def _leer(proceso, respuestas):
+        for linea in proceso.stdout:
+            respuestas.put(linea)
+        respuestas.put(None)
+
+    def activo(self):
+        return self.proceso is not None and self.proceso.poll() is None
+
+    def compilar(self, codigo_fuente):
+        """Envía el código al worker y devuelve el dict de resultado"""
+        if not self.activo():
+            self.iniciar()
+
+        self.siguiente_id += 1
+        peticion = {'id': self.siguiente_id, 'code': codigo_fuente}
+        try:
+            self.proceso.stdin.write(json.dumps(peticion, ensure_ascii=False) + "\n")
+            self.proceso.stdin.flush()
+            linea = self.respuestas.get(timeout=self.timeout)
+        except queue.Empty:
+            self.cerrar()
+            return {'ok': False, 'diagnosticos': [
+                f"Error: la compilación excedió {self.timeout:.0f} s y se detuvo"]}
+        except OSError as e:
+            self.cerrar()
+            return {'ok': False, 'diagnosticos': [f"Error de comunicación con el worker: {e}"]}
+
+        if linea is None:
+            self.cerrar()
+            return {'ok': False, 'diagnosticos': ["Error: el worker terminó inesperadamente"]}
+        return json.loads(linea)
+
+    def cerrar(self):
+        if self.proceso is None:
+            return
+        try:
+            self.proceso.stdin.close()
+        except OSError:
+            pass
+        if self.proceso.poll() is None:
+            self.proceso.kill()
+        self.proceso.wait()
+        self.proceso = None
+
+
+if __name__ == "__main__":
+    # La salida real del protocolo es stdout; las fases no escriben en él
+    servir()
@@ -0,0 +1,366 @@
+from bisect import bisect_right
+from operator import attrgetter, itemgetter
+
+from Analizador_lexico import TokenBuffer, lexer, mensaje_error_lexico
+from parser import Parser
+from analizador_semantico import (
+    Block, VarDecl, Identifier, Symbol, SymbolTable, SemanticAnalyzer
+)
+
+# ===============================================================
+# SESIÓN DE COMPILACIÓN INCREMENTAL (EDITOR / GUI)
+# ===============================================================
+#
+# El programa se guarda como una lista de sentencias de nivel raíz, cada una
+# con su rango [inicio, fin) en el texto, su nodo AST y los símbolos que
+# declara y usa. Al aplicar una edición:
+#
+#   1. Se re-analiza léxicamente solo la ventana dañada: desde el final de la
+#      sentencia anterior a la edición hasta el primer token que vuelva a
+#      coincidir con el inicio de una sentencia vieja (punto de
+#      resincronización). El lexer no tiene estado entre tokens, así que a
+#      partir de ahí los tokens son idénticos a los anteriores.
+#   2. Se parsean solo las sentencias de esa ventana. Si no cierran (por
+#      ejemplo, se borró una '}'), la ventana se agranda al doble.
+#   3. Se vuelve a ejecutar el SemanticAnalyzer solo sobre las sentencias
+#      nuevas y sobre las posteriores que usan o declaran un nombre cuya
+#      declaración cambió.
+#
+# Los errores léxicos se guardan como offsets del texto: los de la ventana
+# se reemplazan por los del nuevo análisis y los posteriores se desplazan
+# con la edición. El mensaje (con línea y columna) se arma al pedir los
+# diagnósticos, así no queda desactualizado.
+
+
+class Sentencia:
+    """Sentencia de nivel raíz con su rango en el texto y sus símbolos"""
+
+    __slots__ = ('inicio', 'fin', 'nodo', 'declara', 'usa', 'error', 'indice')
+
+    def __init__(self, inicio, fin, nodo):
+        self.inicio = inicio
+        self.fin = fin
+        self.nodo = nodo
+        self.declara, self.usa = recolectar_simbolos(nodo)
+        self.error = None
+        self.indice = 0
+
+
+def recolectar_simbolos(nodo):
+    """
+    Devuelve (declara, usa): un dict nombre -> tipo con las variables que
+    declara la sentencia y el conjunto de nombres que referencia.
+    """
+    declara = {}
+    usa = set()
+    pendientes = [nodo]
+    while pendientes:
+        n = pendientes.pop()
+        if n is None:
+            continue
+        if isinstance(n, VarDecl):
+            declara.setdefault(n.var_name, n.var_type)
+        elif isinstance(n, Identifier):
+            usa.add(n.name)
+        elif isinstance(n, Block):
+            pendientes.extend(n.children)
+        else:
+            # Resto de nodos: se recorren sus atributos que sean nodos
+            for campo in ('target', 'value', 'left', 'right', 'expression',
+                          'condition', 'then_block', 'else_block', 'body'):
+                hijo = getattr(n, campo, None)
+                if hijo is not None and not isinstance(hijo, (str, int)):
+                    pendientes.append(hijo)
+    return declara, usa
+
+
+class TablaSesion(SymbolTable):
+    """
+    Tabla de símbolos para verificar UNA sentencia de la sesión.
+    Lo que no está en sus propios ámbitos se busca en las declaraciones
+    de las sentencias anteriores, sin volver a visitarlas.
+    """
+
+    def __init__(self, sesion, indice):
+        super().__init__()
+        self.sesion = sesion
+        self.indice = indice
+
+    def declare(self, symbol):
+        if self.sesion.tipo_visible(symbol.name, self.indice) is not None:
+            return False
+        return super().declare(symbol)
+
+    def lookup(self, name):
+        symbol = super().lookup(name)
+        if symbol is not None:
+            return symbol
+        var_type = self.sesion.tipo_visible(name, self.indice)
+        if var_type is None:
+            return None
+        return Symbol(name, var_type)
+
+
+class SyntaxErrorVentana(Exception):
+    def __init__(self, mensaje, tokens):
+        super().__init__(mensaje)
+        self.tokens = tokens  # Tokens de la ventana (con sus errores léxicos)
+
+
+class CompilationSession:
+    """
+    Sesión de compilación incremental sobre el texto de un editor.
+
+    Uso:
+        sesion = CompilationSession(texto)
+        sesion.editar(offset, borrados, "texto insertado")
+        sesion.diagnosticos()   # errores actuales
+        sesion.ast()            # Block raíz actualizado
+    """
+
+    def __init__(self, texto=""):
+        self.texto = texto
+        self.sentencias = []
+        self.declaraciones = {}  # nombre -> lista de Sentencia que lo declaran
+        self.usos = {}           # nombre -> conjunto de Sentencia que lo usan
+        self.errores_lexicos = []  # offsets de los caracteres inválidos, en orden
+        self.error_sintactico = None
+        self.verificadas = 0     # sentencias re-verificadas en la última edición
+        self._reconstruir()
+
+    # -----------------------------------------------------------
+    # API PÚBLICA
+    # -----------------------------------------------------------
+
+    def editar(self, offset, borrados, insertado):
+        """
+        Aplica una edición: borra 'borrados' caracteres desde 'offset' e
+        inserta 'insertado'. Devuelve la lista de diagnósticos.
+        """
+        if offset < 0 or borrados < 0 or offset + borrados > len(self.texto):
+            raise ValueError("Edición fuera del rango del texto")
+
+        self.texto = self.texto[:offset] + insertado + self.texto[offset + borrados:]
+
+        # Tras un error de sintaxis no hay sentencias fiables: todo de nuevo
+        if self.error_sintactico is not None:
+            self._reconstruir()
+            return self.diagnosticos()
+
+        delta = len(insertado) - borrados
+        fin_edicion = offset + borrados
+        fines = attrgetter('fin')
+        inicios = attrgetter('inicio')
+
+        # Primera sentencia dañada: la primera que termina después del offset
+        i = bisect_right(self.sentencias, offset, key=fines)
+        # Primera sentencia intacta: la primera que empieza en o tras el fin de la edición
+        j = max(i, bisect_right(self.sentencias, fin_edicion - 1, key=inicios))
+
+        inicio_ventana = self.sentencias[i - 1].fin if i > 0 else 0
+        saltos = 0
+        while True:
+            try:
+                nuevas, k, tokens = self._parsear_ventana(inicio_ventana, j, delta, saltos)
+                break
+            except SyntaxErrorVentana as e:
+                if j + saltos >= len(self.sentencias):
+                    # La ventana llegó hasta el final del texto
+                    self._reconstruir_con_error(
+                        str(e), [o for o in self.errores_lexicos if o < inicio_ventana]
+                        + list(e.tokens.inicios_errores))
+                    return self.diagnosticos()
+                saltos = saltos * 2 + 1
+
+        self._actualizar_errores_lexicos(inicio_ventana, tokens, delta)
+        self._reemplazar(i, k, nuevas, delta)
+        return self.diagnosticos()
+
+    def diagnosticos(self):
+        """Errores actuales (léxicos, sintácticos o semánticos), en orden del texto"""
+        lexicos = self._errores_lexicos_con_posicion()
+        if self.error_sintactico is not None:
+            return [mensaje for _, mensaje in lexicos] + [self.error_sintactico]
+        semanticos = [(s.inicio, s.error) for s in self.sentencias if s.error is not None]
+        return [mensaje for _, mensaje in sorted(lexicos + semanticos, key=itemgetter(0))]
+
+    def ast(self):
+        """Bloque raíz equivalente al que produciría Parser.parse()"""
+        return Block([s.nodo for s in self.sentencias])
+
+    def tipo_visible(self, nombre, indice):
+        """Tipo declarado de 'nombre' por alguna sentencia anterior a 'indice'"""
+        for s in self.declaraciones.get(nombre, ()):
+            if s.indice < indice:
+                return s.declara[nombre]
+        return None
+
+    # -----------------------------------------------------------
+    # LÉXICO + SINTÁCTICO DE LA VENTANA
+    # -----------------------------------------------------------
+
+    def _parsear_ventana(self, inicio, j, delta, saltos):
+        """
+        Re-analiza desde 'inicio' hasta el primer punto de resincronización
+        a partir de la sentencia vieja j (saltándose 'saltos' candidatos).
+        Devuelve (sentencias nuevas, índice de la primera sentencia vieja
+        que se conserva, tokens de la ventana).
+        """
+        viejas = self.sentencias
+        estado = {'m': j, 'saltos': saltos, 'resincronizado': False}
+
+        def parada(offset):
+            m = estado['m']
+            while m < len(viejas) and viejas[m].inicio + delta < offset:
+                m += 1
+            estado['m'] = m
+            if m < len(viejas) and viejas[m].inicio + delta == offset:
+                if estado['saltos'] == 0:
+                    estado['resincronizado'] = True
+                    return True
+                estado['saltos'] -= 1
+                estado['m'] = m + 1
+            return False
+
+        tokens = lexer.tokenizar(self.texto, inicio, parada, log=None)
+        parser = Parser(tokens)
+        ts = parser.ts
+        nuevas = []
+        try:
+            while ts.peek_tipo() != 'EOF':
+                pos = ts.pos
+                nodo = parser.parse_statement()
+                nuevas.append(Sentencia(tokens.inicios[pos], tokens.fines[ts.pos - 1], nodo))
+        except Exception as e:
+            raise SyntaxErrorVentana(str(e), tokens)
+
+        # Sin punto de resincronización se re-analizó hasta el final
+        k = estado['m'] if estado['resincronizado'] else len(viejas)
+        return nuevas, k, tokens
+
+    # -----------------------------------------------------------
+    # ERRORES LÉXICOS
+    # -----------------------------------------------------------
+
+    def _actualizar_errores_lexicos(self, inicio, tokens, delta):
+        """
+        Reemplaza los errores léxicos de la ventana re-analizada por los de
+        'tokens'; los que estaban después de la ventana se desplazan 'delta'.
+        """
+        fin = tokens.inicios[-1]  # El EOF queda en el punto de resincronización
+        fin_viejo = fin - delta
+        self.errores_lexicos = (
+            [o for o in self.errores_lexicos if o < inicio]
+            + list(tokens.inicios_errores)
+            + [o + delta for o in self.errores_lexicos if o >= fin_viejo]
+        )
+
+    def _errores_lexicos_con_posicion(self):
+        """Lista de (offset, mensaje) con la línea y columna del texto actual"""
+        if not self.errores_lexicos:
+            return []
+        posiciones = TokenBuffer(self.texto)
+        return [(o, mensaje_error_lexico(self.texto[o], *posiciones.posicion_offset(o)))
+                for o in self.errores_lexicos]
+
+    # -----------------------------------------------------------
+    # ACTUALIZACIÓN DE LA LISTA DE SENTENCIAS
+    # -----------------------------------------------------------
+
+    def _reemplazar(self, i, k, nuevas, delta):
+        viejas = self.sentencias[i:k]
+        for s in viejas:
+            self._desindexar(s)
+
+        # Desplazar las sentencias posteriores (solo enteros)
+        if delta:
+            for s in self.sentencias[k:]:
+                s.inicio += delta
+                s.fin += delta
+
+        self.sentencias[i:k] = nuevas
+        for indice in range(i, len(self.sentencias)):
+            self.sentencias[indice].indice = indice
+        for s in nuevas:
+            self._indexar(s)
+
+        # Nombres cuya declaración cambió
+        antes = {}
+        for s in viejas:
+            for nombre, tipo in s.declara.items():
+                antes.setdefault(nombre, tipo)
+        despues = {}
+        for s in nuevas:
+            for nombre, tipo in s.declara.items():
+                despues.setdefault(nombre, tipo)
+        cambiados = {n for n in antes.keys() | despues.keys()
+                     if antes.get(n) != despues.get(n)}
+
+        # Sentencias a re-verificar: las nuevas y las dependientes posteriores
+        pendientes = set(nuevas)
+        limite = i + len(nuevas)
+        for nombre in cambiados:
+            for s in self.usos.get(nombre, ()):
+                if s.indice >= limite:
+                    pendientes.add(s)
+            for s in self.declaraciones.get(nombre, ()):
+                if s.indice >= limite:
+                    pendientes.add(s)
+
+        self._verificar(sorted(pendientes, key=attrgetter('indice')))
+
+    def _indexar(self, s):
+        for nombre in s.declara:
+            lista = self.declaraciones.setdefault(nombre, [])
+            lista.append(s)
+            lista.sort(key=attrgetter('indice'))
+        for nombre in s.usa:
+            self.usos.setdefault(nombre, set()).add(s)
+
+    def _desindexar(self, s):
+        for nombre in s.declara:
+            self.declaraciones[nombre].remove(s)
+            if not self.declaraciones[nombre]:
+                del self.declaraciones[nombre]
+        for nombre in s.usa:
+            self.usos[nombre].discard(s)
+            if not self.usos[nombre]:
+                del self.usos[nombre]
+
+    def _verificar(self, sentencias):
+        """Ejecuta el análisis semántico solo sobre las sentencias dadas"""
+        for s in sentencias:
+            analyzer = SemanticAnalyzer(log=None)
+            analyzer.symbol_table = TablaSesion(self, s.indice)
+            try:
+                analyzer.visit(s.nodo)
+                s.error = None
+            except Exception as e:
+                s.error = str(e)
+        self.verificadas = len(sentencias)
+
+    def _reconstruir(self):
+        """Compilación completa del texto (inicio o recuperación de errores)"""
+        self.sentencias = []
+        self.declaraciones = {}
+        self.usos = {}
+        self.error_sintactico = None
+        try:
+            nuevas, _, tokens = self._parsear_ventana(0, 0, 0, 0)
+        except SyntaxErrorVentana as e:
+            self.errores_lexicos = list(e.tokens.inicios_errores)
+            self.error_sintactico = str(e)
+            return
+        self.errores_lexicos = list(tokens.inicios_errores)
+        self.sentencias = nuevas
+        for indice, s in enumerate(nuevas):
+            s.indice = indice
+            self._indexar(s)
+        self._verificar(nuevas)
+
+    def _reconstruir_con_error(self, mensaje, errores_lexicos):
+        self.sentencias = []
+        self.declaraciones = {}
+        self.usos = {}
+        self.errores_lexicos = errores_lexicos
+        self.error_sintactico = mensaje
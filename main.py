@@ -6,71 +6,140 @@ import sys
 sys.path.append(os.path.dirname(__file__))
 
 try:
-    # Importar el analizador léxico
-    from Analizador_lexico import analizar
+    # Importar el analizador léxico y la carga de archivos (mmap)
+    from Analizador_lexico import tokenizar
+    from source_loader import abrir_fuente
     
     # Importar el parser
-    from parser import Parser, parse_source
+    from parser import Parser
     
     # Importar el analizador semántico
     from analizador_semantico import SemanticAnalyzer
+    from ast_optimizer import ASTOptimizer
+    from compile_profile import PhaseProfiler, contar_nodos, medir
     
     # Importar componentes TAC (si los tienes)
     try:
         from tac_generator import TACGenerator
         from tac_interpreter import TACInterpreter
+        from tac_optimizer import optimizar_texto
+        from tac_assembler import ensamblar
+        from compile_cache import EntradaCache, cache_en_disco
         TAC_AVAILABLE = True
     except ImportError:
         print("⚠️  Componentes TAC no disponibles - solo análisis")
         TAC_AVAILABLE = False
     
-    def compilar_codigo_fuente(codigo_fuente):
-        """Función principal de compilación"""
+    def ejecutar(programa, perfil=None):
+        """Ejecuta un Programa TAC ya ensamblado y muestra la memoria final"""
+        print("\n5. 🚀 EJECUCIÓN")
+        interpreter = TACInterpreter()
+        with medir(perfil, 'Ejecución'):
+            resultado = interpreter.execute(programa)
+        if perfil is not None:
+            perfil.contar('cota_ejecutadas', interpreter.pasos)
+        print("✅ Ejecución completada")
+        print("   Variables finales:")
+        for variable, valor in resultado.items():
+            # El intérprete ya separa los temporales de las variables
+            print(f"   - {variable} = {valor}")
+    
+    def compilar_codigo_fuente(codigo_fuente, optimizar_tac=False, perfil=None):
+        """
+        Función principal de compilación.
+        Acepta el código como str o como bytes/mmap (ver source_loader).
+        Con optimizar_tac=True se aplica además el optimizador de TAC.
+        Con un PhaseProfiler se mide cada fase (ver compile_profile).
+        """
         print("=== INICIANDO COMPILACIÓN ===")
-        # Mostramos solo las primeras líneas para no saturar si el archivo es grande
-        print(f"Código fuente (tamaño: {len(codigo_fuente)} caracteres)")
+        if isinstance(codigo_fuente, str):
+            print(f"Código fuente (tamaño: {len(codigo_fuente)} caracteres)")
+            texto = codigo_fuente
+        else:
+            print(f"Código fuente (tamaño: {len(codigo_fuente)} bytes)")
+            texto = bytes(codigo_fuente).decode('utf-8', errors='replace')
         print("-" * 20)
-        print(codigo_fuente)
+        print(texto)
         print("-" * 20 + "\n")
         
         try:
-            # 1. ANÁLISIS LÉXICO
+            # 0. CACHÉ (solo con COMPILADOR_CACHE_DIR): el mismo fuente ya
+            # compilado pasa directo a ejecución
+            cache = cache_en_disco() if TAC_AVAILABLE else None
+            if cache is not None:
+                with medir(perfil, 'Caché'):
+                    clave = cache.clave(codigo_fuente, True, optimizar_tac)
+                    entrada = cache.obtener(clave)
+                if entrada is not None:
+                    print(f"♻️  Compilación encontrada en caché ({clave[:12]})")
+                    print(f"✅ Tokens: {len(entrada.tokens)}")
+                    print("✅ Código TAC:")
+                    print(entrada.tac)
+                    ejecutar(entrada.programa, perfil)
+                    return True
+            
+            # 1. ANÁLISIS LÉXICO (una sola vez; el parser reutiliza estos tokens)
             print("\n1. 📝 ANÁLISIS LÉXICO")
-            tokens = analizar(codigo_fuente)
+            with medir(perfil, 'Léxico'):
+                tokens = tokenizar(codigo_fuente)
+            if perfil is not None:
+                perfil.contar('tokens', len(tokens))
             print(f"✅ Tokens generados: {len(tokens)}")
             for i, token in enumerate(tokens):
                 print(f"   {i+1:2d}. {token}")
             
             # 2. ANÁLISIS SINTÁCTICO
             print("\n2. 📐 ANÁLISIS SINTÁCTICO")
-            ast = parse_source(codigo_fuente)
+            with medir(perfil, 'Sintáctico'):
+                ast = Parser(tokens).parse()
+            if perfil is not None:
+                nodos = contar_nodos(ast)
+                perfil.contar('nodos', nodos)
             print("✅ AST generado exitosamente")
             print(f"   Tipo: {type(ast)}")
             
             # 3. ANÁLISIS SEMÁNTICO
             print("\n3. 🎯 ANÁLISIS SEMÁNTICO")
-            analyzer = SemanticAnalyzer()
-            analyzer.visit(ast)
+            if perfil is not None:
+                # Sin trazas: el tiempo medido es el del análisis, no el de imprimirlo
+                print("   (trazas del semántico omitidas al perfilar)")
+            analyzer = SemanticAnalyzer(log=print if perfil is None else None)
+            with medir(perfil, 'Semántico'):
+                analyzer.visit(ast)
+            if perfil is not None:
+                perfil.contar('nodos', nodos)
             print("✅ Análisis semántico completado")
             
+            # 3b. OPTIMIZACIÓN (plegado y propagación de constantes)
+            optimizador = ASTOptimizer()
+            with medir(perfil, 'Optimización'):
+                ast = optimizador.optimizar(ast)
+            if perfil is not None:
+                perfil.contar('nodos', contar_nodos(ast))
+            print(f"✅ Optimización: {optimizador.resumen()}")
+            
             # 4. GENERACIÓN DE CÓDIGO (si está disponible)
             if TAC_AVAILABLE:
                 print("\n4. ⚡ GENERACIÓN DE CÓDIGO TAC")
                 tac_gen = TACGenerator()
-                tac_code = tac_gen.generate(ast)
+                with medir(perfil, 'Generación TAC'):
+                    tac_code = tac_gen.generate(ast)
                 print("✅ Código TAC generado:")
                 print(tac_code)
                 
-                print("\n5. 🚀 EJECUCIÓN")
-                interpreter = TACInterpreter()
-                resultado = interpreter.execute(tac_code)
-                print("✅ Ejecución completada")
-                print("   Variables finales:")
-                for variable, valor in resultado.items():
-                    # Solo ocultamos si parece temporal (ej: t1, t20)
-                    # Si es 'total', 'temperatura', etc., lo imprimimos.
-                    if "temp_" not in variable:
-                        print(f"   - {variable} = {valor}")
+                if optimizar_tac:
+                    with medir(perfil, 'Optimización TAC'):
+                        tac_code, antes, despues = optimizar_texto(tac_code)
+                    print(f"✅ TAC optimizado ({antes} -> {despues} instrucciones):")
+                    print(tac_code)
+                
+                with medir(perfil, 'Ensamblado'):
+                    programa = ensamblar(tac_code)
+                if perfil is not None:
+                    perfil.contar('instrucciones', len(programa))
+                if cache is not None:
+                    cache.guardar(clave, EntradaCache(tokens, ast, tac_code, programa))
+                ejecutar(programa, perfil)
             else:
                 print("\n✅ COMPILACIÓN COMPLETADA (solo análisis)")
                 
@@ -86,22 +155,32 @@ try:
     # --- BLOQUE PRINCIPAL MODIFICADO ---
     if __name__ == "__main__":
         # Verificamos si se pasó un argumento (el nombre del archivo)
-        if len(sys.argv) > 1:
-            nombre_archivo = sys.argv[1]
+        # --optimizar-tac y --perfil (o --profile) pueden ir antes o después del archivo
+        opciones = {'--optimizar-tac', '--perfil', '--profile'}
+        argumentos = [a for a in sys.argv[1:] if a not in opciones]
+        optimizar_tac = '--optimizar-tac' in sys.argv[1:]
+        perfilar = bool({'--perfil', '--profile'} & set(sys.argv[1:]))
+        if argumentos:
+            nombre_archivo = argumentos[0]
             
             # Intentamos abrir y leer el archivo
             try:
-                with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
-                    contenido = archivo.read()
+                with abrir_fuente(nombre_archivo) as fuente:
                     print(f"📂 Leyendo archivo: {nombre_archivo}")
-                    compilar_codigo_fuente(contenido)
+                    if perfilar:
+                        with PhaseProfiler() as perfil:
+                            compilar_codigo_fuente(fuente.datos, optimizar_tac, perfil)
+                        print("\n📊 PERFIL POR FASES")
+                        print(perfil.informe())
+                    else:
+                        compilar_codigo_fuente(fuente.datos, optimizar_tac)
             except FileNotFoundError:
                 print(f"❌ Error: El archivo '{nombre_archivo}' no existe.")
             except Exception as e:
                 print(f"❌ Error al leer el archivo: {e}")
         else:
             print("❌ Error: Debes indicar el archivo a compilar.")
-            print("Uso correcto: python main.py <archivo.src>")
+            print("Uso correcto: python main.py <archivo.src> [--optimizar-tac] [--perfil]")
             print("\nEjemplo: python main.py prueba.src")
 
 except ImportError as e:
@@ -1,5 +1,6 @@
 import importlib.util
 import os
+from collections import deque
 
 # ===============================================================
 # IMPORTAR TU ANALIZADOR LÉXICO
@@ -23,57 +24,64 @@ def importar_lexer(path=LEXER_PATH):
 lexer_module = importar_lexer()
 if lexer_module:
     analizar = lexer_module.analizar
+    iter_tokens = lexer_module.iter_tokens
+    tokenizar = lexer_module.tokenizar
 else:
     # Fallback si no se puede importar
     def analizar(codigo):
         return [('ERROR', 'Lexer no disponible')]
 
+    def iter_tokens(codigo):
+        return iter(analizar(codigo))
+
+    tokenizar = analizar
+
 # ===============================================================
 # IMPORTAR TU AST Y ANALIZADOR SEMÁNTICO
 # ===============================================================
 
-try:
-    from analizador_semantico import (
-        Block, VarDecl, Assign, BinOp, Identifier, Num, String
-    )
-except ImportError:
-    print("Error: No se pudo importar analizador_semantico")
-    # Definir clases básicas como fallback
-    class Node: pass
-    class Block(Node):
-        def __init__(self, children): self.children = children
-    class VarDecl(Node):
-        def __init__(self, var_type, var_name): 
-            self.var_type = var_type; self.var_name = var_name
-    class Assign(Node):
-        def __init__(self, target, value): 
-            self.target = target; self.value = value
-    class BinOp(Node):
-        def __init__(self, left, op, right): 
-            self.left = left; self.op = op; self.right = right
-    class Identifier(Node):
-        def __init__(self, name): self.name = name
-    class Num(Node):
-        def __init__(self, value): self.value = value
-    class String(Node):
-        def __init__(self, value): self.value = value
+# Las clases del AST viven en un solo lugar (analizador_semantico).
+# El parser construye los nodos a través de 'nodos', así puede producir
+# el AST normal o la representación compacta de ast_arena.ASTArena.
+import analizador_semantico as nodos_ast
 
 # ===============================================================
 # TOKEN STREAM
 # ===============================================================
 
 class TokenStream:
+    """
+    Flujo de tokens con lookahead acotado.
+    Acepta una lista o cualquier iterable (por ejemplo el generador
+    iter_tokens del lexer) y solo guarda en memoria los tokens que
+    el parser todavía no ha consumido.
+    """
+
+    EOF = ('EOF', 'End-Of-File')
+
     def __init__(self, tokens):
-        self.tokens = tokens
+        self._tokens = iter(tokens)
+        self._buffer = deque()
         self.pos = 0
 
-    def peek(self):
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return ('EOF', 'End-Of-File')
+    def _llenar(self, k):
+        """Asegura que haya al menos k+1 tokens en el buffer"""
+        while len(self._buffer) <= k:
+            tok = next(self._tokens, None)
+            if tok is None:
+                return False
+            self._buffer.append(tok)
+        return True
+
+    def peek(self, k=0):
+        if len(self._buffer) > k or self._llenar(k):
+            return self._buffer[k]
+        return self.EOF
 
     def next(self):
         tok = self.peek()
+        if self._buffer:
+            self._buffer.popleft()
         self.pos += 1
         return tok
 
@@ -94,13 +102,93 @@ class TokenStream:
             return self.next()
         return None
 
+    def peek_tipo(self):
+        return self.peek()[0]
+
+    def peek_lexema(self):
+        return self.peek()[1]
+
+    def avanzar(self):
+        """Consume el token actual sin construir la tupla"""
+        self.next()
+
+
+class BufferTokenStream(TokenStream):
+    """
+    Flujo de tokens que lee directamente de un TokenBuffer.
+    No crea tuplas intermedias salvo cuando el parser pide el lexema,
+    y los errores incluyen línea y columna.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.tipos = buffer.tipos
+        self.nombres = lexer_module.TOKEN_NAMES
+        self.pos = 0
+        # El último token del buffer siempre es EOF
+        self.ultimo = len(buffer) - 1
+
+    def peek_tipo(self):
+        return self.nombres[self.tipos[min(self.pos, self.ultimo)]]
+
+    def peek_lexema(self):
+        return self.buffer.lexema(min(self.pos, self.ultimo))
+
+    def avanzar(self):
+        self.pos += 1
+
+    def peek(self, k=0):
+        return self.buffer[min(self.pos + k, self.ultimo)]
+
+    def next(self):
+        tok = self.peek()
+        self.pos += 1
+        return tok
+
+    def ubicacion(self):
+        linea, columna = self.buffer.posicion(min(self.pos, self.ultimo))
+        return f"línea {linea}, columna {columna}"
+
+    def expect(self, tipo, lexema=None):
+        t = self.peek_tipo()
+
+        if t != tipo:
+            l = self.buffer.lexema(min(self.pos, self.ultimo))
+            raise Exception(f"Error sintáctico: se esperaba token '{tipo}', llegó '{t}' ({l}) "
+                            f"en {self.ubicacion()}")
+
+        if lexema is not None:
+            l = self.buffer.lexema(self.pos)
+            if l != lexema:
+                raise Exception(f"Error sintáctico: se esperaba lexema '{lexema}', llegó '{l}' "
+                                f"en {self.ubicacion()}")
+
+        return self.next()
+
+    def accept(self, tipo, lexema=None):
+        if self.peek_tipo() != tipo:
+            return None
+        if lexema is not None and self.buffer.lexema(self.pos) != lexema:
+            return None
+        return self.next()
+
+
+def crear_token_stream(tokens):
+    """Elige el flujo adecuado según el tipo de entrada"""
+    # Se compara por interfaz: el lexer puede venir de una carga dinámica
+    # (importar_lexer) y su clase TokenBuffer no ser la misma.
+    if hasattr(tokens, 'tipos') and hasattr(tokens, 'posicion'):
+        return BufferTokenStream(tokens)
+    return TokenStream(tokens)
+
 # ===============================================================
 # PARSER PRINCIPAL (DESCENSO RECURSIVO)
 # ===============================================================
 
 class Parser:
-    def __init__(self, tokens):
-        self.ts = TokenStream(tokens)
+    def __init__(self, tokens, nodos=nodos_ast):
+        self.ts = crear_token_stream(tokens)
+        self.nodos = nodos
 
     def parse(self):
         """
@@ -123,13 +211,13 @@ class Parser:
         if self.ts.accept('LLAVE_IZQ'):
             while not self.ts.accept('LLAVE_DER'):
                 children.append(self.parse_statement())
-            return Block(children)
+            return self.nodos.Block(children)
 
         # Caso: bloque sin llaves (nivel raíz)
-        while self.ts.peek()[0] != 'EOF' and self.ts.peek()[0] != 'LLAVE_DER':
+        while self.ts.peek_tipo() != 'EOF' and self.ts.peek_tipo() != 'LLAVE_DER':
             children.append(self.parse_statement())
 
-        return Block(children)
+        return self.nodos.Block(children)
 
     # -----------------------------------------------------------
     # SENTENCIAS
@@ -154,14 +242,21 @@ class Parser:
         
         # 6. Manejar la parte ELSE (opcional)
         else_block = None
-        if self.ts.peek()[0] == 'PALABRA_RESERVADA' and self.ts.peek()[1] == 'else':
-            self.ts.next() # Consumir 'else'
-            
+        if self.ts.accept('PALABRA_RESERVADA', 'else'):
             # Parsear el BLOQUE 'ELSE'
             else_block = self.parse_block() 
             
-        return IfStatement(condition, then_block, else_block)
+        return self.nodos.IfStatement(condition, then_block, else_block)
     
+    def parse_while(self):
+        # while ( CONDICIÓN ) { CUERPO }
+        self.ts.expect('PALABRA_RESERVADA', 'while')
+        self.ts.expect('PARENTESIS_IZQ', '(')
+        condition = self.parse_expr()
+        self.ts.expect('PARENTESIS_DER', ')')
+        body = self.parse_block()
+        return self.nodos.WhileStatement(condition, body)
+
     def parse_statement(self):
         
         tipo, lex = self.ts.peek()
@@ -177,15 +272,20 @@ class Parser:
         if tipo == 'PALABRA_RESERVADA' and lex == 'print':
             self.ts.next()  # Consumir 'print'
             self.ts.expect('PARENTESIS_IZQ', '(')
-        # NUEVO: Manejo de IF
-        if tipo == 'PALABRA_RESERVADA' and lex == 'if':
-            return self.parse_if() # Llamar a la nueva función
             
             # Parseamos lo que hay adentro (puede ser variable, string o suma)
             expr = self.parse_expr()
             self.ts.expect('PARENTESIS_DER', ')')
             self.ts.expect('PUNTO_Y_COMA', ';')
-            return Print(expr) # Retornamos el nuevo nodo
+            return self.nodos.Print(expr) # Retornamos el nuevo nodo
+
+        # NUEVO: Manejo de IF
+        if tipo == 'PALABRA_RESERVADA' and lex == 'if':
+            return self.parse_if() # Llamar a la nueva función
+
+        if tipo == 'PALABRA_RESERVADA' and lex == 'while':
+            return self.parse_while()
+            
         raise Exception(f"Error sintáctico: sentencia no reconocida '{tipo}' '{lex}'")
     
 
@@ -219,8 +319,8 @@ class Parser:
         # VarDecl(tipo, nombre)
         # Assign(nombre, valor)
         #
-        asignacion = Assign(Identifier(var_name), value)
-        return Block([VarDecl(var_type, var_name), asignacion])
+        asignacion = self.nodos.Assign(self.nodos.Identifier(var_name), value)
+        return self.nodos.Block([self.nodos.VarDecl(var_type, var_name), asignacion])
 
     def parse_assign(self):
         """
@@ -234,95 +334,119 @@ class Parser:
 
         self.ts.expect('PUNTO_Y_COMA')
 
-        return Assign(Identifier(name), value)
+        return self.nodos.Assign(self.nodos.Identifier(name), value)
 
     # -----------------------------------------------------------
     # EXPRESIONES
     # -----------------------------------------------------------
 
-    # 1. Este es el nuevo nivel superior de expresión
-    def parse_expr(self):
-        return self.parse_logic_and()
+    # Precedencia de operadores binarios (todos asociativos a izquierda):
+    #   &&  <  comparadores  <  + -  <  * /
+    # Equivale a la gramática
+    #   expr    -> compare { '&&' compare }
+    #   compare -> add { COMPARADOR add }
+    #   add     -> factor { ('+' | '-') factor }
+    #   factor  -> term { ('*' | '/') term }
+    PRECEDENCIA = {
+        ('OP_LOGICO', '&&'): 1,
+        ('COMPARADOR', '=='): 2, ('COMPARADOR', '!='): 2,
+        ('COMPARADOR', '<'): 2, ('COMPARADOR', '>'): 2,
+        ('COMPARADOR', '<='): 2, ('COMPARADOR', '>='): 2,
+        ('OPERADOR_ARIT', '+'): 3, ('OPERADOR_ARIT', '-'): 3,
+        ('OPERADOR_ARIT', '*'): 4, ('OPERADOR_ARIT', '/'): 4,
+    }
 
-    # 2. Nueva función para manejar el AND
-    def parse_logic_and(self):
-        # Primero intentamos parsear comparaciones (ej: x > 5)
-        node = self.parse_compare()
-        
-        while True:
-            t, lex = self.ts.peek()
-            if t == 'OP_LOGICO' and lex == '&&':
-                self.ts.next() # Consumir &&
-                right = self.parse_compare()
-                node = BinOp(node, '&&', right)
-            else:
-                break
-        return node
-
-    # 3. Tu función existente de comparaciones (asegúrate que llame a parse_add al final)
-    def parse_compare(self):
-        node = self.parse_add() # Llama a la aritmética (sumas/restas)
-        # ... lógica de > < >= <= ...
-        # (Aquí va tu lógica existente de comparadores)
-        return node
-    def parse_factor(self):
+    def parse_expr(self):
         """
-        factor -> term { ('*' | '/') term }
+        Expresiones por precedencia de operadores (shunting-yard).
+        Es iterativo: usa pilas explícitas en vez de una llamada recursiva
+        por nivel, así que paréntesis anidados o cadenas 'a + b + c + ...'
+        de cualquier longitud no agotan el límite de recursión de Python.
         """
-        node = self.parse_term()
+        ts = self.ts
+        nodos = self.nodos
+        precedencia = self.PRECEDENCIA
+        operandos = []
+        operadores = []   # (lexema, precedencia) o None para '('
+        abiertos = 0
+
+        def reducir():
+            op = operadores.pop()[0]
+            right = operandos.pop()
+            operandos[-1] = nodos.BinOp(operandos[-1], op, right)
+
+        peek_tipo = ts.peek_tipo
+        peek_lexema = ts.peek_lexema
+        avanzar = ts.avanzar
 
         while True:
-            t, l = self.ts.peek()
-            if t == 'OPERADOR_ARIT' and (l == '*' or l == '/'):
-                self.ts.next()
-                right = self.parse_term()
-                node = BinOp(node, l, right)
+            # Se espera un operando: '(' o un término
+            t = peek_tipo()
+            while t == 'PARENTESIS_IZQ':
+                avanzar()
+                operadores.append(None)
+                abiertos += 1
+                t = peek_tipo()
+
+            if t == 'IDENTIFICADOR':
+                operandos.append(nodos.Identifier(peek_lexema()))
+                avanzar()
             else:
+                operandos.append(self.parse_term())
+
+            # Se espera un operador binario o ')'
+            t = peek_tipo()
+            while t == 'PARENTESIS_DER' and abiertos:
+                avanzar()
+                while operadores[-1] is not None:
+                    reducir()
+                operadores.pop()
+                abiertos -= 1
+                t = peek_tipo()
+
+            prec = None
+            if t == 'OPERADOR_ARIT' or t == 'COMPARADOR' or t == 'OP_LOGICO':
+                l = peek_lexema()
+                prec = precedencia.get((t, l))
+            if prec is None:
                 break
-        return node
-    def parse_add(self):
-        """
-        expr -> factor { ('+' | '-') factor }
-        """
-        # Antes llamabas a parse_term, ahora llamas a parse_factor
-        node = self.parse_factor() 
 
-        while True:
-            t, l = self.ts.peek()
-            if t == 'OPERADOR_ARIT' and (l == '+' or l == '-'):
-                self.ts.next()
-                # Antes llamabas a parse_term, ahora llamas a parse_factor
-                right = self.parse_factor() 
-                node = BinOp(node, l, right)
-            else:
-                break
+            while operadores and operadores[-1] is not None and operadores[-1][1] >= prec:
+                reducir()
+            operadores.append((l, prec))
+            avanzar()
+
+        if abiertos:
+            # Falta un ')': mismo error que el descenso recursivo
+            ts.expect('PARENTESIS_DER', ')')
 
-        return node
+        while operadores:
+            reducir()
+        return operandos[0]
 
     def parse_term(self):
         """
-        term -> NUMBER | IDENT | '(' expr ')'
+        term -> NUMBER | STRING | BOOL | IDENT
+        (los paréntesis los maneja parse_expr)
         """
         t, l = self.ts.peek()
 
         if t == 'NUMERO_ENTERO':
             self.ts.next()
-            return Num(int(l))
+            return self.nodos.Num(int(l))
         if t == 'STRING':
             self.ts.next()
             # El lexema (l) ya incluye las comillas. 
             # Guardamos el string completo.
-            return String(l) # Retorna un nodo String
+            return self.nodos.String(l) # Retorna un nodo String
 
-        if t == 'IDENTIFICADOR':
+        if t == 'BOOLEANO':
             self.ts.next()
-            return Identifier(l)
+            return self.nodos.Bool(l == 'true')
 
-        if t == 'PARENTESIS_IZQ':
+        if t == 'IDENTIFICADOR':
             self.ts.next()
-            expr = self.parse_expr()
-            self.ts.expect('PARENTESIS_DER', ')')
-            return expr
+            return self.nodos.Identifier(l)
 
         raise Exception(f"Error sintáctico: expresión inválida '{t}' '{l}'")
 
@@ -331,7 +455,9 @@ class Parser:
 # ===============================================================
 
 def parse_source(source_code):
-    tokens = analizar(source_code)
+    # Buffer compacto por columnas (tipos + offsets), con posiciones para errores.
+    # Para consumo perezoso sin buffer: Parser(iter_tokens(source_code))
+    tokens = tokenizar(source_code)
     parser = Parser(tokens)
     return parser.parse()
 
@@ -1,73 +1,124 @@
-from flask import Flask, render_template, request, jsonify
-import sys
+from flask import Flask, Response, render_template, request, jsonify
+import atexit
+import json
 import os
-import io
-from contextlib import redirect_stdout
+import queue
+import sys
+import threading
 
 # --- IMPORTAMOS TUS MÓDULOS ---
 # Nos aseguramos de que Python encuentre los archivos
 sys.path.append(os.path.dirname(__file__))
 
 try:
-    from Analizador_lexico import analizar
-    from parser import parse_source
-    from analizador_semantico import SemanticAnalyzer
-    from tac_generator import TACGenerator
-    from tac_interpreter import TACInterpreter
+    from compile_api import compilar
+    from compile_pool import ExecutionPool, PoolLleno
 except ImportError as e:
     print(f"Error importando módulos: {e}")
 
 app = Flask(__name__)
 
+# --- POOL DE EJECUCIÓN ---
+# Configurable con variables de entorno. COMPILADOR_PROCESOS=0 ejecuta en el
+# hilo de la petición (sin procesos, por ejemplo en entornos serverless);
+# ahí solo rige el límite de instrucciones.
+PROCESOS = int(os.environ.get('COMPILADOR_PROCESOS', os.cpu_count() or 1))
+COLA = int(os.environ.get('COMPILADOR_COLA', PROCESOS * 4))
+LIMITE_CPU = float(os.environ.get('COMPILADOR_LIMITE_CPU', 2.0))
+LIMITE_INSTRUCCIONES = int(os.environ.get('COMPILADOR_LIMITE_INSTRUCCIONES', 5_000_000))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def pool_ejecucion():
+    """
+    El pool se crea con la primera petición y no al importar el módulo:
+    los procesos hijos (spawn) vuelven a importar este archivo.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExecutionPool(PROCESOS, COLA, LIMITE_CPU, LIMITE_INSTRUCCIONES)
+            atexit.register(_pool.cerrar)
+        return _pool
+
 # --- LÓGICA DE COMPILACIÓN ADAPTADA PARA WEB ---
-def ejecutar_compilador(codigo_fuente):
-    # Creamos un buffer para capturar los print()
-    buffer = io.StringIO()
-    
-    # Todo lo que ocurra dentro del 'with' se guardará en 'buffer' en vez de salir a consola
-    with redirect_stdout(buffer):
-        print("=== INICIANDO COMPILACIÓN WEB ===\n")
-        try:
-            # 1. Léxico
-            print("1. 📝 ANÁLISIS LÉXICO")
-            tokens = analizar(codigo_fuente)
-            print(f"✅ Tokens generados: {len(tokens)}")
-            
-            # 2. Sintáctico
-            print("\n2. 📐 ANÁLISIS SINTÁCTICO")
-            ast = parse_source(codigo_fuente)
-            print("✅ AST generado exitosamente")
-            
-            # 3. Semántico
-            print("\n3. 🎯 ANÁLISIS SEMÁNTICO")
-            analyzer = SemanticAnalyzer()
-            analyzer.visit(ast)
-            print("✅ Análisis semántico completado")
-            
-            # 4. TAC y Ejecución
-            print("\n4. ⚡ GENERACIÓN TAC Y EJECUCIÓN")
-            tac_gen = TACGenerator()
-            tac_code = tac_gen.generate(ast)
-            
-            interpreter = TACInterpreter()
-            resultado = interpreter.execute(tac_code)
-            
-            print("\n[ CÓDIGO INTERMEDIO GENERADO ]")
-            print(tac_code)
-            
-            print("\n[ MEMORIA FINAL ]")
-            for k, v in resultado.items():
-                if "temp_" not in k: # Tu filtro de temporales
-                    print(f"   - {k} = {v}")
-                    
-        except Exception as e:
-            print(f"\n❌ ERROR CRÍTICO: {str(e)}")
-            # Opcional: imprimir traceback si quieres debuggear en web
-            # import traceback
-            # traceback.print_exc()
-
-    # Devolvemos todo el texto capturado
-    return buffer.getvalue()
+def ejecutar_compilador(codigo_fuente, mostrar_tac=False, perfilar=False):
+    """
+    Compila y ejecuta el código en un proceso del pool y devuelve el
+    ResultadoCompilacion como dict (compile_api). Lanza PoolLleno si ya
+    hay demasiados trabajos en espera.
+    Si se pide ver el TAC, se ejecuta con el intérprete TAC; si no, el AST
+    se ejecuta compilado a clausuras. Cada proceso guarda sus compilaciones
+    en su caché: un programa que ya se envió antes solo se ejecuta.
+    Con 'perfilar', el resultado trae el perfil por fases (compile_profile).
+    """
+    nivel = 'interprete' if mostrar_tac else 'clausuras'
+    if PROCESOS <= 0:
+        return compilar(codigo_fuente, nivel=nivel, limite_instrucciones=LIMITE_INSTRUCCIONES,
+                        perfilar=perfilar).a_dict()
+    return pool_ejecucion().ejecutar(codigo_fuente, nivel, perfilar)
+
+def transmitir_compilador(codigo_fuente, mostrar_tac=False, perfilar=False):
+    """
+    Como ejecutar_compilador, pero devuelve un iterador de los eventos de
+    compile_api (fases, tandas de salida y el resultado final) a medida que
+    ocurren. Tiene close() para abandonarlo si el cliente se desconecta.
+    """
+    nivel = 'interprete' if mostrar_tac else 'clausuras'
+    if PROCESOS <= 0:
+        return transmitir_en_hilo(codigo_fuente, nivel, perfilar)
+    return pool_ejecucion().transmitir(codigo_fuente, nivel, perfilar)
+
+def transmitir_en_hilo(codigo_fuente, nivel, perfilar=False):
+    """Sin pool: compila en un hilo aparte y pasa sus eventos por una cola"""
+    eventos = queue.Queue()
+    hilo = threading.Thread(target=compilar, args=(codigo_fuente,),
+                            kwargs={'nivel': nivel, 'limite_instrucciones': LIMITE_INSTRUCCIONES,
+                                    'eventos': eventos.put, 'perfilar': perfilar},
+                            daemon=True)
+    hilo.start()
+    while True:
+        evento = eventos.get()
+        yield evento
+        if evento['evento'] == 'fin':
+            return
+
+def formatear_salida(resultado, mostrar_tac=False):
+    """Texto para el panel de salida de la página, armado a partir del resultado"""
+    lineas = ["=== INICIANDO COMPILACIÓN WEB ===", ""]
+    if resultado['cache']:
+        lineas.append("♻️  Compilación encontrada en caché")
+    for diagnostico in resultado['diagnosticos']:
+        lineas.append(f"❌ {diagnostico}")
+    if resultado['tokens']:
+        lineas.append(f"✅ Tokens generados: {resultado['tokens']}")
+        lineas.append("✅ AST generado y verificado")
+    if mostrar_tac and resultado['tac']:
+        lineas += ["", "[ CÓDIGO INTERMEDIO GENERADO ]", resultado['tac']]
+    if resultado['salida']:
+        lineas += ["", "[ SALIDA ]"]
+        lineas += [f">> OUT: {linea}" for linea in resultado['salida']]
+    if resultado['ok']:
+        lineas += ["", "[ MEMORIA FINAL ]"]
+        lineas += [f"   - {k} = {v}" for k, v in resultado['memoria'].items()]
+    if resultado.get('perfil'):
+        lineas += ["", "[ PERFIL ]"] + formatear_perfil(resultado['perfil'])
+    return "\n".join(lineas) + "\n"
+
+def formatear_perfil(perfil):
+    """Una línea por fase del perfil (ver compile_profile)"""
+    lineas = []
+    for fase in perfil['fases']:
+        linea = f"   {fase['fase']:<15} {fase['ms']:>9.3f} ms"
+        if fase['pico_kb'] is not None:
+            linea += f"  {fase['pico_kb']:>9.1f} KB"
+        for nombre in ('tokens', 'nodos', 'instrucciones', 'cota_ejecutadas', 'costo_ciclos'):
+            if nombre in fase:
+                linea += f"  {fase[nombre]} {nombre} ({fase.get(f'{nombre}_por_s', 0):,.0f}/s)"
+        lineas.append(linea)
+    lineas.append(f"   {'Total':<15} {perfil['total_ms']:>9.3f} ms")
+    return lineas
 
 # --- RUTAS DE FLASK ---
 
@@ -81,10 +132,51 @@ def compile_code():
     codigo = data.get('code', '')
     
     if not codigo:
-        return jsonify({'output': "⚠️ No enviaste código."})
+        return jsonify({'ok': False, 'diagnosticos': ["No enviaste código."],
+                        'output': "⚠️ No enviaste código."})
+    
+    mostrar_tac = bool(data.get('tac', False))
+    try:
+        respuesta = ejecutar_compilador(codigo, mostrar_tac=mostrar_tac,
+                                        perfilar=bool(data.get('perfil', False)))
+    except PoolLleno as e:
+        # Contrapresión: el cliente debe reintentar más tarde
+        return jsonify({'ok': False, 'diagnosticos': [str(e)], 'output': f"⚠️ {e}"}), 429, \
+            {'Retry-After': '1'}
+    # El resultado estructurado, más el texto ya formateado para la página
+    respuesta['output'] = formatear_salida(respuesta, mostrar_tac)
+    return jsonify(respuesta)
+
+@app.route('/compile/stream', methods=['POST'])
+def compile_stream():
+    """
+    Versión en vivo de /compile: responde NDJSON (un evento JSON por línea)
+    y envía cada fase apenas termina y la salida del programa mientras se
+    ejecuta, en vez de esperar al resultado completo.
+    """
+    data = request.json
+    codigo = data.get('code', '')
+    
+    if not codigo:
+        return jsonify({'ok': False, 'diagnosticos': ["No enviaste código."],
+                        'output': "⚠️ No enviaste código."})
+    
+    try:
+        eventos = transmitir_compilador(codigo, mostrar_tac=bool(data.get('tac', False)),
+                                        perfilar=bool(data.get('perfil', False)))
+    except PoolLleno as e:
+        return jsonify({'ok': False, 'diagnosticos': [str(e)], 'output': f"⚠️ {e}"}), 429, \
+            {'Retry-After': '1'}
+    
+    def lineas():
+        for evento in eventos:
+            yield json.dumps(evento, ensure_ascii=False, default=str) + "\n"
     
-    resultado_texto = ejecutar_compilador(codigo)
-    return jsonify({'output': resultado_texto})
+    respuesta = Response(lineas(), mimetype='application/x-ndjson',
+                         headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Si el cliente se va (o nunca se empieza a leer), se libera el trabajo
+    respuesta.call_on_close(eventos.close)
+    return respuesta
 
 # Necesario para Vercel
 if __name__ == '__main__':
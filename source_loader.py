@@ -0,0 +1,49 @@
+import mmap
+
+from Analizador_lexico import tokenizar
+
+
+class SourceFile:
+    """
+    Archivo fuente (.src) mapeado en memoria.
+    El contenido se expone como 'datos' (un objeto mmap de solo lectura)
+    que el lexer escanea directamente, sin leer el archivo a un str.
+    Se usa como context manager: el mapeo se libera al salir del 'with',
+    por lo que los tokens deben consumirse dentro del bloque.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._archivo = open(path, 'rb')
+        try:
+            self.datos = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Un archivo vacío no se puede mapear
+            self.datos = b''
+
+    def __len__(self):
+        return len(self.datos)
+
+    def texto(self):
+        """Contenido decodificado como str (solo para mostrarlo)"""
+        return self.datos[:].decode('utf-8', errors='replace')
+
+    def tokenizar(self):
+        """Análisis léxico directo sobre los bytes mapeados"""
+        return tokenizar(self.datos)
+
+    def close(self):
+        if isinstance(self.datos, mmap.mmap):
+            self.datos.close()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def abrir_fuente(path):
+    """Abre y mapea en memoria un archivo fuente"""
+    return SourceFile(path)
@@ -1,4 +1,4 @@
-from analizador_semantico import NodeVisitor
+from analizador_semantico import NodeVisitor, es_binop
 
 class TACGenerator(NodeVisitor):
     def __init__(self):
@@ -29,11 +29,24 @@ class TACGenerator(NodeVisitor):
         self.emit(f"{node.target.name} = {value_temp}")
 
     def visit_BinOp(self, node):
-        left_temp = self.visit(node.left)
-        right_temp = self.visit(node.right)
-        result_temp = self.new_temp()
-        self.emit(f"{result_temp} = {left_temp} {node.op} {right_temp}")
-        return result_temp
+        # Post-orden con pila explícita: soporta expresiones muy profundas
+        resultados = []
+        pila = [(node, False)]
+        while pila:
+            actual, listo = pila.pop()
+            if listo:
+                right_temp = resultados.pop()
+                left_temp = resultados.pop()
+                result_temp = self.new_temp()
+                self.emit(f"{result_temp} = {left_temp} {actual.op} {right_temp}")
+                resultados.append(result_temp)
+            elif es_binop(actual):
+                pila.append((actual, True))
+                pila.append((actual.right, False))
+                pila.append((actual.left, False))
+            else:
+                resultados.append(self.visit(actual))
+        return resultados[0]
 
     def visit_Identifier(self, node):
         return node.name
@@ -0,0 +1,454 @@
+import operator
+import re
+
+# ===============================================================
+# ENSAMBLADOR TAC
+# ===============================================================
+#
+# Convierte el texto TAC producido por TACGenerator en una lista de
+# instrucciones ya decodificadas, para que el intérprete no tenga que
+# partir cadenas ni clasificar operandos en cada paso de ejecución.
+#
+# Se hace en dos pasos:
+#
+# 1. decodificar(): cada línea pasa a una tupla simbólica
+#    (opcode, destino, a, b, operador):
+#      OP_COPIA        destino = a
+#      OP_BINARIA      destino = a <operador> b
+#      OP_PRINT        print a
+#      OP_SALTO        goto destino
+#      OP_SALTO_FALSO  ifFalse a goto destino
+#      OP_ETIQUETA     destino:
+#    Los operandos a/b son (ES_CONSTANTE, valor) con el literal ya
+#    convertido, o (ES_VARIABLE, nombre). En los saltos, destino es el
+#    nombre de la etiqueta.
+#
+# 2. resolver(): asigna a cada variable, temporal y constante un slot
+#    (índice entero) de un banco de registros. Las instrucciones del
+#    Programa final solo contienen enteros: el intérprete lee y escribe
+#    una lista preasignada, sin hashing de nombres en el bucle principal.
+#    Las constantes ocupan slots precargados con su valor.
+#    Las etiquetas desaparecen: se resuelven una sola vez a índices de
+#    instrucción (tabla de saltos), así un salto cuesta O(1) al ejecutar.
+#
+# Entre ambos pasos, fusionar_saltos() prepara los ciclos: une cada
+# comparación con el ifFalse que la consume (OP_SALTO_SI_NO) y rota el
+# salto de vuelta de los while para que sea un salto condicional directo
+# al cuerpo (OP_SALTO_SI), sin pasar otra vez por la cabecera:
+#      OP_SALTO_SI_NO  if not (a <operador> b) goto destino
+#      OP_SALTO_SI     if a <operador> b goto destino
+#
+# Después, reutilizar_temporales() renombra los temporales con un barrido
+# lineal sobre sus intervalos de vida: dos temporales que nunca están vivos
+# a la vez comparten nombre, y por lo tanto slot. La cantidad de slots de
+# temporales queda acotada por la profundidad de las expresiones y no por
+# el tamaño del programa.
+
+(OP_COPIA, OP_BINARIA, OP_PRINT, OP_SALTO, OP_SALTO_FALSO, OP_ETIQUETA,
+ OP_SALTO_SI_NO, OP_SALTO_SI) = range(8)
+NOMBRES_OPCODES = ('COPIA', 'BINARIA', 'PRINT', 'SALTO', 'SALTO_F', 'ETIQUETA',
+                   'SALTO_SI_NO', 'SALTO_SI')
+
+ES_VARIABLE, ES_CONSTANTE = False, True
+
+# Un operando TAC: una cadena entre comillas (puede tener espacios) o una palabra
+OPERANDO_TAC = re.compile(r'"[^"]*"|\S+')
+
+# Nombres de los temporales que genera TACGenerator.new_temp(). El '%' no
+# puede aparecer en un identificador del lenguaje, así que una variable del
+# usuario (por ejemplo 'temp_1') nunca se confunde con un temporal.
+PREFIJO_TEMPORAL = '%t'
+TEMPORAL = re.compile(r'%t\d+')
+
+
+def nombre_temporal(numero):
+    return f"{PREFIJO_TEMPORAL}{numero}"
+
+
+def es_temporal(nombre):
+    return TEMPORAL.fullmatch(nombre) is not None
+
+
+def operador_division(left, right):
+    if right == 0:
+        raise Exception("Error de Ejecución: División por cero.")
+    return left // right  # División entera
+
+
+class LimiteExcedido(Exception):
+    """El programa superó el límite de instrucciones o de tiempo de CPU"""
+
+
+def operador_and(left, right):
+    return bool(left and right)
+
+
+def operador_desconocido(left, right):
+    return None
+
+
+OPERADORES = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operador_division,
+    '&&': operador_and,
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# Salida de 'print' en todos los niveles de ejecución (intérprete, Python,
+# clausuras). Se puede reemplazar por cualquier función que reciba el valor.
+PREFIJO_SALIDA = ">> OUT: "
+
+
+def imprimir_salida(valor):
+    print(f"{PREFIJO_SALIDA}{valor}")
+
+
+# Literales booleanos del TAC
+BOOLEANOS = {'true': True, 'false': False}
+
+# Función del operador -> su símbolo en el TAC (para codificar())
+SIMBOLOS = {funcion: simbolo for simbolo, funcion in OPERADORES.items()}
+
+
+class Programa:
+    """
+    Programa TAC ensamblado.
+      instrucciones:       tuplas (opcode, destino, a, b, operador) con slots enteros
+      valores_iniciales:   contenido inicial del banco de registros
+                           (0 para variables y temporales, el valor para constantes)
+      variables:           nombre -> slot de las variables del usuario, en el orden
+                           en que se asignan por primera vez (volcado de memoria)
+      temporales:          nombre -> slot de los temporales
+    """
+
+    def __init__(self, instrucciones, valores_iniciales, variables, temporales):
+        self.instrucciones = instrucciones
+        self.valores_iniciales = valores_iniciales
+        self.variables = variables
+        self.temporales = temporales
+
+    def __len__(self):
+        return len(self.instrucciones)
+
+    def memoria(self, registros):
+        """Volcado nombre -> valor de las variables del usuario"""
+        return {nombre: registros[slot] for nombre, slot in self.variables.items()}
+
+
+def decodificar_operando(texto):
+    """Convierte un operando TAC a (ES_CONSTANTE, valor) o (ES_VARIABLE, nombre)"""
+    # Si es un número
+    if texto.isdigit() or (texto[0] == '-' and texto[1:].isdigit()):
+        return (ES_CONSTANTE, int(texto))
+
+    # Si es un string entre comillas
+    if len(texto) >= 2 and texto.startswith('"') and texto.endswith('"'):
+        return (ES_CONSTANTE, texto[1:-1])
+
+    if texto in BOOLEANOS:
+        return (ES_CONSTANTE, BOOLEANOS[texto])
+
+    return (ES_VARIABLE, texto)
+
+
+def decodificar_linea(linea, operandos=None):
+    """
+    Decodifica una línea TAC. Devuelve la instrucción o None si la línea
+    está vacía o no es una instrucción reconocida.
+    'operandos' es un dict opcional para reutilizar operandos ya decodificados.
+    """
+    if operandos is None:
+        operandos = {}
+
+    # Solo las líneas con cadenas necesitan la expresión regular
+    partes = OPERANDO_TAC.findall(linea) if '"' in linea else linea.split()
+    n = len(partes)
+
+    if n == 3 and partes[1] == '=':
+        # Asignación simple: x = y
+        a = operandos.get(partes[2]) or operandos.setdefault(partes[2], decodificar_operando(partes[2]))
+        return (OP_COPIA, partes[0], a, None, None)
+
+    if n == 5 and partes[1] == '=':
+        # Operación binaria: t1 = a + b
+        a = operandos.get(partes[2]) or operandos.setdefault(partes[2], decodificar_operando(partes[2]))
+        b = operandos.get(partes[4]) or operandos.setdefault(partes[4], decodificar_operando(partes[4]))
+        return (OP_BINARIA, partes[0], a, b, OPERADORES.get(partes[3], operador_desconocido))
+
+    if n == 2 and partes[0] == 'print':
+        a = operandos.get(partes[1]) or operandos.setdefault(partes[1], decodificar_operando(partes[1]))
+        return (OP_PRINT, None, a, None, None)
+
+    if n == 4 and partes[0] == 'ifFalse' and partes[2] == 'goto':
+        a = operandos.get(partes[1]) or operandos.setdefault(partes[1], decodificar_operando(partes[1]))
+        return (OP_SALTO_FALSO, partes[3], a, None, None)
+
+    if n == 2 and partes[0] == 'goto':
+        return (OP_SALTO, partes[1], None, None, None)
+
+    if n == 1 and partes[0].endswith(':'):
+        return (OP_ETIQUETA, partes[0][:-1], None, None, None)
+
+    return None
+
+
+def decodificar(tac_code):
+    """Decodifica el texto TAC completo en instrucciones simbólicas"""
+    operandos = {}
+    instrucciones = [decodificar_linea(linea, operandos) for linea in tac_code.split('\n')]
+    return [i for i in instrucciones if i is not None]
+
+
+def codificar_operando(operando):
+    """Inverso de decodificar_operando"""
+    es_constante, valor = operando
+    if not es_constante:
+        return valor
+    if isinstance(valor, bool):
+        return 'true' if valor else 'false'
+    if isinstance(valor, str):
+        return f'"{valor}"'
+    return str(valor)
+
+
+def codificar(simbolicas):
+    """Texto TAC de una lista de instrucciones simbólicas (inverso de decodificar)"""
+    lineas = []
+    for op, destino, a, b, operador in simbolicas:
+        if op == OP_COPIA:
+            lineas.append(f"{destino} = {codificar_operando(a)}")
+        elif op == OP_BINARIA:
+            lineas.append(f"{destino} = {codificar_operando(a)} "
+                          f"{SIMBOLOS.get(operador, '?')} {codificar_operando(b)}")
+        elif op == OP_PRINT:
+            lineas.append(f"print {codificar_operando(a)}")
+        elif op == OP_SALTO_FALSO:
+            lineas.append(f"ifFalse {codificar_operando(a)} goto {destino}")
+        elif op == OP_SALTO:
+            lineas.append(f"goto {destino}")
+        elif op == OP_ETIQUETA:
+            lineas.append(f"{destino}:")
+    return "\n".join(lineas)
+
+
+def fusionar_saltos(simbolicas):
+    """
+    Optimiza el control de flujo de las instrucciones simbólicas:
+      1. 't = a op b' seguido de 'ifFalse t goto L', si t es un temporal que
+         solo se lee ahí, pasa a ser una sola instrucción OP_SALTO_SI_NO.
+      2. Un 'goto L_inicio' hacia atrás, cuya cabecera es un único
+         OP_SALTO_SI_NO hacia la etiqueta que sigue al goto (la forma de un
+         while), se reemplaza por OP_SALTO_SI hacia el cuerpo del ciclo.
+    Así cada vuelta de un while simple ejecuta una instrucción de control
+    en lugar de tres (comparación, ifFalse y goto).
+    """
+    lecturas = {}
+    for ins in simbolicas:
+        for operando in (ins[2], ins[3]):
+            if operando is not None and operando[0] == ES_VARIABLE:
+                lecturas[operando[1]] = lecturas.get(operando[1], 0) + 1
+
+    fusionadas = []
+    for ins in simbolicas:
+        if ins[0] == OP_SALTO_FALSO and fusionadas and fusionadas[-1][0] == OP_BINARIA:
+            temporal = fusionadas[-1][1]
+            if (ins[2] == (ES_VARIABLE, temporal) and es_temporal(temporal)
+                    and lecturas.get(temporal) == 1):
+                _, _, a, b, operador = fusionadas[-1]
+                fusionadas[-1] = (OP_SALTO_SI_NO, ins[1], a, b, operador)
+                continue
+        fusionadas.append(ins)
+
+    posiciones = {ins[1]: i for i, ins in enumerate(fusionadas) if ins[0] == OP_ETIQUETA}
+    cuerpos = {}  # índice de la cabecera -> etiqueta del cuerpo del ciclo
+    rotadas = {}  # índice del goto -> instrucción que lo reemplaza
+    for i, ins in enumerate(fusionadas):
+        if ins[0] != OP_SALTO or posiciones.get(ins[1], i) >= i:
+            continue
+        j = posiciones[ins[1]] + 1
+        while fusionadas[j][0] == OP_ETIQUETA:
+            j += 1
+        cabecera = fusionadas[j]
+        siguiente = fusionadas[i + 1] if i + 1 < len(fusionadas) else None
+        if (cabecera[0] == OP_SALTO_SI_NO and siguiente is not None
+                and siguiente[0] == OP_ETIQUETA and siguiente[1] == cabecera[1]):
+            cuerpo = cuerpos.setdefault(j, f"{ins[1]}_cuerpo")
+            _, _, a, b, operador = cabecera
+            rotadas[i] = (OP_SALTO_SI, cuerpo, a, b, operador)
+
+    if not rotadas:
+        return fusionadas
+
+    resultado = []
+    for i, ins in enumerate(fusionadas):
+        resultado.append(rotadas.get(i, ins))
+        if i in cuerpos:
+            resultado.append((OP_ETIQUETA, cuerpos[i], None, None, None))
+    return resultado
+
+
+SALTOS = (OP_SALTO, OP_SALTO_FALSO, OP_SALTO_SI_NO, OP_SALTO_SI)
+
+
+def reutilizar_temporales(simbolicas):
+    """
+    Asignación de temporales por barrido lineal (linear scan).
+    El intervalo de vida de un temporal va de su definición a su última
+    lectura. Solo se reutilizan los temporales cuyo intervalo queda dentro
+    de un bloque básico y empieza con una escritura (todos los que genera
+    TACGenerator); con ellos el intervalo es exacto aunque haya ciclos.
+    Los demás reciben un nombre propio que no se comparte.
+    """
+    ultima = {}       # temporal -> índice de su última aparición
+    no_locales = set()
+    bloque_de = {}
+    bloque = 0
+    for i, (op, destino, a, b, _) in enumerate(simbolicas):
+        if op == OP_ETIQUETA:
+            bloque += 1
+        for operando in (a, b):
+            if operando is not None and operando[0] == ES_VARIABLE and es_temporal(operando[1]):
+                nombre = operando[1]
+                if bloque_de.setdefault(nombre, bloque) != bloque or nombre not in ultima:
+                    no_locales.add(nombre)  # se lee antes de escribirse o en otro bloque
+                ultima[nombre] = i
+        if destino is not None and op not in SALTOS and op != OP_ETIQUETA and es_temporal(destino):
+            if bloque_de.setdefault(destino, bloque) != bloque:
+                no_locales.add(destino)
+            ultima[destino] = i
+        if op in SALTOS:
+            bloque += 1
+
+    vencen = {}  # índice -> temporales cuya vida termina ahí
+    for nombre, i in ultima.items():
+        vencen.setdefault(i, []).append(nombre)
+
+    fisico = {}   # temporal original -> nombre reutilizado
+    libres = []   # nombres reutilizados disponibles
+    creados = 0
+
+    def asignar(nombre):
+        nonlocal creados
+        if nombre not in fisico:
+            if libres and nombre not in no_locales:
+                fisico[nombre] = libres.pop()
+            else:
+                creados += 1
+                fisico[nombre] = nombre_temporal(creados)
+        return fisico[nombre]
+
+    def renombrar(operando):
+        if operando is not None and operando[0] == ES_VARIABLE and es_temporal(operando[1]):
+            return (ES_VARIABLE, asignar(operando[1]))
+        return operando
+
+    salida = []
+    for i, (op, destino, a, b, operador) in enumerate(simbolicas):
+        # Se leen a y b antes de escribir destino: el destino puede
+        # reutilizar el nombre de un operando que muere aquí
+        a, b = renombrar(a), renombrar(b)
+        for nombre in vencen.get(i, ()):
+            if nombre != destino and nombre in fisico and nombre not in no_locales:
+                libres.append(fisico[nombre])
+        if destino is not None and op not in SALTOS and op != OP_ETIQUETA and es_temporal(destino):
+            original = destino
+            destino = asignar(original)
+            if ultima[original] == i and original not in no_locales:
+                libres.append(destino)  # escrito y nunca leído
+        salida.append((op, destino, a, b, operador))
+    return salida
+
+
+def resolver(simbolicas):
+    """Asigna slots a nombres y constantes y devuelve el Programa final"""
+    variables = {}
+    temporales = {}
+    constantes = {}
+    nombres = {}  # nombre -> slot provisional (variables leídas antes de escribirse)
+    valores = []
+
+    def slot_nombre(nombre, es_destino):
+        tabla = temporales if es_temporal(nombre) else variables
+        slot = tabla.get(nombre)
+        if slot is None:
+            slot = nombres.get(nombre)
+            if slot is None:
+                slot = nombres[nombre] = len(valores)
+                valores.append(0)  # Lo que no existe vale 0
+            if es_destino or tabla is temporales:
+                tabla[nombre] = slot
+        return slot
+
+    def slot_operando(operando):
+        if operando[0] == ES_VARIABLE:
+            return slot_nombre(operando[1], False)
+        clave = (type(operando[1]), operando[1])
+        slot = constantes.get(clave)
+        if slot is None:
+            slot = constantes[clave] = len(valores)
+            valores.append(operando[1])
+        return slot
+
+    # Tabla de saltos: etiqueta -> índice de la instrucción que la sigue
+    etiquetas = {}
+    indice = 0
+    for ins in simbolicas:
+        if ins[0] == OP_ETIQUETA:
+            etiquetas[ins[1]] = indice
+        else:
+            indice += 1
+
+    instrucciones = []
+    for op, destino, a, b, operador in simbolicas:
+        if op == OP_ETIQUETA:
+            continue
+        sa = slot_operando(a) if a is not None else 0
+        sb = slot_operando(b) if b is not None else 0
+        if op != OP_COPIA and op != OP_BINARIA and op != OP_PRINT:
+            if destino not in etiquetas:
+                raise Exception(f"Error TAC: etiqueta '{destino}' no definida.")
+            sd = etiquetas[destino]
+        else:
+            sd = slot_nombre(destino, True) if destino is not None else 0
+        instrucciones.append((op, sd, sa, sb, operador))
+
+    return Programa(instrucciones, valores, variables, temporales)
+
+
+def ensamblar(tac_code):
+    """Ensambla el texto TAC completo en un Programa"""
+    return resolver(reutilizar_temporales(fusionar_saltos(decodificar(tac_code))))
+
+
+def desensamblar(programa):
+    """Listado legible de un Programa (para depuración)"""
+    nombres = {}
+    for tabla in (programa.variables, programa.temporales):
+        for nombre, slot in tabla.items():
+            nombres[slot] = nombre
+
+    def texto(slot):
+        return nombres.get(slot, repr(programa.valores_iniciales[slot]))
+
+    lineas = []
+    for i, (op, destino, a, b, _) in enumerate(programa.instrucciones):
+        if op == OP_PRINT:
+            lineas.append(f"{i:4d}  {NOMBRES_OPCODES[op]:<8} {texto(a)}")
+        elif op == OP_SALTO:
+            lineas.append(f"{i:4d}  {NOMBRES_OPCODES[op]:<8} -> {destino}")
+        elif op == OP_SALTO_FALSO:
+            lineas.append(f"{i:4d}  {NOMBRES_OPCODES[op]:<8} {texto(a)} -> {destino}")
+        elif op == OP_SALTO_SI_NO or op == OP_SALTO_SI:
+            lineas.append(f"{i:4d}  {NOMBRES_OPCODES[op]:<8} {texto(a)}, {texto(b)} -> {destino}")
+        elif op == OP_COPIA:
+            lineas.append(f"{i:4d}  {NOMBRES_OPCODES[op]:<8} r{destino} <- {texto(a)}")
+        else:
+            lineas.append(f"{i:4d}  {NOMBRES_OPCODES[op]:<8} r{destino} <- {texto(a)}, {texto(b)}")
+    return "\n".join(lineas)
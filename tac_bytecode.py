@@ -0,0 +1,177 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from tac_assembler import Programa, OPERADORES, SIMBOLOS, operador_desconocido
+
+# ===============================================================
+# MÓDULO BINARIO (.tacb)
+# ===============================================================
+#
+# Un Programa ya ensamblado guardado en un archivo, para volver a
+# ejecutarlo sin léxico, parser, semántico ni ensamblado. Todo en
+# little-endian:
+#
+#   CABECERA      magic 'TACB', versión, y tamaños/offsets de cada sección
+#   CONSTANTES    (slot, tipo, longitud, bytes) de cada slot que no empieza
+#                 en 0: enteros con signo de largo variable, strings UTF-8
+#                 y booleanos
+#   SÍMBOLOS      (slot, longitud, nombre UTF-8) de las variables, en el
+#                 orden del volcado de memoria, y luego de los temporales
+#   INSTRUCCIONES arreglo de int32, cinco por instrucción:
+#                 opcode, destino, a, b, código de operador
+#
+# El arreglo de instrucciones empieza alineado a 8 bytes, así que el
+# cargador lo lee directamente del archivo mapeado en memoria con
+# memoryview.cast('i'), sin copiarlo ni decodificarlo con struct; las
+# tuplas del Programa se arman con zip sobre cinco vistas con paso 5.
+
+MAGIC = b'TACB'
+VERSION = 1
+EXTENSION = '.tacb'
+
+# magic, versión, slots, instrucciones, constantes, variables, temporales,
+# offset de las instrucciones
+CABECERA = struct.Struct('<4sHxxIIIIII')
+CONSTANTE = struct.Struct('<IBI')  # slot, tipo, longitud del valor
+SIMBOLO = struct.Struct('<IH')     # slot, longitud del nombre
+CAMPOS = 5
+
+TIPO_ENTERO, TIPO_STRING, TIPO_BOOLEANO = range(3)
+
+# Código de operador: 0 = sin operador, luego los de OPERADORES en orden
+# y al final el operador desconocido
+SIMBOLOS_OPERADOR = (None,) + tuple(OPERADORES) + ('?',)
+CODIGOS_OPERADOR = {simbolo: codigo for codigo, simbolo in enumerate(SIMBOLOS_OPERADOR)}
+FUNCIONES_OPERADOR = (None,) + tuple(OPERADORES.values()) + (operador_desconocido,)
+
+
+def codificar_constante(slot, valor):
+    if isinstance(valor, bool):
+        tipo, datos = TIPO_BOOLEANO, bytes([valor])
+    elif isinstance(valor, int):
+        tipo, datos = TIPO_ENTERO, valor.to_bytes((valor.bit_length() + 8) // 8, 'little', signed=True)
+    elif isinstance(valor, str):
+        tipo, datos = TIPO_STRING, valor.encode('utf-8')
+    else:
+        raise Exception(f"Error de módulo: constante no soportada {valor!r}")
+    return CONSTANTE.pack(slot, tipo, len(datos)) + datos
+
+
+def decodificar_constante(tipo, datos):
+    if tipo == TIPO_BOOLEANO:
+        return bool(datos[0])
+    if tipo == TIPO_ENTERO:
+        return int.from_bytes(datos, 'little', signed=True)
+    if tipo == TIPO_STRING:
+        return str(datos, 'utf-8')
+    raise Exception(f"Error de módulo: tipo de constante desconocido ({tipo})")
+
+
+def codificar_modulo(programa):
+    """Bytes del módulo binario de un Programa"""
+    constantes = [codificar_constante(slot, valor)
+                  for slot, valor in enumerate(programa.valores_iniciales)
+                  if not (type(valor) is int and valor == 0)]  # Los nombres empiezan en 0
+    simbolos = []
+    for tabla in (programa.variables, programa.temporales):
+        for nombre, slot in tabla.items():
+            datos = nombre.encode('utf-8')
+            simbolos.append(SIMBOLO.pack(slot, len(datos)) + datos)
+
+    cuerpo = b''.join(constantes) + b''.join(simbolos)
+    offset = CABECERA.size + len(cuerpo)
+    relleno = -offset % 8
+    offset += relleno
+
+    codigo = array('i')
+    for op, destino, a, b, operador in programa.instrucciones:
+        simbolo = None if operador is None else SIMBOLOS.get(operador, '?')
+        codigo.extend((op, destino, a, b, CODIGOS_OPERADOR[simbolo]))
+    if sys.byteorder != 'little':
+        codigo.byteswap()
+
+    cabecera = CABECERA.pack(MAGIC, VERSION, len(programa.valores_iniciales), len(programa),
+                             len(constantes), len(programa.variables), len(programa.temporales),
+                             offset)
+    return cabecera + cuerpo + bytes(relleno) + codigo.tobytes()
+
+
+def decodificar_modulo(datos):
+    """Programa de un módulo binario; 'datos' es cualquier buffer (bytes, mmap)"""
+    if len(datos) < CABECERA.size or datos[:4] != MAGIC:
+        raise Exception("Error de módulo: el archivo no es un módulo TAC")
+    (_, version, slots, n_instrucciones, n_constantes,
+     n_variables, n_temporales, offset) = CABECERA.unpack_from(datos, 0)
+    if version != VERSION:
+        raise Exception(f"Error de módulo: versión {version} no soportada (se espera {VERSION})")
+    fin = offset + n_instrucciones * CAMPOS * 4
+    if fin > len(datos):
+        raise Exception("Error de módulo: archivo truncado")
+
+    valores = [0] * slots
+    posicion = CABECERA.size
+    for _ in range(n_constantes):
+        slot, tipo, largo = CONSTANTE.unpack_from(datos, posicion)
+        posicion += CONSTANTE.size
+        valores[slot] = decodificar_constante(tipo, datos[posicion:posicion + largo])
+        posicion += largo
+
+    tablas = ({}, {})
+    for tabla, cantidad in zip(tablas, (n_variables, n_temporales)):
+        for _ in range(cantidad):
+            slot, largo = SIMBOLO.unpack_from(datos, posicion)
+            posicion += SIMBOLO.size
+            tabla[str(datos[posicion:posicion + largo], 'utf-8')] = slot
+            posicion += largo
+
+    with memoryview(datos) as vista:
+        with vista[offset:fin] as crudo:
+            if sys.byteorder == 'little':
+                instrucciones = armar_instrucciones(crudo)
+            else:
+                codigo = array('i', crudo.tobytes())
+                codigo.byteswap()
+                instrucciones = armar_instrucciones(memoryview(codigo))
+
+    return Programa(instrucciones, valores, tablas[0], tablas[1])
+
+
+def armar_instrucciones(crudo):
+    """Tuplas (opcode, destino, a, b, operador) leídas del arreglo de int32 sin copiarlo"""
+    with crudo.cast('i') as codigo:
+        columnas = [codigo[i::CAMPOS] for i in range(CAMPOS)]
+        try:
+            operadores = map(FUNCIONES_OPERADOR.__getitem__, columnas[4])
+            return list(zip(columnas[0], columnas[1], columnas[2], columnas[3], operadores))
+        finally:
+            for columna in columnas:
+                columna.release()  # El mmap no se puede cerrar con vistas abiertas
+
+
+def guardar_modulo(programa, ruta):
+    """Escribe el módulo binario de un Programa en 'ruta'"""
+    with open(ruta, 'wb') as archivo:
+        archivo.write(codificar_modulo(programa))
+
+
+def cargar_modulo(ruta):
+    """Programa de un archivo .tacb, leído a través de mmap"""
+    with open(ruta, 'rb') as archivo:
+        try:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Un archivo vacío no se puede mapear
+            return decodificar_modulo(b'')
+        with mapa:
+            return decodificar_modulo(mapa)
+
+
+def es_modulo(ruta):
+    """True si el archivo empieza con la marca de un módulo binario"""
+    try:
+        with open(ruta, 'rb') as archivo:
+            return archivo.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
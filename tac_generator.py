@@ -1,4 +1,7 @@
-class TACGenerator:
+from analizador_semantico import NodeVisitor, es_binop
+from tac_assembler import nombre_temporal
+
+class TACGenerator(NodeVisitor):
     def __init__(self):
         self.temp_count = 0
         self.label_count = 0
@@ -8,7 +11,7 @@ class TACGenerator:
     def new_temp(self):
       """Genera un nuevo temporal"""
       self.temp_count += 1
-      return f"temp_{self.temp_count}"
+      return nombre_temporal(self.temp_count)
     
     def new_label(self):
         """Genera una nueva etiqueta"""
@@ -24,12 +27,6 @@ class TACGenerator:
         self.visit(ast)
         return "\n".join(self.code)
     
-    def visit(self, node):
-        """Método de visita para nodos del AST"""
-        method_name = 'visit_' + type(node).__name__
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-    
     def generic_visit(self, node):
         """Visitante genérico"""
         if hasattr(node, 'children'):
@@ -53,17 +50,30 @@ class TACGenerator:
         return node.target.name
     
     def visit_BinOp(self, node):
-        # Generar código para operandos
-        left_temp = self.visit(node.left)
-        right_temp = self.visit(node.right)
-        
-        # Crear temporal para resultado
-        result_temp = self.new_temp()
-        
-        # Emitir operación
-        self.emit(f"{result_temp} = {left_temp} {node.op} {right_temp}")
+        # Recorrido post-orden con pila explícita (sin recursión por nivel):
+        # primero el operando izquierdo, luego el derecho y al final la operación
+        resultados = []
+        pila = [(node, False)]
+        while pila:
+            actual, listo = pila.pop()
+            if listo:
+                right_temp = resultados.pop()
+                left_temp = resultados.pop()
+                
+                # Crear temporal para resultado
+                result_temp = self.new_temp()
+                
+                # Emitir operación
+                self.emit(f"{result_temp} = {left_temp} {actual.op} {right_temp}")
+                resultados.append(result_temp)
+            elif es_binop(actual):
+                pila.append((actual, True))
+                pila.append((actual.right, False))
+                pila.append((actual.left, False))
+            else:
+                resultados.append(self.visit(actual))
         
-        return result_temp
+        return resultados[0]
     
     def visit_Identifier(self, node):
         return node.name
@@ -72,7 +82,12 @@ class TACGenerator:
         return str(node.value)
     
     def visit_String(self, node):
+        # El parser guarda el lexema con sus comillas: no se vuelven a agregar
+        if node.value.startswith('"'):
+            return node.value
         return f'"{node.value}"'
+    def visit_Bool(self, node):
+        return 'true' if node.value else 'false'
     def visit_Print(self, node):
         # 1. Calculamos el valor de la expresión (esto genera temporales si es necesario)
         val_temp = self.visit(node.expression)
@@ -80,9 +95,40 @@ class TACGenerator:
         # 2. Emitimos la instrucción 'print'
         self.emit(f"print {val_temp}")
     def visit_IfStatement(self, node):
-        # Por ahora, solo visitas para que genere el código de las expresiones internas
-        self.visit(node.condition)
+        # if (c) { A } else { B }  se traduce como:
+        #       ifFalse c goto L_else
+        #       A
+        #       goto L_fin
+        #   L_else:
+        #       B
+        #   L_fin:
+        # (sin else, el salto va directo a L_fin)
+        cond_temp = self.visit(node.condition)
+        else_label = self.new_label()
+        self.emit(f"ifFalse {cond_temp} goto {else_label}")
         self.visit(node.then_block)
         if node.else_block:
+            end_label = self.new_label()
+            self.emit(f"goto {end_label}")
+            self.emit(f"{else_label}:")
             self.visit(node.else_block)
-        # Aquí iría la lógica compleja de generación de etiquetas L1, L2 y saltos.
\ No newline at end of file
+            self.emit(f"{end_label}:")
+        else:
+            self.emit(f"{else_label}:")
+
+    def visit_WhileStatement(self, node):
+        # while (c) { B }  se traduce como:
+        #   L_inicio:
+        #       ifFalse c goto L_fin
+        #       B
+        #       goto L_inicio
+        #   L_fin:
+        # (el ensamblador rota el salto de vuelta, ver tac_assembler)
+        start_label = self.new_label()
+        end_label = self.new_label()
+        self.emit(f"{start_label}:")
+        cond_temp = self.visit(node.condition)
+        self.emit(f"ifFalse {cond_temp} goto {end_label}")
+        self.visit(node.body)
+        self.emit(f"goto {start_label}")
+        self.emit(f"{end_label}:")
\ No newline at end of file
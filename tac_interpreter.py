@@ -1,88 +1,91 @@
+import sys
+
+from tac_assembler import (
+    Programa, ensamblar, OPERADORES, operador_desconocido, imprimir_salida, LimiteExcedido,
+    OP_COPIA, OP_BINARIA, OP_PRINT, OP_SALTO, OP_SALTO_FALSO, OP_SALTO_SI_NO, OP_SALTO_SI
+)
+
+
 class TACInterpreter:
-    def __init__(self):
-        self.memory = {}  # Memoria para variables
-        self.temps = {}   # Valores de temporales
-        
+    def __init__(self, salida=imprimir_salida, limite_instrucciones=None):
+        self.salida = salida  # Recibe el valor de cada 'print' del programa
+        # Máximo de instrucciones a ejecutar (None = sin límite)
+        self.limite_instrucciones = limite_instrucciones
+        self.memory = {}      # Volcado final de variables (nombre -> valor)
+        self.temps = {}       # Volcado final de temporales (nombre -> valor)
+        self.registros = []   # Banco de registros indexado por slot
+        self.pasos = 0        # Instrucciones cobradas al límite en la última ejecución
+
     def execute(self, tac_code):
-        """Ejecuta código TAC"""
-        lines = tac_code.strip().split('\n')
+        """
+        Ejecuta código TAC.
+        Acepta el texto TAC o un Programa ya ensamblado (tac_assembler);
+        el texto se ensambla una sola vez antes de ejecutar. Cada variable,
+        temporal y constante tiene un slot fijo, así que el bucle principal
+        solo indexa una lista: no parte cadenas ni busca nombres.
+
+        El límite de instrucciones se cobra en los saltos hacia atrás: cada
+        vuelta de un ciclo descuenta el largo del tramo que repite. El código
+        sin ciclos ejecuta a lo sumo len(programa) instrucciones, así que el
+        conteo es una cota superior que cuesta una resta por vuelta.
+        """
+        if isinstance(tac_code, Programa):
+            programa = tac_code
+        else:
+            programa = ensamblar(tac_code)
+
+        instrucciones = programa.instrucciones
+        n = len(instrucciones)
+        r = list(programa.valores_iniciales)
+        salida = self.salida
+        limite = self.limite_instrucciones
+        presupuesto = inicial = sys.maxsize if limite is None else limite - n
         pc = 0  # Program counter
-        
-        while pc < len(lines):
-            line = lines[pc].strip()
-            if not line:
-                pc += 1
-                continue
-                
-            # Parsear instrucción
-            parts = line.split()
-            
-            if len(parts) >= 3 and parts[1] == '=':
-                # Asignación: x = valor o t1 = a + b
-                target = parts[0]
-                if len(parts) == 3:
-                    # Asignación simple: x = y
-                    value = self.get_value(parts[2])
-                    self.store_value(target, value)
-                elif len(parts) == 5:
-                    # Operación binaria: t1 = a + b
-                    left = self.get_value(parts[2])
-                    op = parts[3]
-                    right = self.get_value(parts[4])
-                    result = self.apply_operator(left, op, right)
-                    self.store_value(target, result)
-            if parts[0] == 'print':
-                # El valor a imprimir está en parts[1]
-                variable_o_valor = parts[1]
-                valor_real = self.get_value(variable_o_valor)
-                
-                # Usamos el print real de Python
-                print(f">> OUT: {valor_real}")
-            
+
+        # Los opcodes se prueban en el orden en que más aparecen dentro de
+        # un ciclo: cuerpo (binaria, copia) y salto de vuelta (OP_SALTO_SI)
+        while pc < n:
+            op, destino, a, b, operador = instrucciones[pc]
             pc += 1
-        
+
+            if op == OP_BINARIA:
+                # Operación binaria: t1 = a + b
+                r[destino] = operador(r[a], r[b])
+            elif op == OP_COPIA:
+                # Asignación simple: x = y
+                r[destino] = r[a]
+            elif op == OP_SALTO_SI:
+                # Salto de vuelta de un ciclo ya resuelto: if a < b goto cuerpo
+                if operador(r[a], r[b]):
+                    presupuesto -= pc - destino
+                    if presupuesto < 0:
+                        raise LimiteExcedido(f"Error de Ejecución: se superó el límite de {limite} instrucciones.")
+                    pc = destino
+            elif op == OP_SALTO_SI_NO:
+                # Comparación + ifFalse fusionados
+                if not operador(r[a], r[b]):
+                    pc = destino
+            elif op == OP_SALTO_FALSO:
+                # ifFalse c goto L: el destino ya es un índice de instrucción
+                if not r[a]:
+                    pc = destino
+            elif op == OP_SALTO:
+                # goto L
+                if destino < pc:
+                    presupuesto -= pc - destino
+                    if presupuesto < 0:
+                        raise LimiteExcedido(f"Error de Ejecución: se superó el límite de {limite} instrucciones.")
+                pc = destino
+            elif op == OP_PRINT:
+                # Por defecto, el print real de Python
+                salida(r[a])
+
+        # Los nombres solo se usan para el volcado final
+        self.pasos = n + inicial - presupuesto
+        self.registros = r
+        self.memory = programa.memoria(r)
+        self.temps = {nombre: r[slot] for nombre, slot in programa.temporales.items()}
         return self.memory
-    
-    def get_value(self, identifier):
-        """Obtiene el valor de una variable o temporal"""
-        # Si es un número
-        if identifier.isdigit() or (identifier[0] == '-' and identifier[1:].isdigit()):
-            return int(identifier)
-        
-        # Si es un string entre comillas
-        if identifier.startswith('"') and identifier.endswith('"'):
-            return identifier[1:-1]
-        
-        # Buscar en memoria de variables
-        if identifier in self.memory:
-            return self.memory[identifier]
-        
-        # Buscar en temporales
-        if identifier in self.temps:
-            return self.temps[identifier]
-        
-        # Si no existe, retornar 0
-        return 0
-    
-    def store_value(self, target, value):
-        """Almacena un valor en variable o temporal"""
-        if 'temp' in target:
-            self.temps[target] = value
-        else:
-            self.memory[target] = value
-    
+
     def apply_operator(self, left, op, right):
-        if op == '+':
-            return left + right
-        # ... otros casos ...
-        
-        # --- NUEVA LÓGICA AND ---
-        elif op == '&&':
-            # Si left y right son distintos de 0, devuelve 1. Si no, 0.
-            return 1 if (left and right) else 0
-            
-        elif op == '>':
-            return 1 if left > right else 0
-        elif op == '<':
-            return 1 if left < right else 0
-        # ...
\ No newline at end of file
+        return OPERADORES.get(op, operador_desconocido)(left, right)
\ No newline at end of file
@@ -0,0 +1,221 @@
+from tac_assembler import (
+    decodificar, codificar, es_temporal, operador_division,
+    ES_VARIABLE, ES_CONSTANTE, OP_COPIA, OP_BINARIA, OP_SALTO, OP_SALTO_FALSO, OP_ETIQUETA,
+    OPERADORES
+)
+
+# ===============================================================
+# OPTIMIZADOR DE TAC
+# ===============================================================
+#
+# Trabaja sobre las instrucciones simbólicas de tac_assembler.decodificar()
+# (antes de asignar slots) y devuelve otra lista del mismo formato:
+#
+#   1. fusionar_copias():  't = a + b; x = t'  ->  'x = a + b'
+#                          (t es un temporal que solo se lee en la copia)
+#   2. numerar_valores():  numeración de valores local a cada bloque básico:
+#        - CSE: si 'a + b' ya está en un nombre que no cambió, se copia
+#          ese nombre en vez de recalcular;
+#        - propagación de copias: después de 'x = y', las lecturas de x
+#          leen y (o la constante) mientras ninguno de los dos cambie.
+#   3. eliminar_muertos(): borra temporales que nadie lee y escrituras
+#      que se sobrescriben en el mismo bloque antes de ser leídas.
+#
+# Los pasos 1 y 3 se repiten hasta que no haya cambios.
+#
+# Restricciones para no cambiar el comportamiento observable:
+#   - La primera escritura de cada variable del usuario nunca se borra:
+#     el volcado de memoria lista las variables en ese orden.
+#   - Las divisiones no se borran aunque su resultado no se use: una
+#     división por cero debe seguir fallando al ejecutar.
+
+OPERADORES_CONMUTATIVOS = {OPERADORES[op] for op in ('+', '*', '==', '!=', '&&')}
+
+
+def es_instruccion(ins):
+    """Las etiquetas no cuentan como instrucciones"""
+    return ins[0] != OP_ETIQUETA
+
+
+def contar_instrucciones(simbolicas):
+    return sum(1 for ins in simbolicas if es_instruccion(ins))
+
+
+def escribe(ins):
+    return ins[0] == OP_COPIA or ins[0] == OP_BINARIA
+
+
+def leidas(ins):
+    """Nombres que lee una instrucción"""
+    return [operando[1] for operando in (ins[2], ins[3])
+            if operando is not None and operando[0] == ES_VARIABLE]
+
+
+def contar_lecturas(simbolicas):
+    lecturas = {}
+    for ins in simbolicas:
+        for nombre in leidas(ins):
+            lecturas[nombre] = lecturas.get(nombre, 0) + 1
+    return lecturas
+
+
+def bloques_basicos(simbolicas):
+    """Rangos (inicio, fin) de los bloques básicos: una etiqueta abre bloque, un salto lo cierra"""
+    bloques = []
+    inicio = 0
+    for i, ins in enumerate(simbolicas):
+        if ins[0] == OP_ETIQUETA and i > inicio:
+            bloques.append((inicio, i))
+            inicio = i
+        if ins[0] == OP_SALTO or ins[0] == OP_SALTO_FALSO:
+            bloques.append((inicio, i + 1))
+            inicio = i + 1
+    if inicio < len(simbolicas):
+        bloques.append((inicio, len(simbolicas)))
+    return bloques
+
+
+# ===============================================================
+# 1. FUSIÓN DE COPIAS
+# ===============================================================
+
+def fusionar_copias(simbolicas):
+    lecturas = contar_lecturas(simbolicas)
+    salida = []
+    for ins in simbolicas:
+        if ins[0] == OP_COPIA and ins[2][0] == ES_VARIABLE and salida:
+            temporal = ins[2][1]
+            previa = salida[-1]
+            if (escribe(previa) and previa[1] == temporal and es_temporal(temporal)
+                    and lecturas.get(temporal) == 1):
+                salida[-1] = (previa[0], ins[1], previa[2], previa[3], previa[4])
+                continue
+        salida.append(ins)
+    return salida
+
+
+# ===============================================================
+# 2. NUMERACIÓN DE VALORES (CSE + PROPAGACIÓN DE COPIAS)
+# ===============================================================
+
+def clave_operando(operando):
+    # El tipo distingue 1 de true (en Python 1 == True)
+    if operando[0] == ES_CONSTANTE:
+        return (ES_CONSTANTE, type(operando[1]), operando[1])
+    return operando
+
+
+def clave_expresion(operador, a, b):
+    ka, kb = clave_operando(a), clave_operando(b)
+    if operador in OPERADORES_CONMUTATIVOS and repr(kb) < repr(ka):
+        ka, kb = kb, ka
+    return (operador, ka, kb)
+
+
+def numerar_bloque(bloque):
+    copias = {}        # nombre -> operando que tiene su mismo valor
+    disponibles = {}   # clave de expresión -> nombre que ya la contiene
+    dependientes = {}  # nombre -> entradas de las tablas que dejan de valer si cambia
+
+    def depende(nombre, tabla, clave):
+        dependientes.setdefault(nombre, []).append((tabla, clave))
+
+    def invalidar(nombre):
+        for tabla, clave in dependientes.pop(nombre, ()):
+            tabla.pop(clave, None)
+
+    def actual(operando):
+        if operando is not None and operando[0] == ES_VARIABLE:
+            return copias.get(operando[1], operando)
+        return operando
+
+    salida = []
+    for op, destino, a, b, operador in bloque:
+        a, b = actual(a), actual(b)
+
+        if op == OP_BINARIA:
+            clave = clave_expresion(operador, a, b)
+            previo = disponibles.get(clave)
+            if previo is not None:
+                # Subexpresión común: se copia el valor ya calculado
+                op, a, b, operador = OP_COPIA, actual((ES_VARIABLE, previo)), None, None
+
+        if op == OP_BINARIA:
+            invalidar(destino)
+            nombres = [o[1] for o in (a, b) if o[0] == ES_VARIABLE]
+            if destino not in nombres:
+                disponibles[clave] = destino
+                depende(destino, disponibles, clave)
+                for nombre in nombres:
+                    depende(nombre, disponibles, clave)
+        elif op == OP_COPIA:
+            invalidar(destino)
+            if a != (ES_VARIABLE, destino):
+                copias[destino] = a
+                depende(destino, copias, destino)
+                if a[0] == ES_VARIABLE:
+                    depende(a[1], copias, destino)
+
+        salida.append((op, destino, a, b, operador))
+    return salida
+
+
+def numerar_valores(simbolicas):
+    salida = []
+    for inicio, fin in bloques_basicos(simbolicas):
+        salida.extend(numerar_bloque(simbolicas[inicio:fin]))
+    return salida
+
+
+# ===============================================================
+# 3. ELIMINACIÓN DE CÓDIGO MUERTO
+# ===============================================================
+
+def eliminar_muertos(simbolicas):
+    lecturas = contar_lecturas(simbolicas)
+
+    # Primera escritura de cada variable del usuario (se conserva siempre)
+    primeras = set()
+    vistas = set()
+    for i, ins in enumerate(simbolicas):
+        if escribe(ins) and not es_temporal(ins[1]) and ins[1] not in vistas:
+            vistas.add(ins[1])
+            primeras.add(i)
+
+    vivas = [True] * len(simbolicas)
+    for inicio, fin in bloques_basicos(simbolicas):
+        sobrescritas = set()  # escritas más adelante en el bloque sin leerse antes
+        for i in range(fin - 1, inicio - 1, -1):
+            ins = simbolicas[i]
+            if escribe(ins) and ins[4] is not operador_division and i not in primeras:
+                destino = ins[1]
+                if destino in sobrescritas or (es_temporal(destino) and not lecturas.get(destino)):
+                    vivas[i] = False
+                    continue
+            if escribe(ins):
+                sobrescritas.add(ins[1])
+            for nombre in leidas(ins):
+                sobrescritas.discard(nombre)
+
+    return [ins for ins, viva in zip(simbolicas, vivas) if viva]
+
+
+# ===============================================================
+# API
+# ===============================================================
+
+def optimizar(simbolicas):
+    """Optimiza una lista de instrucciones simbólicas y devuelve la nueva lista"""
+    simbolicas = numerar_valores(fusionar_copias(simbolicas))
+    while True:
+        nuevas = fusionar_copias(eliminar_muertos(simbolicas))
+        if len(nuevas) == len(simbolicas):
+            return nuevas
+        simbolicas = nuevas
+
+
+def optimizar_texto(tac_code):
+    """Optimiza un programa TAC en texto; devuelve (texto, instrucciones antes, después)"""
+    simbolicas = decodificar(tac_code)
+    optimizadas = optimizar(simbolicas)
+    return codificar(optimizadas), contar_instrucciones(simbolicas), contar_instrucciones(optimizadas)
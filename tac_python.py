@@ -0,0 +1,194 @@
+from tac_assembler import (
+    decodificar, fusionar_saltos, reutilizar_temporales, es_temporal, operador_division,
+    PREFIJO_TEMPORAL,
+    imprimir_salida,
+    SIMBOLOS, ES_VARIABLE,
+    OP_COPIA, OP_BINARIA, OP_PRINT, OP_SALTO, OP_SALTO_FALSO, OP_ETIQUETA,
+    OP_SALTO_SI_NO, OP_SALTO_SI
+)
+
+# ===============================================================
+# SEGUNDO NIVEL DE EJECUCIÓN: TAC -> PYTHON
+# ===============================================================
+#
+# En vez de interpretar instrucción por instrucción, traduce el programa
+# TAC a código fuente Python, lo compila UNA vez con compile() y lo
+# ejecuta como una función nativa. Variables y temporales pasan a ser
+# variables locales (v_<nombre> y t_<número>) y las constantes se escriben literales.
+#
+# Control de flujo: cada etiqueta que es destino de un salto abre un
+# "estado". El cuerpo de la función es un bucle con un 'if b == N:' por
+# estado, en orden; al terminar un estado se pasa al siguiente sin volver
+# a dar la vuelta, y un salto asigna b y hace 'continue'. Un programa sin
+# saltos es código lineal sin bucle. Un estado cuyo único salto es el de
+# vuelta a sí mismo (el cuerpo de un while ya rotado por fusionar_saltos)
+# se emite como un 'while True' de Python.
+#
+# Los operadores son los mismos que usa TACInterpreter; la división sigue
+# pasando por operador_division (división entera y error por cero) y '&&'
+# da siempre un bool, como operador_and. La salida de 'print' va a la función que recibe programa() como parámetro.
+
+SINTAXIS = {'+': '+', '-': '-', '*': '*', '>': '>', '<': '<', '>=': '>=',
+            '<=': '<=', '==': '==', '!=': '!='}
+
+SALTOS = (OP_SALTO, OP_SALTO_FALSO, OP_SALTO_SI_NO, OP_SALTO_SI)
+
+
+class ProgramaPython:
+    """
+    Programa TAC traducido a Python.
+      fuente:      código Python generado (para depuración)
+      funcion:     la función compilada; recibe la función de salida y
+                   devuelve (variables, temporales)
+      variables:   nombres de las variables del usuario, en el orden en que
+                   se asignan por primera vez (mismo volcado que el intérprete)
+      temporales:  nombres de los temporales
+    """
+
+    def __init__(self, fuente, funcion, variables, temporales):
+        self.fuente = fuente
+        self.funcion = funcion
+        self.variables = variables
+        self.temporales = temporales
+
+    def ejecutar(self, salida=imprimir_salida):
+        valores, temporales = self.funcion(salida)
+        return dict(zip(self.variables, valores)), dict(zip(self.temporales, temporales))
+
+
+def local(nombre):
+    if es_temporal(nombre):
+        return f"t_{nombre[len(PREFIJO_TEMPORAL):]}"  # '%t3' no es un identificador válido
+    return f"v_{nombre}"
+
+
+def expresion(operando):
+    es_constante, valor = operando
+    if es_constante == ES_VARIABLE:
+        return local(valor)
+    return repr(valor)
+
+
+def binaria(a, operador, b):
+    simbolo = SIMBOLOS.get(operador)
+    if simbolo == '/':
+        return f"_div({expresion(a)}, {expresion(b)})"
+    if simbolo == '&&':
+        # 'and' de Python devuelve un operando; operador_and siempre un bool
+        return f"bool({expresion(a)} and {expresion(b)})"
+    if simbolo not in SINTAXIS:
+        return "None"  # Operador desconocido (igual que operador_desconocido)
+    return f"({expresion(a)} {SINTAXIS[simbolo]} {expresion(b)})"
+
+
+def condicion(op, a, b, operador):
+    """Expresión Python que es verdadera cuando el salto se toma"""
+    if op == OP_SALTO_FALSO:
+        return f"not {expresion(a)}"
+    if op == OP_SALTO_SI_NO:
+        return f"not {binaria(a, operador, b)}"
+    return binaria(a, operador, b)
+
+
+def traducir(simbolicas):
+    """Genera el código fuente Python de un programa y devuelve (fuente, variables, temporales)"""
+    variables, temporales, leidos = {}, {}, {}
+    for op, destino, a, b, _ in simbolicas:
+        if op == OP_COPIA or op == OP_BINARIA:
+            (temporales if es_temporal(destino) else variables).setdefault(destino, None)
+        for operando in (a, b):
+            if operando is not None and operando[0] == ES_VARIABLE:
+                leidos.setdefault(operando[1], None)
+    nombres = list(dict.fromkeys(list(variables) + list(temporales) + list(leidos)))
+
+    # Estados: el inicio (0) y cada etiqueta destino de algún salto
+    destinos = {ins[1] for ins in simbolicas if ins[0] in SALTOS}
+    estados = {}
+    for ins in simbolicas:
+        if ins[0] == OP_ETIQUETA and ins[1] in destinos:
+            estados[ins[1]] = len(estados) + 1
+
+    # Código de cada estado: lista de instrucciones
+    tramos = [[]]
+    for ins in simbolicas:
+        if ins[0] == OP_ETIQUETA:
+            if ins[1] in estados:
+                tramos.append([])
+            continue
+        tramos[-1].append(ins)
+
+    lineas = ["def programa(_salida):"]
+    if nombres:
+        lineas.append(f"    {' = '.join(local(n) for n in nombres)} = 0")
+
+    def cuerpo(instrucciones, sangria, bucle_propio=None):
+        for op, destino, a, b, operador in instrucciones:
+            if op == OP_COPIA:
+                lineas.append(f"{sangria}{local(destino)} = {expresion(a)}")
+            elif op == OP_BINARIA:
+                lineas.append(f"{sangria}{local(destino)} = {binaria(a, operador, b)}")
+            elif op == OP_PRINT:
+                lineas.append(f"{sangria}_salida({expresion(a)})")
+            elif bucle_propio is not None:
+                # Salto de vuelta del while nativo: se sale cuando no se toma
+                lineas.append(f"{sangria}if not ({condicion(op, a, b, operador)}):")
+                lineas.append(f"{sangria}    break")
+            elif op == OP_SALTO:
+                lineas.append(f"{sangria}b = {estados[destino]}")
+                lineas.append(f"{sangria}continue")
+            else:
+                lineas.append(f"{sangria}if {condicion(op, a, b, operador)}:")
+                lineas.append(f"{sangria}    b = {estados[destino]}")
+                lineas.append(f"{sangria}    continue")
+
+    if len(tramos) == 1:
+        # Sin saltos: código lineal
+        cuerpo(tramos[0], "    ")
+    else:
+        lineas.append("    b = 0")
+        lineas.append("    while True:")
+        for numero, instrucciones in enumerate(tramos):
+            lineas.append(f"        if b == {numero}:")
+            saltos = [ins for ins in instrucciones if ins[0] in SALTOS]
+            ultima = instrucciones[-1] if instrucciones else None
+            if (len(saltos) == 1 and ultima is saltos[0] and ultima[0] != OP_SALTO
+                    and estados[ultima[1]] == numero):
+                lineas.append("            while True:")
+                cuerpo(instrucciones, "                ", bucle_propio=numero)
+            else:
+                cuerpo(instrucciones, "            ")
+            lineas.append(f"            b = {numero + 1}")
+        lineas.append("        break")
+
+    valores = ", ".join(local(n) for n in variables)
+    valores_temporales = ", ".join(local(n) for n in temporales)
+    lineas.append(f"    return ({valores}{',' if variables else ''}), "
+                  f"({valores_temporales}{',' if temporales else ''})")
+    return "\n".join(lineas) + "\n", list(variables), list(temporales)
+
+
+def compilar_python(tac_code):
+    """Traduce y compila un programa TAC; devuelve un ProgramaPython"""
+    simbolicas = reutilizar_temporales(fusionar_saltos(decodificar(tac_code)))
+    fuente, variables, temporales = traducir(simbolicas)
+    entorno = {'_div': operador_division}
+    exec(compile(fuente, '<tac>', 'exec'), entorno)
+    return ProgramaPython(fuente, entorno['programa'], variables, temporales)
+
+
+class TACPythonExecutor:
+    """Misma interfaz que TACInterpreter, ejecutando el programa compilado a Python"""
+
+    def __init__(self, salida=imprimir_salida):
+        self.salida = salida
+        self.memory = {}
+        self.temps = {}
+        self.programa = None
+
+    def execute(self, tac_code):
+        if isinstance(tac_code, ProgramaPython):
+            self.programa = tac_code
+        else:
+            self.programa = compilar_python(tac_code)
+        self.memory, self.temps = self.programa.ejecutar(self.salida)
+        return self.memory
@@ -0,0 +1,37 @@
+import pytest
+
+from compile_api import compilar
+from compile_cache import CompileCache
+
+
+def ejecutar(fuente, nivel):
+    # Caché propia: cada prueba compila desde cero
+    return compilar(fuente, nivel=nivel, cache=CompileCache())
+
+
+@pytest.mark.parametrize('nivel', ['interprete', 'clausuras'])
+@pytest.mark.parametrize('expresion', ['var int y = (a / z) * 0;',
+                                       'var int y = 0 * (a / z);',
+                                       'var bool y = (a / z == 1) && false;',
+                                       'var bool y = false && (a / z == 1);'])
+def test_identidad_no_borra_division_por_cero(expresion, nivel):
+    resultado = ejecutar('var int z = 0; var int a = 1; ' + expresion, nivel)
+    assert not resultado.ok
+    assert resultado.diagnosticos == ['Error de Ejecución: División por cero.']
+
+
+@pytest.mark.parametrize('nivel', ['interprete', 'clausuras'])
+def test_identidad_con_division_segura(nivel):
+    resultado = ejecutar('var int a = 3; var int y = (a / 3) * 0;', nivel)
+    assert resultado.ok
+    assert resultado.memoria == {'a': 3, 'y': 0}
+
+
+@pytest.mark.parametrize('nivel', ['interprete', 'clausuras'])
+def test_and_true_conserva_bool(nivel):
+    # 'b' solo se asigna en una rama que no se toma: queda en 0
+    fuente = ('var int x = 5; if (x > 10) { var bool b = true; } '
+              'var bool c = b && true; var bool d = true && b;')
+    resultado = ejecutar(fuente, nivel)
+    assert resultado.memoria['c'] is False
+    assert resultado.memoria['d'] is False
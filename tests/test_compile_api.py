@@ -0,0 +1,12 @@
+from compile_api import compilar
+from compile_cache import CompileCache
+
+
+def test_tokens_se_informan_aunque_falle_el_parser():
+    eventos = []
+    resultado = compilar('var int x = 1 @ 2;', cache=CompileCache(), eventos=eventos.append)
+    lexico = next(e for e in eventos if e.get('fase') == 'Léxico')
+
+    assert not resultado.ok
+    assert resultado.tokens == lexico['tokens'] == 8
+    assert eventos[-1]['resultado']['tokens'] == 8
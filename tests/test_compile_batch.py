@@ -0,0 +1,47 @@
+import pytest
+
+from compile_batch import compilar_archivo, compilar_lote, imprimir_resumen
+
+
+def escribir(tmp_path, nombre, fuente):
+    ruta = tmp_path / nombre
+    ruta.write_text(fuente, encoding='utf-8')
+    return str(ruta)
+
+
+def test_error_lexico_cuenta_como_fallido(tmp_path, capsys):
+    archivos = [escribir(tmp_path, 'lex.src', 'var int x = 1 @;'),
+                escribir(tmp_path, 'ok.src', 'var int x = 1; var int y = x + 2;')]
+    resultados = compilar_lote(archivos, trabajadores=1)
+
+    assert [r['ok'] for r in resultados] == [False, True]
+    assert resultados[0]['diagnosticos'] == ["Error Léxico: Carácter inesperado '@' (línea 1, columna 15)"]
+    assert imprimir_resumen(resultados, 0.0, 1) == 1
+    assert "1 compilados, 1 con errores" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('fuente, diagnostico', [
+    ('var int x = y + 1;', "Error Semántico: Variable 'y' no ha sido declarada."),
+    ('var int x = ;', "Error sintáctico: expresión inválida 'PUNTO_Y_COMA' ';'"),
+])
+def test_diagnostico_sin_prefijo_repetido(tmp_path, fuente, diagnostico):
+    resultado = compilar_archivo(escribir(tmp_path, 'error.src', fuente))
+    assert not resultado['ok']
+    assert resultado['diagnosticos'] == [diagnostico]
+
+
+def test_errores_lexicos_se_conservan_si_falla_otra_fase(tmp_path, capsys):
+    resultado = compilar_archivo(escribir(tmp_path, 'error.src', 'var int x = @;'))
+    assert not resultado['ok']
+    assert resultado['diagnosticos'][0].startswith("Error Léxico: Carácter inesperado '@'")
+    assert resultado['diagnosticos'][1].startswith("Error sintáctico:")
+    assert capsys.readouterr().out == ''  # Sin trazas de las fases
+
+
+def test_cache_en_disco(tmp_path):
+    ruta = escribir(tmp_path, 'ok.src', 'var int x = 1; var int y = x + 2;')
+    primero = compilar_archivo(ruta, cache_dir=str(tmp_path / 'cache'))
+    segundo = compilar_archivo(ruta, cache_dir=str(tmp_path / 'cache'))
+    assert primero['ok'] and segundo['ok']
+    assert (primero['cache'], segundo['cache']) == (False, True)
+    assert segundo['instrucciones'] == primero['instrucciones']
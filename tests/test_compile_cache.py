@@ -0,0 +1,45 @@
+import marshal
+import os
+
+import pytest
+
+from compile_cache import CompileCache, FORMATO_DISCO, EXTENSION
+
+FUENTE = "var int x = 2; var int y = x * 3;"
+
+
+@pytest.mark.parametrize('contenido', [
+    b'basura que no es marshal',
+    b'',
+    marshal.dumps((FORMATO_DISCO, {'fuente': 'x'})),                     # faltan claves
+    marshal.dumps((FORMATO_DISCO, {'fuente': 'x', 'tokens': (b'', b'', b''),
+                                   'arena': (), 'tac': '', 'programa': ()})),  # tuplas cortas
+    marshal.dumps((FORMATO_DISCO, None)),
+    marshal.dumps(12345),
+])
+def test_entrada_danada_es_un_fallo_de_cache(tmp_path, contenido):
+    cache = CompileCache(directorio=str(tmp_path))
+    entrada, _ = cache.compilar(FUENTE)
+    clave = cache.clave(FUENTE)
+    ruta = os.path.join(str(tmp_path), clave + EXTENSION)
+    assert os.path.exists(ruta)
+
+    # Otra caché (memoria vacía) sobre el mismo directorio, con el archivo dañado
+    with open(ruta, 'wb') as archivo:
+        archivo.write(contenido)
+    otra = CompileCache(directorio=str(tmp_path))
+    assert otra.obtener(clave) is None
+    assert not os.path.exists(ruta)
+
+    # Se recompila y se vuelve a guardar bien
+    recompilada, desde_cache = otra.compilar(FUENTE)
+    assert not desde_cache
+    assert recompilada.tac == entrada.tac
+    assert CompileCache(directorio=str(tmp_path)).obtener(clave) is not None
+
+
+def test_entrada_de_disco_se_reutiliza(tmp_path):
+    CompileCache(directorio=str(tmp_path)).compilar(FUENTE)
+    entrada, desde_cache = CompileCache(directorio=str(tmp_path)).compilar(FUENTE)
+    assert desde_cache
+    assert len(entrada.programa) > 0
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from compile_pool import ExecutionPool, PoolLleno
+
+IMPRIME_SIN_FIN = "var int i = 0; while (i < 100000000) { print(i); i = i + 1; }"
+
+
+@pytest.fixture
+def pool():
+    pool = ExecutionPool(procesos=1, cola=0, limite_cpu=30, limite_instrucciones=None,
+                         limite_real=20)
+    yield pool
+    pool.cerrar()
+
+
+def ejecutar_cuando_haya_lugar(pool, codigo, espera):
+    limite = time.monotonic() + espera
+    while True:
+        try:
+            return pool.ejecutar(codigo)
+        except PoolLleno:
+            if time.monotonic() > limite:
+                raise
+            time.sleep(0.05)
+
+
+def test_cliente_que_no_lee_no_retiene_el_proceso(pool):
+    eventos = pool.transmitir(IMPRIME_SIN_FIN)
+    assert next(eventos)['evento'] == 'fase'
+
+    # El cliente deja de leer: el búfer se llena, el trabajo se corta y el
+    # proceso queda libre mucho antes del límite de tiempo real
+    resultado = ejecutar_cuando_haya_lugar(pool, "var int x = 2; print(x);", espera=10)
+    assert resultado['ok'] and resultado['salida'] == ['2']
+
+    final = list(eventos)[-1]
+    assert final['evento'] == 'fin'
+    assert final['resultado']['diagnosticos'] == [
+        "Error de Ejecución: la salida no se leyó a tiempo y el programa se detuvo."]
+
+
+def test_cerrar_la_transmision_libera_el_proceso(pool):
+    eventos = pool.transmitir("var int i = 0; while (i < 100000000) { i = i + 1; }")
+    next(eventos)
+    eventos.close()
+    resultado = ejecutar_cuando_haya_lugar(pool, "var int x = 2; print(x);", espera=5)
+    assert resultado['salida'] == ['2']
+
+
+def test_transmision_completa(pool):
+    eventos = list(pool.transmitir("var int i = 0; while (i < 500) { print(i); i = i + 1; }"))
+    salida = [linea for e in eventos if e['evento'] == 'salida' for linea in e['lineas']]
+    assert salida == [str(i) for i in range(500)]
+    assert eventos[-1]['evento'] == 'fin' and eventos[-1]['resultado']['ok']
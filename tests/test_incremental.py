@@ -0,0 +1,44 @@
+import random
+
+from incremental import CompilationSession
+
+ERROR_ARROBA = "Error Léxico: Carácter inesperado '@' (línea {}, columna {})"
+
+
+def test_errores_lexicos_en_los_diagnosticos(capsys):
+    sesion = CompilationSession('var int z = 3 @ ;')
+    assert sesion.diagnosticos() == [ERROR_ARROBA.format(1, 15)]
+    assert capsys.readouterr().out == ''
+
+
+def test_errores_lexicos_siguen_las_ediciones(capsys):
+    sesion = CompilationSession('var int a = 1;\nvar int b = a @ + 2;\n')
+    assert sesion.diagnosticos() == [ERROR_ARROBA.format(2, 15)]
+
+    # Una línea nueva antes: el error se desplaza sin re-analizarse
+    sesion.editar(0, 0, 'var int c = 0;\n')
+    assert sesion.diagnosticos() == [ERROR_ARROBA.format(3, 15)]
+
+    # Borrar el carácter inválido quita el error
+    offset = sesion.texto.index('@')
+    sesion.editar(offset, 1, '')
+    assert sesion.diagnosticos() == []
+
+    # Un error léxico más un error semántico, en orden del texto
+    sesion.editar(0, 0, 'var int d = x; @\n')
+    assert sesion.diagnosticos() == ["Error Semántico: Variable 'x' no ha sido declarada.",
+                                     ERROR_ARROBA.format(1, 16)]
+    assert capsys.readouterr().out == ''
+
+
+def test_ediciones_dan_lo_mismo_que_compilar_de_nuevo():
+    piezas = ['var int a = 1;', 'var int b = a + 2;', ' @', '$', '\n', 'print(b);',
+              'a = 3;', ' ', 'c', ';', '#c @\n', '']
+    azar = random.Random(7)
+    for _ in range(150):
+        sesion = CompilationSession(''.join(azar.choice(piezas) for _ in range(azar.randint(0, 8))))
+        for _ in range(8):
+            offset = azar.randint(0, len(sesion.texto))
+            borrados = azar.randint(0, min(4, len(sesion.texto) - offset))
+            sesion.editar(offset, borrados, azar.choice(piezas))
+            assert sesion.diagnosticos() == CompilationSession(sesion.texto).diagnosticos()
@@ -0,0 +1,36 @@
+import pytest
+
+from compile_api import compilar
+from compile_cache import CompileCache
+from tac_python import TACPythonExecutor
+
+PROGRAMAS = [
+    # 'b' solo se asigna en una rama que no se toma: queda en 0
+    'var int x = 5; if (x > 10) { var bool b = true; } var bool c = b && b; '
+    'var bool d = b && x > 1; var bool e = x > 1 && b;',
+    'var int i = 0; var int s = 0; while (i < 10) { s = s + i * 2 - i / 3; i = i + 1; } print(s);',
+    'var int a = 7; var bool f = a > 3 && a < 10; if (f) { a = a - 1; } else { a = a + 1; }',
+    # Variables del usuario con el nombre que tenían antes los temporales
+    'var int temp_1 = 5; var int y = temp_1 + 1; var int temp_2 = y * temp_1 - 3;',
+]
+
+
+@pytest.mark.parametrize('fuente', PROGRAMAS)
+def test_mismos_resultados_en_todos_los_niveles(fuente):
+    interprete = compilar(fuente, nivel='interprete', cache=CompileCache())
+    clausuras = compilar(fuente, nivel='clausuras', cache=CompileCache())
+    python = TACPythonExecutor(salida=lambda valor: None).execute(interprete.tac)
+
+    assert interprete.ok and clausuras.ok
+    for memoria in (clausuras.memoria, python):
+        assert memoria == interprete.memoria
+        # == no distingue False de 0: se comparan también los tipos
+        assert ({k: type(v) for k, v in memoria.items()}
+                == {k: type(v) for k, v in interprete.memoria.items()})
+
+
+def test_variable_llamada_como_temporal_aparece_en_la_memoria():
+    fuente = 'var int temp_1 = 5; var int y = temp_1 + 1;'
+    for nivel in ('interprete', 'clausuras'):
+        resultado = compilar(fuente, nivel=nivel, cache=CompileCache())
+        assert resultado.memoria == {'temp_1': 5, 'y': 6}